@@ -0,0 +1,238 @@
+""" Board whose state lives in NumPy arrays, for analysis workloads.
+
+ArrayBoard can be used anywhere a Board is (Player, Game...), and also
+resolves whole vectors of shots at once with ArrayBoard.attack_many().
+"""
+import numpy as np
+
+from battleship.board import Board
+
+
+class ArrayBoard(Board):
+    """ Board keeping its state in NumPy arrays.
+
+    - grid: (height, width) int16 array, 0 for an empty cell and k + 1 for
+      a cell of self.ships[k]
+    - shots: (height, width) boolean array of the cells attacked so far
+    - hit_points: int16 array with the number of cells of each ship that
+      have not been hit yet
+
+    Cell (x, y) is [y - 1, x - 1] in grid and shots. The Ship instances in
+    self.ships only get their damage from the arrays when they are accessed.
+    Boards with overlapping ships are not supported.
+    """
+    @property
+    def ships(self):
+        """ tuple[Ship] : the ships on the board.
+
+        Assign a new sequence of ships to change them, so that the arrays
+        are rebuilt. Cells of the ships that are already damaged count as
+        shot.
+        """
+        if self._ships_are_stale:
+            shots = self.shots.ravel()
+            for ship, (positions, cells) in zip(self._ships,
+                                                self._ship_cells):
+                damage_mask = 0
+                for position in positions[shots[cells]].tolist():
+                    damage_mask |= 1 << position
+                ship.damage_mask = damage_mask
+            self._ships_are_stale = False
+        return self._ships
+
+    @ships.setter
+    def ships(self, ships):
+        self._ships = tuple(ships)
+        self._ships_are_stale = False
+        if not hasattr(self, 'shots'):
+            self.shots = np.zeros((self.height, self.width), dtype=bool)
+        self.grid = np.zeros((self.height, self.width), dtype=np.int16)
+
+        # Position along the ship (bit of Ship.damage_mask) and flat index in
+        # the arrays of the cells of each ship that are on the board
+        self._ship_cells = []
+        shots = self.shots.ravel()
+        for ship_id, ship in enumerate(self._ships, 1):
+            positions = np.arange(ship.length())
+            x = ship.x_start - 1 + positions * ship.is_horizontal()
+            y = ship.y_start - 1 + positions * (not ship.is_horizontal())
+            on_board = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+            positions = positions[on_board]
+            cells = (y * self.width + x)[on_board]
+            self._ship_cells.append((positions, cells))
+            self.grid.ravel()[cells] = ship_id
+            damaged = [position for position in positions.tolist()
+                       if ship.damage_mask >> position & 1]
+            shots[cells[damaged]] = True
+
+        occupied = self.grid.ravel()[~shots]
+        self.hit_points = np.bincount(
+            occupied, minlength=len(self._ships) + 1)[1:].astype(np.int16)
+        self._ships_remaining = int(np.count_nonzero(self.hit_points))
+        self._cells_remaining = int(self.hit_points.sum())
+        self._reset_journal()
+
+    @property
+    def marked_cells(self):
+        """ set[tuple[int, int]] : (x, y) of the cells attacked so far."""
+        y, x = np.nonzero(self.shots)
+        return set(zip((x + 1).tolist(), (y + 1).tolist()))
+
+    @marked_cells.setter
+    def marked_cells(self, cells):
+        self.shots = np.zeros((self.height, self.width), dtype=bool)
+        for x, y in cells:
+            self.shots[y - 1, x - 1] = True
+        self._ships_are_stale = True
+        self._reset_journal()
+
+    def get_ship_at(self, cell):
+        """ Get the ship occupying a cell.
+
+        Args:
+            cell (tuple[int, int]): (x, y) cell coordinates
+
+        Returns:
+            Ship : the ship occupying the cell, or None if the cell is empty
+        """
+        x, y = cell
+        if not (0 < x <= self.width and 0 < y <= self.height):
+            return None
+        ship_id = self.grid[y - 1, x - 1]
+        return self.ships[ship_id - 1] if ship_id else None
+
+    def is_attacked_at(self, cell):
+        """ Board is attacked at an (x, y) cell coordinate.
+
+        Same contract as Board.is_attacked_at(). Cells off the board are
+        misses.
+
+        Args:
+            cell (tuple[int, int]): (x, y) cell coordinates targetted
+
+        Returns:
+            tuple : (is_ship_hit, has_ship_sunk)
+        """
+        x, y = cell
+        if not (0 < x <= self.width and 0 < y <= self.height):
+            self._record(('shot', None, True, 0))
+            return False, False
+        already_shot = self.shots[y - 1, x - 1]
+        self.shots[y - 1, x - 1] = True
+        ship_id = int(self.grid[y - 1, x - 1])
+        self._record(('shot', (y - 1, x - 1), already_shot, ship_id))
+        if not ship_id:
+            return False, False
+
+        if not already_shot:
+            self._ships_are_stale = True
+            self._cells_remaining -= 1
+            self.hit_points[ship_id - 1] -= 1
+            if not self.hit_points[ship_id - 1]:
+                self._ships_remaining -= 1
+                return True, True
+        return True, not self.hit_points[ship_id - 1]
+
+    def attack_many(self, cells):
+        """ Attack several cells, one after the other, in a single call.
+
+        Equivalent to calling is_attacked_at() on each cell in turn.
+
+        Args:
+            cells (array-like): (number_of_shots, 2) (x, y) cell coordinates
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray] : (is_ship_hit,
+                has_ship_sunk), two boolean arrays with the outcome of each
+                shot
+        """
+        cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+        x, y = cells[:, 0] - 1, cells[:, 1] - 1
+        on_board = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        flat = np.where(on_board, y * self.width + x, 0)
+
+        ship_ids = np.where(on_board, self.grid.ravel()[flat], 0)
+        is_ship_hit = ship_ids > 0
+
+        # A shot only damages a ship the first time its cell is attacked.
+        # Shots off the board stand for cell 0 in flat, so they are left out
+        first_time = np.zeros(len(flat), dtype=bool)
+        shots_on_board = np.flatnonzero(on_board)
+        first_time[shots_on_board[np.unique(flat[shots_on_board],
+                                            return_index=True)[1]]] = True
+        shots = self.shots.ravel()
+        damaging = is_ship_hit & first_time & ~shots[flat]
+        self._record(('many', flat[on_board], shots[flat[on_board]], 
+                      self.hit_points, self._ships_remaining, 
+                      self._cells_remaining))
+        shots[flat[on_board]] = True
+
+        # Ship hit by each hit, and damage dealt to it up to that hit
+        hits = np.flatnonzero(is_ship_hit)
+        ships = ship_ids[hits] - 1
+        order = np.argsort(ships, kind='stable')
+        damage = np.cumsum(damaging[hits][order])
+        # Start counting again at each new ship
+        new_ship = np.flatnonzero(np.diff(ships[order])) + 1
+        dealt_before = np.zeros_like(damage)
+        dealt_before[new_ship] = damage[new_ship - 1]
+        damage -= np.maximum.accumulate(dealt_before)
+
+        has_ship_sunk = np.zeros(len(flat), dtype=bool)
+        has_ship_sunk[hits[order]] = damage >= self.hit_points[ships[order]]
+
+        hit_points = self.hit_points
+        self.hit_points = hit_points - np.bincount(
+            ships[damaging[hits]],
+            minlength=len(hit_points)).astype(np.int16)
+        self._ships_remaining -= int(np.count_nonzero(
+            (hit_points > 0) & (self.hit_points == 0)))
+        self._cells_remaining -= int(np.count_nonzero(damaging))
+        if len(hits):
+            self._ships_are_stale = True
+        return is_ship_hit, has_ship_sunk
+
+    def undo(self):
+        """ Undo the last attack (or call to attack_many()) not undone yet.
+
+        Raises:
+            IndexError: if there is no attack to undo
+        """
+        entry = self._unrecord()
+        self._ships_are_stale = True
+        if entry[0] == 'many':
+            _, flat, previous_shots, hit_points, ships, cells = entry
+            # Backwards, so that the first shot at a cell restores it last
+            self.shots.ravel()[flat[::-1]] = previous_shots[::-1]
+            self.hit_points = hit_points
+            self._ships_remaining = ships
+            self._cells_remaining = cells
+            return
+
+        _, cell, already_shot, ship_id = entry
+        if cell is None or already_shot:
+            return
+        self.shots[cell] = False
+        if ship_id:
+            self._cells_remaining += 1
+            if not self.hit_points[ship_id - 1]:
+                self._ships_remaining += 1
+            self.hit_points[ship_id - 1] += 1
+
+    def _build_array(self, show_ships=False, viewport=None):
+        """ Generate an array representation of the Board for visualisation."""
+        grid, shots = self.grid, self.shots
+        if viewport is not None:
+            x_first, y_first, width, height = viewport
+            rows = slice(y_first - 1, y_first - 1 + height)
+            columns = slice(x_first - 1, x_first - 1 + width)
+            grid, shots = grid[rows, columns], shots[rows, columns]
+        array_board = np.full(grid.shape, ' ')
+        array_board[shots] = 'O'
+        occupied = grid > 0
+        if show_ships:
+            array_board[occupied] = 'S'
+        array_board[occupied & shots] = 'X'
+        sunk = np.r_[False, self.hit_points == 0]
+        array_board[sunk[grid]] = '$'
+        return array_board.tolist()
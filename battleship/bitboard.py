@@ -0,0 +1,376 @@
+""" Bitboard game core: a whole board state in a few Python ints.
+
+Cell (x, y) is bit (y - 1) * width + (x - 1) of a board-wide mask (the same
+numbering as ShipGeometry.board_mask and battleship.placement), so a 10x10
+board fits in a 100-bit int. Ships, shots and hits are masks, and attack
+resolution, sunk and game-over detection and proximity checks are bitwise
+operations on them.
+
+BitBoard is the engine. BitBoardAdapter wraps it in the Board interface so
+that Player and Game can use it unchanged.
+"""
+from functools import lru_cache
+
+from battleship.board import Board
+
+
+@lru_cache(maxsize=32)
+def board_masks(width, height):
+    """ Get the masks needed to shift cells around without wrapping.
+
+    Args:
+        width (int): width of the board
+        height (int): height of the board
+
+    Returns:
+        tuple[int, int, int] : (full, not_left, not_right) where full has
+            every cell of the board set, not_left every cell but those of
+            column 1 and not_right every cell but those of the last column
+    """
+    full = (1 << (width * height)) - 1
+    row = (1 << width) - 1
+    left = full // row            # Bit 0 of every row
+    right = left << (width - 1)   # Last bit of every row
+    return full, full & ~left, full & ~right
+
+
+def shift_left(mask, width, height):
+    """ Move every cell one column left (x - 1), dropping column 1."""
+    return (mask & board_masks(width, height)[1]) >> 1
+
+
+def shift_right(mask, width, height):
+    """ Move every cell one column right (x + 1), dropping the last one."""
+    return (mask & board_masks(width, height)[2]) << 1
+
+
+def shift_up(mask, width, height):
+    """ Move every cell one row up (y - 1), dropping row 1."""
+    return mask >> width
+
+
+def shift_down(mask, width, height):
+    """ Move every cell one row down (y + 1), dropping the last one."""
+    return (mask << width) & board_masks(width, height)[0]
+
+
+def neighbours(mask, width, height):
+    """ Get the cells next to (including diagonally) a set of cells.
+
+    Args:
+        mask (int): board-wide mask of cells
+        width (int): width of the board
+        height (int): height of the board
+
+    Returns:
+        int : mask of the cells that touch a cell of mask but are not in it
+    """
+    return halo(mask, width, height) & ~mask
+
+
+def halo(mask, width, height):
+    """ Get a set of cells together with every cell next to them.
+
+    For a ship, these are the cells no other ship may occupy (see
+    Ship.is_near_ship).
+
+    Args:
+        mask (int): board-wide mask of cells
+        width (int): width of the board
+        height (int): height of the board
+
+    Returns:
+        int : mask of the cells of mask and of their neighbours
+    """
+    full, not_left, not_right = board_masks(width, height)
+    row = mask | (mask & not_left) >> 1 | (mask & not_right) << 1
+    return (row | row >> width | row << width) & full
+
+
+class BitBoard:
+    """ Board state held in bitmasks."""
+    def __init__(self, ship_masks, size=(10,10)):
+        """ Sets up a board with no shots yet.
+
+        Args:
+            ship_masks (list[int]): board-wide mask of each ship
+            size (tuple[int, int]): (width, height) of the board. Defaults
+                to (10, 10).
+        """
+        self.width, self.height = size
+        self.ship_masks = list(ship_masks)
+        self.occupancy = 0
+        for ship_mask in self.ship_masks:
+            self.occupancy |= ship_mask
+        self.shots = 0
+        self.hits = 0
+        # Index in ship_masks of the ship on each bit (None if empty)
+        self.ship_index = [None] * (self.width * self.height)
+        for index, ship_mask in enumerate(self.ship_masks):
+            while ship_mask:
+                bit = ship_mask.bit_length() - 1
+                self.ship_index[bit] = index
+                ship_mask ^= 1 << bit
+
+    @classmethod
+    def from_ships(cls, ships, size=(10,10)):
+        """ Create a BitBoard from Ship instances, keeping their damage.
+
+        Args:
+            ships (list[Ship]): the ships, all on the board
+            size (tuple[int, int]): (width, height) of the board. Defaults
+                to (10, 10).
+
+        Returns:
+            BitBoard : the board
+
+        Raises:
+            ValueError: if a ship is (partly) off the board
+        """
+        width, height = size
+        for ship in ships:
+            if (ship.x_start < 1 or ship.y_start < 1
+                    or ship.x_end > width or ship.y_end > height):
+                raise ValueError(f"{ship!r} is beyond the bounds of the "
+                                 f"board.")
+        bit_board = cls([ship.board_mask(width) for ship in ships], size)
+        for ship in ships:
+            for x, y in ship.damaged_cells:
+                bit_board.attack((y - 1) * width + x - 1)
+        return bit_board
+
+    def bit(self, cell):
+        """ Get the bit of an (x, y) cell, or None if it is off the board."""
+        x, y = cell
+        if 0 < x <= self.width and 0 < y <= self.height:
+            return (y - 1) * self.width + x - 1
+        return None
+
+    def attack(self, bit):
+        """ Fire at a cell.
+
+        Args:
+            bit (int): bit of the cell (see BitBoard.bit)
+
+        Returns:
+            tuple[bool, bool] : (is_ship_hit, has_ship_sunk), like
+                Board.is_attacked_at()
+        """
+        cell = 1 << bit
+        self.shots |= cell
+        if not self.occupancy & cell:
+            return False, False
+        self.hits |= cell
+        ship_mask = self.ship_masks[self.ship_index[bit]]
+        return True, self.hits & ship_mask == ship_mask
+
+    def is_game_over(self):
+        """ Check whether every ship has sunk."""
+        return self.hits == self.occupancy
+
+    def ships_remaining(self):
+        """ Count the ships that have not sunk yet."""
+        hits = self.hits
+        return sum(hits & ship_mask != ship_mask
+                   for ship_mask in self.ship_masks)
+
+    def cells_remaining(self):
+        """ Count the ship cells that have not been hit yet."""
+        return bin(self.occupancy & ~self.hits).count('1')
+
+    def sunk_cells(self):
+        """ Get the mask of the cells of every sunk ship."""
+        hits = self.hits
+        mask = 0
+        for ship_mask in self.ship_masks:
+            if hits & ship_mask == ship_mask:
+                mask |= ship_mask
+        return mask
+
+    def are_ships_too_close(self):
+        """ Check whether any two ships overlap or are next to each other.
+
+        Returns:
+            bool : True if a ship touches the halo of one placed before it
+        """
+        forbidden = 0
+        for ship_mask in self.ship_masks:
+            if ship_mask & forbidden:
+                return True
+            forbidden |= halo(ship_mask, self.width, self.height)
+        return False
+
+    def find_ships_too_close(self):
+        """ Find every pair of ships that overlap or are next to each other.
+
+        Returns:
+            list[tuple[int, int]] : pairs (i, j), i < j, of indices in
+                self.ship_masks, in increasing order
+        """
+        halos = [halo(ship_mask, self.width, self.height)
+                 for ship_mask in self.ship_masks]
+        return [(index, other)
+                for index, ship_halo in enumerate(halos)
+                for other in range(index + 1, len(self.ship_masks))
+                if ship_halo & self.ship_masks[other]]
+
+
+class BitBoardAdapter(Board):
+    """ Board whose state lives in a BitBoard, for use with Player and Game.
+
+    self.engine is the BitBoard. The Ship instances in self.ships only get
+    their damage from it when they are accessed. Ships must lie on the 
+    board, and boards with overlapping ships are not supported.
+    """
+    @property
+    def ships(self):
+        """ tuple[Ship] : the ships on the board.
+
+        Assign a new sequence of ships to change them, so that the engine is
+        rebuilt. Cells of the ships that are already damaged count as shot.
+        """
+        if self._ships_are_stale:
+            hits = self.engine.hits
+            for ship in self._ships:
+                step = 1 if ship.is_horizontal() else self.width
+                first = (ship.y_start - 1) * self.width + ship.x_start - 1
+                damage_mask = 0
+                for position in range(ship.length()):
+                    damage_mask |= (hits >> (first + position * step) & 1
+                                    ) << position
+                ship.damage_mask = damage_mask
+            self._ships_are_stale = False
+        return self._ships
+
+    @ships.setter
+    def ships(self, ships):
+        self._ships = tuple(ships)
+        self._ships_are_stale = False
+        shots = self.engine.shots
+        self.engine = BitBoard.from_ships(self._ships,
+                                          (self.width, self.height))
+        self.engine.shots |= shots
+        # (shots, hits) of the engine before each attack, for undo()
+        self._reset_journal()
+
+    @property
+    def marked_cells(self):
+        """ set[tuple[int, int]] : (x, y) of the cells attacked so far."""
+        shots = self.engine.shots
+        return {(bit % self.width + 1, bit // self.width + 1)
+                for bit in range(self.width * self.height) if shots >> bit & 1}
+
+    @marked_cells.setter
+    def marked_cells(self, cells):
+        if not hasattr(self, 'engine'):
+            self.engine = BitBoard([], (self.width, self.height))
+        self.engine.shots = 0
+        for cell in cells:
+            bit = self.engine.bit(cell)
+            if bit is not None:
+                self.engine.shots |= 1 << bit
+        self._reset_journal()
+
+    @property
+    def ships_remaining(self):
+        """ int : number of ships that have not sunk yet."""
+        return self.engine.ships_remaining()
+
+    @property
+    def cells_remaining(self):
+        """ int : number of ship cells that have not been hit yet."""
+        return self.engine.cells_remaining()
+
+    def have_all_ships_sunk(self):
+        """ Check whether all ships have sunk.
+
+        Returns:
+            bool : return True if all ships on the board have sunk.
+               return False otherwise.
+        """
+        return self.engine.hits == self.engine.occupancy
+
+    def is_attacked_at(self, cell):
+        """ Board is attacked at an (x, y) cell coordinate.
+
+        Same contract as Board.is_attacked_at(). Cells off the board are
+        misses.
+
+        Args:
+            cell (tuple[int, int]): (x, y) cell coordinates targetted
+
+        Returns:
+            tuple : (is_ship_hit, has_ship_sunk)
+        """
+        x, y = cell
+        width = self.width
+        engine = self.engine
+        self._record((engine.shots, engine.hits))
+        if not (0 < x <= width and 0 < y <= self.height):
+            return False, False
+        # BitBoard.attack(), inlined
+        bit = (y - 1) * width + x - 1
+        mask = 1 << bit
+        engine.shots |= mask
+        if not engine.occupancy & mask:
+            return False, False
+        self._ships_are_stale = True
+        engine.hits |= mask
+        ship_mask = engine.ship_masks[engine.ship_index[bit]]
+        return True, engine.hits & ship_mask == ship_mask
+
+    def undo(self):
+        """ Undo the last attack that has not been undone yet.
+
+        Raises:
+            IndexError: if there is no attack to undo
+        """
+        self.engine.shots, self.engine.hits = self._unrecord()
+        self._ships_are_stale = True
+
+    def are_ships_too_close(self):
+        """ Check whether there is at least a pair of ships that are too close.
+        
+        Returns:
+            bool : return True if and only if there is at least a pair of 
+                ships on the board that are near each other. Returns False 
+                otherwise
+        """
+        return self.engine.are_ships_too_close()
+
+    def get_ship_at(self, cell):
+        """ Get the ship occupying a cell.
+
+        Args:
+            cell (tuple[int, int]): (x, y) cell coordinates
+
+        Returns:
+            Ship : the ship occupying the cell, or None if the cell is empty
+        """
+        bit = self.engine.bit(cell)
+        index = None if bit is None else self.engine.ship_index[bit]
+        return None if index is None else self.ships[index]
+
+    def _build_array(self, show_ships=False, viewport=None):
+        """ Generate an array representation of the Board for visualisation."""
+        engine = self.engine
+        sunk = engine.sunk_cells()
+        x_first, y_first, width, height = (
+            (1, 1, self.width, self.height) if viewport is None else viewport)
+        array_board = [[' ' for _ in range(width)] for _ in range(height)]
+        for row in range(height):
+            first = (y_first - 1 + row) * self.width + x_first - 1
+            for column, bit in enumerate(range(first, first + width)):
+                cell = 1 << bit
+                if sunk & cell:
+                    symbol = '$'
+                elif engine.hits & cell:
+                    symbol = 'X'
+                elif show_ships and engine.occupancy & cell:
+                    symbol = 'S'
+                elif engine.shots & cell:
+                    symbol = 'O'
+                else:
+                    continue
+                array_board[row][column] = symbol
+        return array_board
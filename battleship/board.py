@@ -1,11 +1,37 @@
-from battleship.ship import Ship, ShipFactory
-from battleship.convert import CellConverter
+import numpy as np
+
+from battleship.ship import Ship, ShipFactory, ShipGeometry
+from battleship.render import (BoardRenderer, frame_lines, label_width, 
+                               row_line)
+
+# Fleets up to this many ships are validated by comparing every pair
+_SMALL_FLEET = 12
 
 class Board:
     """ Class representing the board of the player. 
             
     Acts as an interface between the player and its ships.
     """
+    # Optional battleship.pool.LayoutPool that boards created without ships 
+    # take their layout from, instead of generating a new one
+    layout_pool = None
+
+    # Optional battleship.generation.GenerationBudget limiting the effort 
+    # spent generating the layout of a board created without ships (None 
+    # for ShipFactory's default, generation.DEFAULT_BUDGET), and 
+    # battleship.generation.GenerationMetrics adding up what it took
+    generation_budget = None
+    generation_metrics = None
+
+    # battleship.render.BoardRenderer drawing the board, created on the 
+    # first call to print()
+    _renderer = None
+
+    # Number of journal entries recorded and journals started, so far. Each
+    # gets its own generation, so that restore() tells a snapshot from one 
+    # taken on a history that has since been undone and written over.
+    _history = 0
+
     def __init__(self, ships=None, size=(10,10), 
                 ships_per_length=None, should_validate=True):
         """ Initialises a Board given a list of ships. 
@@ -18,10 +44,13 @@ class Board:
             ships_per_length (dict): A dict with the length of ship as keys and
                 the count as values. Defaults to 1 ship each for lengths 1-5.
             should_validate (bool): Should the constructor validate the 
-                arrangements of the ships on the board? Defaults to True.
+                arrangements of the ships on the board? Defaults to True. 
+                Layouts taken from Board.layout_pool are never validated.
                 
         Raises:
             ValueError if the number of ships is False
+            LayoutGenerationError (a RuntimeError) if ships could not be 
+                generated (see Board.generation_budget)
         """
         self.width = size[0]
         self.height = size[1]
@@ -30,7 +59,6 @@ class Board:
         # Set of cells that have been attacked
         # Used for visualising the board
         self.marked_cells = set()
-        self.ships = []
         
         # Dict storing the specified number of ships per length
         # Mainly used for validating the board configuration
@@ -44,34 +72,106 @@ class Board:
         else:
             self.ships_per_length.update({1: 1, 2: 1, 3: 1, 4: 1, 5: 1})
 
-        if ships is None:
-            valid_ships = False
-            while not valid_ships:
-                try:
-                    ship_factory = ShipFactory(board_size=size, 
-                                            ships_per_length=self.ships_per_length)
-                    self.ships = ship_factory.generate_ships()
+        # What generating the ships took (a GenerationReport), if they were
+        # generated for this board
+        self.generation_report = None
 
-                    if should_validate:
-                        self.validate_ships()
+        if ships is None and self.layout_pool is not None:
+            # Pooled layouts come from ShipFactory.generate_fleets, which 
+            # only produces valid arrangements
+            self.ships = self.layout_pool.take(size, self.ships_per_length)
+            should_validate = False
+        elif ships is None:
+            # The factory only ever produces valid arrangements, so there is 
+            # no need to retry. It raises a LayoutGenerationError if the 
+            # fleet does not fit or the budget runs out.
+            ship_factory = ShipFactory(board_size=size, 
+                                       ships_per_length=self.ships_per_length,
+                                       budget=self.generation_budget,
+                                       metrics=self.generation_metrics)
+            self.ships = ship_factory.generate_ships()
+            self.generation_report = ship_factory.last_report
+        else:
+            self.ships = ships
 
-                    # Only reached if no exception was thrown
-                    valid_ships = True  
-                    
-                # Prints error message but the loop will continue to run, generating new ships
-                except ValueError as e:
-                    pass
+        if should_validate:
+            self.validate_ships()
 
-        else:
-            valid_ships = False
-            while not valid_ships:
-                self.ships = ships
-                
-                if should_validate:
-                    self.validate_ships()
-                
-                valid_ships = True  
-                    
+
+    @property
+    def ships(self):
+        """ tuple[Ship] : the ships on the board.
+
+        A tuple rather than the list it used to be: assign a new sequence of 
+        ships to change them, so that the index of the cells they occupy and 
+        the counts of what remains are rebuilt. Those counts only follow 
+        damage done through is_attacked_at().
+        """
+        return self._ships
+
+    @ships.setter
+    def ships(self, ships):
+        self._ships = tuple(ships)
+        # Cell -> ships occupying it. Only an invalid board has more than 
+        # one ship in a cell.
+        self._ships_at = {}
+        for ship in self._ships:
+            for cell in ship.cells:
+                self._ships_at[cell] = self._ships_at.get(cell, ()) + (ship,)
+
+        # Kept up to date by is_attacked_at(), so that checking whether the 
+        # game is over does not walk the ships
+        self._ships_remaining = sum(not ship.has_sunk() 
+                                    for ship in self._ships)
+        self._cells_remaining = sum(ship.length() 
+                                    - ship.count_damaged_cells() 
+                                    for ship in self._ships)
+
+        # (cell, whether it was newly marked, [(ship, its damage_mask before)
+        # for each ship damaged]) for each attack, for undo()
+        self._reset_journal()
+
+    def get_ship_at(self, cell):
+        """ Get the ship occupying a cell.
+
+        Args:
+            cell (tuple[int, int]): (x, y) cell coordinates
+
+        Returns:
+            Ship : the ship occupying the cell (the last one in self.ships 
+                if several do), or None if the cell is empty
+        """
+        ships = self._ships_at.get(cell)
+        return ships[-1] if ships else None
+
+    @classmethod
+    def from_coordinates(cls, coordinates, size=(10,10), 
+                         ships_per_length=None, should_validate=False):
+        """ Create a Board from an array of ship coordinates.
+
+        Meant for one fleet out of ShipFactory.generate_fleets(), which are 
+        valid by construction and so are not validated again by default.
+
+        Args:
+            coordinates (numpy.ndarray): (number_of_ships, 4) array with one
+                (x_start, y_start, x_end, y_end) row per ship
+            size (tuple[int, int]): (width, height) of the board. Defaults 
+                to (10, 10).
+            ships_per_length (dict): A dict with the length of ship as keys 
+                and the count as values. Defaults to 1 ship each for lengths 
+                1-5.
+            should_validate (bool): Should the arrangement of the ships be 
+                validated? Defaults to False.
+
+        Returns:
+            Board : a board holding one new Ship per row of coordinates
+        """
+        ships = [Ship.from_geometry(ShipGeometry.get((x_start, y_start), 
+                                                     (x_end, y_end)))
+                 for x_start, y_start, x_end, y_end in np.asarray(
+                     coordinates).tolist()]
+        return cls(ships=ships, size=size, ships_per_length=ships_per_length,
+                   should_validate=should_validate)
 
     def validate_ships(self):
         """ Validate the ship arrangements on the board.
@@ -88,9 +188,11 @@ class Board:
         #     print(f"This ship: {ship}, this length: {ship.length()}\n")
 
         
-        if not self.are_ships_within_bounds():
+        out_of_bounds, too_close = self.find_ship_conflicts()
+        if out_of_bounds:
             raise ValueError("Some ships are in cells beyond the bounds of "
-                "the board.")
+                "the board: " + ", ".join(repr(self.ships[index]) 
+                                          for index in out_of_bounds))
         
         if self.are_ship_lengths_correct():
             total_ships = sum(self.ships_per_length.values())
@@ -99,8 +201,56 @@ class Board:
                 error_message += f" - {ship_count} of length {ship_length}\n"
             raise ValueError(error_message)
         
-        if self.are_ships_too_close():
-            raise ValueError("Some ships are too close to each other.")
+        if too_close:
+            raise ValueError("Some ships are too close to each other: " 
+                + ", ".join(f"{self.ships[first]!r} and "
+                            f"{self.ships[second]!r}" 
+                            for first, second in too_close))
+
+    def find_ship_conflicts(self):
+        """ Find every ship out of bounds and every pair of ships too close.
+
+        Builds an index of the cells occupied by the ships, then looks up 
+        the cells around each ship in it, so this takes a single pass that 
+        is linear in the total length of the ships, however many there are. 
+        Small fleets simply compare every pair of ships.
+
+        Returns:
+            tuple[list[int], list[tuple[int, int]]] : (out_of_bounds, 
+                too_close) where
+                - out_of_bounds lists the indices in self.ships of the ships 
+                  that are (partly) off the board
+                - too_close lists the pairs (i, j), i < j, of indices of 
+                  ships that overlap or are near each other (see 
+                  Ship.is_near_ship), in increasing order
+        """
+        out_of_bounds = [index for index, ship in enumerate(self.ships)
+                         if ship.x_start < 1 or ship.y_start < 1 
+                         or ship.x_end > self.width 
+                         or ship.y_end > self.height]
+
+        if len(self.ships) <= _SMALL_FLEET:
+            # Comparing every pair is cheaper than building the index
+            too_close = [(index, other) 
+                         for index, ship in enumerate(self.ships)
+                         for other in range(index + 1, len(self.ships))
+                         if ship.is_near_ship(self.ships[other])]
+            return out_of_bounds, too_close
+
+        # Cell -> indices of the ships occupying it
+        occupants = {}
+        for index, ship in enumerate(self.ships):
+            for cell in ship.cells:
+                occupants.setdefault(cell, []).append(index)
+
+        too_close = set()
+        for index, ship in enumerate(self.ships):
+            for x in range(ship.x_start - 1, ship.x_end + 2):
+                for y in range(ship.y_start - 1, ship.y_end + 2):
+                    for other in occupants.get((x, y), ()):
+                        if other > index:
+                            too_close.add((index, other))
+        return out_of_bounds, sorted(too_close)
             
     def are_ship_lengths_correct(self): 
         """ Check whether the number of ships are correct per length.
@@ -122,15 +272,7 @@ class Board:
             bool : return True if all ships occupy valid cells on the board. 
                 Return False otherwise.
         """
-        # TODO: Complete this method
-        for ship in self.ships:
-            ships_cells = ship.get_cells()
-            for x, y in ships_cells:
-                if 0 < x <= self.width and 0 < y <= self.height:
-                    continue
-                else:
-                    return False 
-        return True
+        return not self.find_ship_conflicts()[0]
         
     def are_ships_too_close(self):
         """ Check whether there is at least a pair of ships that are too close.
@@ -140,14 +282,7 @@ class Board:
                 ships on the board that are near each other. Returns False 
                 otherwise
         """
-        # TODO: Complete this method
-        for ship in self.ships:
-            temp_ships = self.ships.copy()
-            temp_ships.remove(ship)
-            for other_ships in temp_ships:
-                if ship.is_near_ship(other_ships):
-                    return True
-        return False
+        return bool(self.find_ship_conflicts()[1])
         
     def have_all_ships_sunk(self):
         """ Check whether all ships have sunk.
@@ -156,18 +291,17 @@ class Board:
             bool : return True if all ships on the board have sunk.
                return False otherwise.
         """
-        # TODO: Complete this method
-        ship_counter = 0
-        sunk_counter = 0
-        for ship in self.ships:
-            ship_counter += 1
-            if ship.has_sunk():
-                sunk_counter += 1
-        
-        if ship_counter == sunk_counter:
-            return True 
-        else:
-            return False
+        return self._ships_remaining == 0
+
+    @property
+    def ships_remaining(self):
+        """ int : number of ships that have not sunk yet."""
+        return self._ships_remaining
+
+    @property
+    def cells_remaining(self):
+        """ int : number of ship cells that have not been hit yet."""
+        return self._cells_remaining
     
     def is_attacked_at(self, cell):
         """ Board is attacked at an (x, y) cell coordinate.
@@ -188,39 +322,134 @@ class Board:
                   sink (False otherwise)
         """
         # Mark the cell that has been attacked for visualisation purposes
+        newly_marked = cell not in self.marked_cells
         self.marked_cells.add(cell)
         
-        # TODO: Complete this method
+        ships = self._ships_at.get(cell)
+        if not ships:
+            self._record((cell, newly_marked, ()))
+            return False, False
 
-        is_ship_hit = any([ship.is_occupying_cell(cell) for ship in self.ships])
-        if is_ship_hit:
-            for ship in self.ships:
-                if ship.is_occupying_cell(cell):
-                    ship.receive_damage(cell)
+        # Damage of each ship before the attack, for undo()
+        changes = []
+        for ship in ships:
+            damage_mask = ship.damage_mask
+            ship.receive_damage(cell)
+            # Hitting the same cell again changes nothing
+            if ship.damage_mask != damage_mask:
+                changes.append((ship, damage_mask))
+                self._cells_remaining -= 1
+                if ship.has_sunk():
+                    self._ships_remaining -= 1
+        self._record((cell, newly_marked, changes))
+        return True, ships[-1].has_sunk()
 
-        has_ship_sunk = False
+    def _reset_journal(self):
+        """ Start an empty journal, e.g. when the ships change."""
+        self._journal = []
+        self._history += 1
+        # Generation of the start of the journal, then of each entry
+        self._generations = [self._history]
 
-        for ship in self.ships:
-            if ship.is_occupying_cell(cell):
-                has_ship_sunk = ship.has_sunk()
+    def _record(self, entry):
+        """ Add the entry of an attack to the journal."""
+        self._journal.append(entry)
+        self._history += 1
+        self._generations.append(self._history)
+
+    def _unrecord(self):
+        """ Remove the last entry from the journal and return it.
+
+        Raises:
+            IndexError: if the journal is empty
+        """
+        entry = self._journal.pop()
+        self._generations.pop()
+        return entry
+
+    def snapshot(self):
+        """ Remember the current state of the board, to restore it later.
+
+        The board keeps a journal of the changes made by each attack, so a 
+        snapshot is only a position in that journal, with the generation of
+        the entry there: taking one is O(1), and restoring it is 
+        O(number of attacks since).
+
+        Returns:
+            tuple[int, int] : token to give to restore()
+        """
+        length = len(self._journal)
+        return length, self._generations[length]
+
+    def restore(self, token):
+        """ Undo every attack made since a snapshot was taken.
+
+        Args:
+            token (tuple[int, int]): value returned by snapshot()
+
+        Raises:
+            ValueError: if the attacks made before the snapshot have been 
+                undone since (even if new attacks were made after that), or
+                the ships have been changed since
+        """
+        length, generation = token
+        if not (0 <= length < len(self._generations)
+                and self._generations[length] == generation):
+            raise ValueError("This snapshot can no longer be restored.")
+        while len(self._journal) > length:
+            self.undo()
+
+    def undo(self):
+        """ Undo the last attack that has not been undone yet.
 
-        return is_ship_hit, has_ship_sunk
+        Raises:
+            IndexError: if there is no attack to undo
+        """
+        cell, newly_marked, changes = self._unrecord()
+        if newly_marked:
+            self.marked_cells.discard(cell)
+        for ship, damage_mask in changes:
+            if ship.has_sunk():
+                self._ships_remaining += 1
+            ship.damage_mask = damage_mask
+            self._cells_remaining += 1
         
-    def print(self, show_ships=False):
+    def print(self, show_ships=False, in_place=False, viewport=None):
         """ Visualise the board on the terminal.
+
+        Only the rows that changed since the last call are rebuilt (see 
+        battleship.render.BoardRenderer).
         
         Args:
             show_ships (bool): Shows the ships on the board. Defaults to False. 
+            in_place (bool): On a terminal, update the cells of the board 
+                printed by the previous call instead of printing it again, 
+                if nothing else has been printed since. Defaults to False.
+            viewport (tuple[int, int, int, int]): (x, y, width, height) of 
+                the part of the board to show, where (x, y) is its top left 
+                cell. Only the cells in it are looked at. Defaults to the 
+                whole board.
             
         Returns:
             None
+
+        Raises:
+            ValueError: if no cell of the viewport is on the board
         """
-        array_board = self._build_array(show_ships=show_ships)
-        board_str = self._array_to_str(array_board)
-        print(board_str)
+        if self._renderer is None:
+            self._renderer = BoardRenderer(self)
+        self._renderer.draw(show_ships=show_ships, in_place=in_place, 
+                            viewport=viewport)
+
+    def _build_array(self, show_ships=False, viewport=None):
+        """ Generate an array representation of the Board for visualisation.
+
+        viewport is (x, y, width, height), on the board (see 
+        battleship.render.clip_viewport), or None for the whole board.
+        """
+        if viewport is not None:
+            return self._build_viewport_array(show_ships, viewport)
 
-    def _build_array(self, show_ships=False):
-        """ Generate an array representation of the Board for visualisation."""
         array_board = [[' ' for _ in range(self.width)] 
                        for _ in range(self.height)]
 
@@ -241,24 +470,34 @@ class Board:
                 array_board[y_ship - 1][x_ship - 1] = 'X'
         
         return array_board
+
+    def _build_viewport_array(self, show_ships, viewport):
+        """ Same as _build_array(), only looking at the cells of viewport."""
+        x_first, y_first, width, height = viewport
+        array_board = [[' '] * width for _ in range(height)]
+        for row, y in enumerate(range(y_first, y_first + height)):
+            for column, x in enumerate(range(x_first, x_first + width)):
+                cell = (x, y)
+                ships = self._ships_at.get(cell)
+                symbol = 'O' if cell in self.marked_cells else ' '
+                for ship in ships or ():
+                    if ship.has_sunk():
+                        symbol = '$'
+                    elif ship.damage_mask >> ship.cell_index(cell) & 1:
+                        symbol = 'X'
+                    elif show_ships:
+                        symbol = 'S'
+                array_board[row][column] = symbol
+        return array_board
     
     def _array_to_str(self, array_board):
         """ Convert an array representation of the Board to string 
             representation to facilitate visualisation.
         """
-        list_lines = []
-
-        array_first_line = [chr(code + CellConverter.UPPERCASE_OFFSET) 
-                            for code in range(1, self.width + 1)]
-        first_line = ' ' * 6 + (' ' * 5).join(array_first_line) + ' \n'
-
-        for index_line, array_line in enumerate(array_board, 1):
-            number_spaces_before_line = 2 - len(str(index_line))
-            space_before_line = number_spaces_before_line * ' '
-            list_lines.append(f'{space_before_line}{index_line} |  ' 
-                + '  |  '.join(array_line) + '  |\n')
-
-        line_dashes = '   ' + '-' * 6 * self.width + '-\n'
+        width = label_width(self.height)
+        first_line, line_dashes = frame_lines(self.width, 1, width)
+        list_lines = [row_line(index_line, array_line, width) 
+                      for index_line, array_line in enumerate(array_board, 1)]
 
         board_str = (first_line + line_dashes + line_dashes.join(list_lines) 
                      + line_dashes)
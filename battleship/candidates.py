@@ -0,0 +1,96 @@
+""" Cells a player may still target, without listing every cell up front.
+
+CandidateCells stands in for the list of every (x, y) cell of a board that
+AutomaticPlayer starts from. It is an indexed set: membership tests, removal
+and picking a cell at random all take O(1), and it only stores the cells
+that were moved by a removal, so it costs nothing to create even on boards
+with billions of cells.
+"""
+
+
+class CandidateCells:
+    """ The cells of a board, minus those removed so far.
+
+    Cells are numbered (x - 1) * height + (y - 1), and kept in an array of
+    slots whose first len(self) entries are the candidates. Removing a cell
+    moves the last candidate into its slot (swap-remove), so the order of
+    the candidates changes as cells are removed. The array starts as the
+    identity (slot i holds cell i), and only the slots and cells that differ
+    from it are stored, in two dicts.
+
+    Supports len(), in, indexing (so random.choice() works on it),
+    iteration and remove(), like the list it replaces.
+    """
+    def __init__(self, width, height):
+        """ Starts with every cell of a width x height board.
+
+        Args:
+            width (int): width of the board
+            height (int): height of the board
+        """
+        self.width = width
+        self.height = height
+        self.size = width * height
+        # Slot -> cell number it holds, and cell number -> its slot, where
+        # they are not the same
+        self.cell_at = {}
+        self.slot_of = {}
+
+    def _number(self, cell):
+        """ Number of a cell, or None if it is not on the board."""
+        try:
+            x, y = cell
+        except (TypeError, ValueError):
+            return None
+        if 0 < x <= self.width and 0 < y <= self.height:
+            return (x - 1) * self.height + y - 1
+        return None
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, cell):
+        number = self._number(cell)
+        return (number is not None
+                and self.slot_of.get(number, number) < self.size)
+
+    def __getitem__(self, index):
+        """ Get the cell in a slot, as list indexing does."""
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("CandidateCells index out of range")
+        x, y = divmod(self.cell_at.get(index, index), self.height)
+        return x + 1, y + 1
+
+    def __iter__(self):
+        for index in range(self.size):
+            yield self[index]
+
+    def __repr__(self):
+        return (f"CandidateCells({self.width}x{self.height}, "
+                f"{len(self)} left)")
+
+    def remove(self, cell):
+        """ Remove a cell.
+
+        Args:
+            cell (tuple[int, int]): (x, y) cell coordinates
+
+        Raises:
+            ValueError: if the cell is not (or no longer) a candidate
+        """
+        number = self._number(cell)
+        slot = None if number is None else self.slot_of.get(number, number)
+        if slot is None or slot >= self.size:
+            raise ValueError(f"{cell} is not a candidate cell.")
+        last = self.size - 1
+        moved = self.cell_at.get(last, last)
+        # The last candidate takes the slot, and the cell goes just past the
+        # candidates, where it stays. Slots past the candidates are never
+        # read, so their cells need not be stored.
+        self.cell_at[slot] = moved
+        self.slot_of[moved] = slot
+        self.cell_at.pop(last, None)
+        self.slot_of[number] = last
+        self.size = last
@@ -0,0 +1,396 @@
+""" Compact binary storage for very many fleet layouts.
+
+A layout record is a run of little-endian uint16 words:
+
+    width, height, number_of_lengths, number_of_ships,
+    (length, count) for each length of ships_per_length, shortest first,
+    (x_start, y_start, x_end, y_end) for each ship
+
+so every layout of a given board size and fleet takes the same number of
+bytes. A corpus file is
+
+    header:   b'BSCORPUS', version (uint32), reserved (uint32)
+    records:  one after the other
+    index:    offset of each record in the file (uint64)
+    trailer:  offset of the index (uint64), number of records (uint64),
+              b'BSINDEX\\0'
+
+Keeping the index at the end lets CorpusWriter append records without
+moving the ones already written. New records go after the old trailer,
+and the new index and trailer after them, so the old ones stay valid until
+the new ones are complete: if appending is interrupted, the file ends with
+bytes no index refers to, and readers fall back to the last complete
+trailer. Each append leaves the previous index behind in the file.
+
+LayoutCorpus maps the file in memory, so opening it reads nothing but the
+trailer, and the coordinates of a record are a view into the file rather
+than a copy.
+
+Words are 16 bits, so boards are at most 65535 cells wide and high.
+"""
+import mmap
+import os
+
+import numpy as np
+
+from battleship.board import Board
+
+MAGIC = b'BSCORPUS'
+INDEX_MAGIC = b'BSINDEX\0'
+VERSION = 1
+
+_HEADER_SIZE = 16
+_TRAILER_SIZE = 24
+_WORD = np.dtype('<u2')
+_MAX_WORD = np.iinfo(_WORD).max
+
+# Bytes of the old index copied at a time when appending
+_COPY_SIZE = 1 << 20
+
+
+def record_size(ships_per_length):
+    """ Get the size in bytes of the record of a layout.
+
+    Args:
+        ships_per_length (dict): length of ship -> number of ships
+
+    Returns:
+        int : size of the record
+    """
+    return _WORD.itemsize * (4 + 2 * len(ships_per_length)
+                             + 4 * sum(ships_per_length.values()))
+
+
+def encode_layouts(board_size, ships_per_length, coordinates):
+    """ Encode layouts of the same board size and fleet as records.
+
+    Args:
+        board_size (tuple[int, int]): (width, height) of the board
+        ships_per_length (dict): length of ship -> number of ships
+        coordinates (numpy.ndarray): (number_of_layouts, number_of_ships, 4)
+            array of (x_start, y_start, x_end, y_end), as returned by
+            ShipFactory.generate_fleets(), or (number_of_ships, 4) for a
+            single layout
+
+    Returns:
+        bytes : the records, one after the other
+
+    Raises:
+        ValueError: if the board size, the fleet or a coordinate does not
+            fit in a 16-bit word, or if the ships of a layout are not the 
+            fleet of ships_per_length (the record would not have the size 
+            the index and record_size() expect)
+    """
+    coordinates = np.asarray(coordinates)
+    if coordinates.ndim == 2:
+        coordinates = coordinates[np.newaxis]
+    number_of_layouts, number_of_ships, _ = coordinates.shape
+    lengths = sorted(ships_per_length.items())
+    prefix = [board_size[0], board_size[1], len(lengths), number_of_ships]
+    for length, count in lengths:
+        prefix += [length, count]
+    if not all(0 <= word <= _MAX_WORD for word in prefix):
+        raise ValueError(f"Board size {tuple(board_size)} or fleet "
+                         f"{ships_per_length} does not fit in a corpus "
+                         f"record (at most {_MAX_WORD}).")
+    if coordinates.size and (coordinates.min() < 0
+                             or coordinates.max() > _MAX_WORD):
+        raise ValueError(f"Coordinates must be between 0 and {_MAX_WORD} "
+                         f"to fit in a corpus record.")
+
+    # Lengths of the ships of each layout, sorted, against the fleet's
+    expected = np.repeat([length for length, _ in lengths],
+                         [count for _, count in lengths])
+    spans = np.abs(coordinates[..., 2:].astype(np.int64)
+                   - coordinates[..., :2].astype(np.int64))
+    if (len(expected) != number_of_ships
+            or (spans.min(axis=-1) != 0).any()
+            or (np.sort(spans.max(axis=-1) + 1, axis=-1)
+                != expected).any()):
+        raise ValueError(f"The layouts do not all have the ships of "
+                         f"{ships_per_length}.")
+
+    records = np.empty((number_of_layouts, len(prefix) + 4 * number_of_ships),
+                       dtype=_WORD)
+    records[:, :len(prefix)] = prefix
+    records[:, len(prefix):] = coordinates.reshape(number_of_layouts, -1)
+    return records.tobytes()
+
+
+def decode_layout(buffer, offset=0):
+    """ Decode the record of a layout without copying its coordinates.
+
+    Args:
+        buffer (bytes-like): data holding the record
+        offset (int): position of the record in buffer. Defaults to 0.
+
+    Returns:
+        tuple : (board_size, ships_per_length, coordinates) where
+            coordinates is a read-only (number_of_ships, 4) uint16 view into
+            buffer
+    """
+    width, height, number_of_lengths, number_of_ships = np.frombuffer(
+        buffer, dtype=_WORD, count=4, offset=offset).tolist()
+    offset += 4 * _WORD.itemsize
+    lengths = np.frombuffer(buffer, dtype=_WORD, count=2 * number_of_lengths,
+                            offset=offset).tolist()
+    offset += 2 * number_of_lengths * _WORD.itemsize
+    coordinates = np.frombuffer(buffer, dtype=_WORD,
+                                count=4 * number_of_ships, offset=offset)
+    ships_per_length = dict(zip(lengths[::2], lengths[1::2]))
+    return ((width, height), ships_per_length,
+            coordinates.reshape(number_of_ships, 4))
+
+
+def _trailer_at(buffer, end):
+    """ Get (index_offset, number_of_records) of a trailer ending at end,
+    or None if there is no complete trailer there."""
+    if end < _HEADER_SIZE + _TRAILER_SIZE or buffer[end - 8:end] != INDEX_MAGIC:
+        return None
+    index_offset, number_of_records = np.frombuffer(
+        buffer, dtype='<u8', count=2, offset=end - _TRAILER_SIZE).tolist()
+    if (index_offset < _HEADER_SIZE or index_offset + 8 * number_of_records
+            != end - _TRAILER_SIZE):
+        return None
+    return index_offset, number_of_records
+
+
+def _read_trailer(buffer, size):
+    """ Find the last complete trailer of a corpus.
+
+    It is normally at the very end, unless an append was interrupted.
+
+    Returns:
+        tuple[int, int, int] : (index_offset, number_of_records, end of the
+            trailer)
+    """
+    if size < _HEADER_SIZE + _TRAILER_SIZE or buffer[:8] != MAGIC:
+        raise ValueError("Not a layout corpus file.")
+    end = size
+    while end > 0:
+        trailer = _trailer_at(buffer, end)
+        if trailer is not None:
+            return trailer + (end,)
+        end = buffer.rfind(INDEX_MAGIC, _HEADER_SIZE, end - 1)
+        end = end + len(INDEX_MAGIC) if end >= 0 else 0
+    raise ValueError("Not a layout corpus file.")
+
+
+class CorpusWriter:
+    """ Class appending layouts to a corpus file."""
+    def __init__(self, path):
+        """ Opens a corpus for appending, creating it if needed.
+
+        The index is only written by close(), so use the writer as a
+        context manager. Until then, the file keeps its previous index.
+
+        Args:
+            path (str): path of the corpus file
+
+        Raises:
+            ValueError: if the file exists but is not a corpus
+        """
+        self.path = path
+        # Index of the records already in the file, left where it is
+        self.old_index_offset = None
+        self.old_count = 0
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self.file = open(path, 'r+b')
+            size = os.path.getsize(path)
+            self.file.seek(size - min(size, _TRAILER_SIZE))
+            tail = self.file.read(_TRAILER_SIZE)
+            trailer = _trailer_at(tail, len(tail))
+            if trailer is not None:
+                self.file.seek(0)
+                if self.file.read(8) != MAGIC:
+                    raise ValueError("Not a layout corpus file.")
+                end = size
+            else:
+                with mmap.mmap(self.file.fileno(), 0,
+                               access=mmap.ACCESS_READ) as data:
+                    *trailer, end = _read_trailer(data, size)
+            self.old_index_offset, self.old_count = trailer
+            # Records go after the trailer, dropping what an interrupted
+            # append may have left after it
+            self.file.seek(end)
+            self.file.truncate()
+        else:
+            self.file = open(path, 'wb')
+            self.file.write(MAGIC + np.array([VERSION, 0], '<u4').tobytes())
+        self.offsets = []
+        self.end = self.file.tell()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.old_count + sum(len(offsets) for offsets in self.offsets)
+
+    def append_layouts(self, board_size, ships_per_length, coordinates):
+        """ Append layouts of the same board size and fleet in one write.
+
+        Args:
+            board_size (tuple[int, int]): (width, height) of the board
+            ships_per_length (dict): length of ship -> number of ships
+            coordinates (numpy.ndarray): (number_of_layouts, number_of_ships,
+                4) array of (x_start, y_start, x_end, y_end), as returned by
+                ShipFactory.generate_fleets()
+        """
+        records = encode_layouts(board_size, ships_per_length, coordinates)
+        size = record_size(ships_per_length)
+        self.offsets.append(self.end + size * np.arange(len(records) // size,
+                                                        dtype='<u8'))
+        self.file.write(records)
+        self.end += len(records)
+
+    def append_board(self, board):
+        """ Append the layout of a Board.
+
+        Args:
+            board (Board): the board
+        """
+        coordinates = [(ship.x_start, ship.y_start, ship.x_end, ship.y_end)
+                       for ship in board.ships]
+        self.append_layouts((board.width, board.height),
+                            board.ships_per_length, [coordinates])
+
+    def close(self):
+        """ Write the index and trailer, and close the file.
+
+        The records are on disk before the new index and trailer are
+        written, and the old index is only copied, never overwritten.
+        """
+        if self.file.closed:
+            return
+        if self.old_index_offset is not None and not self.offsets:
+            # Nothing appended: the file is unchanged
+            self.file.close()
+            return
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        # Copy of the old index, then the offsets of the new records
+        old_size = 8 * self.old_count
+        for start in range(0, old_size, _COPY_SIZE):
+            self.file.seek(self.old_index_offset + start)
+            chunk = self.file.read(min(_COPY_SIZE, old_size - start))
+            self.file.seek(self.end + start)
+            self.file.write(chunk)
+        self.file.seek(self.end + old_size)
+        for offsets in self.offsets:
+            self.file.write(offsets.astype('<u8').tobytes())
+        self.file.write(np.array([self.end, len(self)], '<u8').tobytes()
+                        + INDEX_MAGIC)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+
+
+class LayoutCorpus:
+    """ Class reading layouts from a memory-mapped corpus file."""
+    def __init__(self, path):
+        """ Maps a corpus file in memory.
+
+        Args:
+            path (str): path of the corpus file
+
+        Raises:
+            ValueError: if the file is not a corpus
+        """
+        self.path = path
+        with open(path, 'rb') as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        index_offset, number_of_records, _ = _read_trailer(self.mmap,
+                                                           len(self.mmap))
+        self.offsets = np.frombuffer(self.mmap, dtype='<u8',
+                                     count=number_of_records,
+                                     offset=index_offset)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def layout(self, index):
+        """ Get a layout without copying it.
+
+        Args:
+            index (int): position of the layout in the corpus
+
+        Returns:
+            tuple : (board_size, ships_per_length, coordinates), see
+                decode_layout()
+        """
+        return decode_layout(self.mmap, int(self.offsets[index]))
+
+    def board(self, index, board_class=Board):
+        """ Build a Board from a layout.
+
+        Args:
+            index (int): position of the layout in the corpus
+            board_class (type): Board or one of its subclasses. Defaults to
+                Board.
+
+        Returns:
+            Board : a new board with the ships of the layout, not validated
+        """
+        board_size, ships_per_length, coordinates = self.layout(index)
+        return board_class.from_coordinates(coordinates, board_size,
+                                            ships_per_length)
+
+    def coordinates(self, start=0, stop=None):
+        """ Get the coordinates of consecutive layouts as one array view.
+
+        Only possible when those layouts all have the same board size and
+        fleet, e.g. when they were appended by a single append_layouts().
+
+        Args:
+            start (int): position of the first layout. Defaults to 0.
+            stop (int): position after the last layout. Defaults to the end
+                of the corpus.
+
+        Returns:
+            numpy.ndarray : read-only (stop - start, number_of_ships, 4)
+                uint16 view into the file
+
+        Raises:
+            ValueError: if the layouts are not contiguous, or not all alike
+        """
+        offsets = self.offsets[start:stop]
+        if not len(offsets):
+            return np.zeros((0, 0, 4), dtype=_WORD)
+        _, ships_per_length, coordinates = self.layout(start)
+        words = record_size(ships_per_length) // _WORD.itemsize
+        if np.any(np.diff(offsets.astype(np.int64))
+                  != words * _WORD.itemsize):
+            raise ValueError("The layouts are not contiguous.")
+        records = np.frombuffer(self.mmap, dtype=_WORD,
+                                count=len(offsets) * words,
+                                offset=int(offsets[0])
+                                ).reshape(len(offsets), words)
+        number_of_ships = coordinates.shape[0]
+        prefix = records[:, :-4 * number_of_ships]
+        if np.any(prefix != prefix[0]):
+            raise ValueError("The layouts do not all have the same board "
+                             "size and fleet.")
+        return records[:, -4 * number_of_ships:].reshape(
+            len(offsets), number_of_ships, 4)
+
+    def close(self):
+        """ Unmap the file.
+
+        Views returned by layout() and coordinates() must not be used after
+        this. If some are still alive, the file stays mapped until they are
+        garbage collected.
+        """
+        self.offsets = None
+        try:
+            self.mmap.close()
+        except BufferError:
+            pass
@@ -0,0 +1,549 @@
+""" Probability-density targeting: shoot where the most ships could be.
+
+placement_heatmap() counts, for every cell, the legal placements of the
+ships still afloat that cover it, given what the shots so far revealed.
+DensityPlayer shoots at the cell with the highest count. Everything is
+computed with NumPy window sums over (height, width) arrays, where cell
+(x, y) is [y - 1, x - 1], as in ArrayBoard.
+
+On boards of hundreds of cells per side, IncrementalDensityPlayer keeps the
+counts in a PlacementCounts instead, which updates them after each shot.
+"""
+import heapq
+import random
+
+import numpy as np
+
+from battleship.board import Board
+from battleship.player import Player
+
+
+def _window_sums(cumulative, length):
+    """ Sums of every window of length cells along the rows.
+
+    Args:
+        cumulative (numpy.ndarray): (rows, n + 1) cumulative sums along the
+            rows, starting with a column of zeros
+        length (int): length of the windows
+
+    Returns:
+        numpy.ndarray : (rows, n - length + 1) array, whose [:, x] is the sum
+            of the cells x to x + length - 1
+    """
+    return cumulative[:, length:] - cumulative[:, :-length]
+
+
+def _coverage(legal, length):
+    """ Count the placements along the rows that cover each cell.
+
+    Args:
+        legal (numpy.ndarray): (rows, n - length + 1) boolean array, whose
+            [:, x] marks the placements on the cells x to x + length - 1
+        length (int): length of the placements
+
+    Returns:
+        numpy.ndarray : (rows, n) int32 array of placement counts
+    """
+    rows, starts = legal.shape
+    # Cell x is covered by the placements starting at x - length + 1..x
+    legal_sums = np.zeros((rows, starts + 2 * length - 1), dtype=np.int32)
+    np.cumsum(legal, axis=1, out=legal_sums[:, length:starts + length])
+    legal_sums[:, starts + length:] = legal_sums[:, starts + length - 1:
+                                                 starts + length]
+    return _window_sums(legal_sums, length)
+
+
+def _sunk_ship(is_hit, cell):
+    """ Find the ship that sank, from the hit that sank it.
+
+    Ships do not touch, so the ship is made of the hits in line with the
+    cell, horizontally or vertically.
+
+    Args:
+        is_hit (callable): is_hit(x, y) is True if cell (x, y) was hit on a
+            ship that had not sunk, and False for cells off the board
+        cell (tuple[int, int]): (x, y) of the hit that sank the ship
+
+    Returns:
+        tuple[tuple[int, int], tuple[int, int]] : (x, y) of the top/left
+            and bottom/right ends of the ship
+    """
+    x, y = cell
+    x_start = x_end = x
+    y_start = y_end = y
+    while is_hit(x_start - 1, y):
+        x_start -= 1
+    while is_hit(x_end + 1, y):
+        x_end += 1
+    while is_hit(x, y_start - 1):
+        y_start -= 1
+    while is_hit(x, y_end + 1):
+        y_end += 1
+    if x_end - x_start >= y_end - y_start:
+        return (x_start, y), (x_end, y)
+    return (x, y_start), (x, y_end)
+
+
+def _row_heatmap(blocked, hits, ships_per_length, must_cover_hit):
+    """ Heatmap of the horizontal placements only (see placement_heatmap).
+
+    Returns:
+        numpy.ndarray : (height, width) int64 array of placement counts
+    """
+    height, width = blocked.shape
+    blocked_sums = np.zeros((height, width + 1), dtype=np.int32)
+    np.cumsum(blocked, axis=1, out=blocked_sums[:, 1:])
+    if must_cover_hit:
+        hit_sums = np.zeros((height, width + 1), dtype=np.int32)
+        np.cumsum(hits, axis=1, out=hit_sums[:, 1:])
+        # Summed-area table of the hits, with a border of one empty cell 
+        # around the board, to count the hits in the halo of each placement
+        area = np.zeros((height + 3, width + 3), dtype=np.int32)
+        area[2:-1, 2:-1] = hits.cumsum(axis=0, dtype=np.int32).cumsum(axis=1)
+        area[-1, 2:-1] = area[-2, 2:-1]
+        area[:, -1] = area[:, -2]
+
+    heatmap = np.zeros((height, width), dtype=np.int64)
+    for length, count in ships_per_length.items():
+        if count <= 0 or length > width:
+            continue
+        starts = width - length + 1
+        # A placement is legal if none of its cells is blocked, and if there
+        # are no hits around it: ships do not touch, so hits next to a ship
+        # belong to it.
+        legal = _window_sums(blocked_sums, length) == 0
+        if must_cover_hit:
+            window_hits = _window_sums(hit_sums, length)
+            halo_hits = (area[3:, length + 2:] - area[:-3, length + 2:]
+                         - area[3:, :starts] + area[:-3, :starts])
+            legal &= (halo_hits == window_hits) & (window_hits > 0)
+        heatmap += count * _coverage(legal, length)
+    return heatmap
+
+
+def placement_heatmap(blocked, hits, ships_per_length):
+    """ Count the legal placements of the remaining ships covering each cell.
+
+    A placement is legal if none of its cells is blocked and if the only
+    hits next to it (diagonals included) are on it, as ships do not touch.
+    When there are hits, only the placements covering at least one of them
+    are counted, to finish off the ships that were hit, unless none is
+    legal (the fleet is not the one expected), in which case the hits are
+    counted as misses.
+
+    Args:
+        blocked (numpy.ndarray): (height, width) boolean array of the cells
+            that cannot hold a ship still afloat: misses, and the cells of
+            the ships sunk and their surroundings
+        hits (numpy.ndarray): (height, width) boolean array of the cells hit
+            on ships that have not sunk yet
+        ships_per_length (dict): length of ship -> number of ships afloat
+
+    Returns:
+        numpy.ndarray : (height, width) int64 array. Each placement is
+            counted once per ship of its length still afloat.
+    """
+    lengths = {length: count for length, count in ships_per_length.items()
+               if length > 1}
+    must_cover_hit = bool(hits.any())
+    for _ in range(1 + must_cover_hit):
+        # Vertical placements are the horizontal ones of the transposed
+        # board, and ships of length 1 only count once.
+        heatmap = (_row_heatmap(blocked, hits, ships_per_length,
+                                must_cover_hit)
+                   + _row_heatmap(blocked.T, hits.T, lengths,
+                                  must_cover_hit).T)
+        if heatmap.any() or not must_cover_hit:
+            break
+        must_cover_hit = False
+        blocked = blocked | hits
+    return heatmap
+
+
+class DensityPlayer(Player):
+    """ Player shooting at the cell the most placements of ships cover.
+
+    It assumes that the opponent's fleet and board size are the same as its
+    own (the rules of the game), or the ones given.
+    """
+    def __init__(self, name=None, board=None, ships_per_length=None,
+                 seed=None):
+        """ Initialise the player with an automatic board and other attributes.
+
+        Args:
+            name (str): Player's name
+            board (Board): The player's board. If not provided, then a board
+                will be generated automatically
+            ships_per_length (dict): length of ship -> number of ships of the
+                opponent. Defaults to the fleet of the player's board.
+            seed (int): seed of the random generator breaking ties between
+                cells. Defaults to None, which uses the random module.
+        """
+        super().__init__(board=Board() if board is None else board,
+                         name=name)
+        self.rng = random if seed is None else random.Random(seed)
+        if ships_per_length is None:
+            ships_per_length = self.board.ships_per_length
+        # Ships of the opponent that have not sunk yet
+        self.ships_afloat = dict(ships_per_length)
+
+        shape = (self.board.height, self.board.width)
+        self.shots = np.zeros(shape, dtype=bool)
+        self.blocked = np.zeros(shape, dtype=bool)
+        self.hits = np.zeros(shape, dtype=bool)
+        self.target_coordinates = None
+
+    def select_target(self):
+        """ Select the cell not attacked yet with the highest heatmap value.
+
+        Ties are broken at random.
+
+        Returns:
+            tuple[int, int] : (x, y) cell coordinates at which to launch the
+                next attack, or None if every cell has been attacked
+        """
+        return self._select_best(placement_heatmap(self.blocked, self.hits,
+                                                   self.ships_afloat))
+
+    def _select_best(self, scores):
+        """ Select the cell not attacked yet with the highest score.
+
+        Args:
+            scores (numpy.ndarray): (height, width) signed array of scores,
+                which gets modified
+
+        Returns:
+            tuple[int, int] : (x, y) cell coordinates, or None if every cell
+                has been attacked
+        """
+        scores[self.shots] = -1
+        best = np.flatnonzero(scores == scores.max())
+        cell = int(best[self.rng.randrange(len(best))])
+        y, x = divmod(cell, self.board.width)
+        if self.shots[y, x]:
+            self.target_coordinates = None
+            return None
+        self.shots[y, x] = True
+        self.target_coordinates = (x + 1, y + 1)
+        return self.target_coordinates
+
+    def receive_result(self, is_ship_hit, has_ship_sunk):
+        """ Record the outcome of the latest attack.
+
+        A sunk ship is made of the hits in line with the latest attack (ships
+        do not touch). Its cells and surroundings get blocked, and it is no
+        longer afloat.
+
+        Args:
+            is_ship_hit (bool): True if a ship was hit
+            has_ship_sunk (bool): True if the ship hit has sunk
+
+        Returns:
+            None
+        """
+        if self.target_coordinates is None:
+            return None
+        x, y = self.target_coordinates[0] - 1, self.target_coordinates[1] - 1
+        if not is_ship_hit:
+            self.blocked[y, x] = True
+            return None
+        self.hits[y, x] = True
+        if not has_ship_sunk:
+            return None
+
+        height, width = self.hits.shape
+        (x_start, y_start), (x_end, y_end) = _sunk_ship(
+            lambda x, y: (0 < x <= width and 0 < y <= height
+                          and bool(self.hits[y - 1, x - 1])),
+            self.target_coordinates)
+        self.hits[y_start - 1:y_end, x_start - 1:x_end] = False
+        self.blocked[max(0, y_start - 2):y_end + 1,
+                     max(0, x_start - 2):x_end + 1] = True
+
+        length = (x_end - x_start) + (y_end - y_start) + 1
+        if self.ships_afloat.get(length, 0) > 0:
+            self.ships_afloat[length] -= 1
+        return None
+
+
+class PlacementCounts:
+    """ Heatmap of the legal placements of a fleet, updated shot by shot.
+
+    placement_heatmap() looks at every placement of every ship after each
+    shot. PlacementCounts keeps which placements are still legal and the
+    number of them covering each cell, and blocking a cell only updates
+    the placements covering it. The placements of a ship of length L
+    covering a cell are those starting up to L - 1 cells before it, in its
+    row and in its column, so this index from cells to placements is
+    computed rather than stored.
+
+    Unlike placement_heatmap(), placements are counted once per length of
+    ship afloat rather than once per ship, so that sinking a ship only
+    changes the counts (of the whole board) when it is the last of its
+    length.
+
+    The cell with the highest count is kept in a heap. Counts only ever go
+    down, so entries of the heap are not updated when a few counts change:
+    an entry whose count is out of date is put back with the right count
+    when it reaches the top. Ties are broken in a random order.
+    """
+    def __init__(self, board_size, ships_per_length, seed=None):
+        """ Starts with every placement of the fleet legal.
+
+        Args:
+            board_size (tuple[int, int]): (width, height) of the board
+            ships_per_length (dict): length of ship -> number of ships
+            seed (int): seed of the order in which ties are broken
+        """
+        self.width, self.height = board_size
+        self.ships_afloat = {length: count
+                             for length, count in ships_per_length.items()
+                             if count > 0}
+        # Length -> legal placements along the rows, (height, width - L + 1),
+        # and along the columns, (width, height - L + 1), as in _coverage()
+        self.legal = {}
+        for length in self.ships_afloat:
+            rows = np.ones((self.height, max(0, self.width - length + 1)),
+                           dtype=bool)
+            columns = np.ones((self.width, max(0, self.height - length + 1)),
+                              dtype=bool)
+            if length == 1:
+                columns[:] = False
+            self.legal[length] = (rows, columns)
+        empty = np.zeros((self.height, self.width), dtype=bool)
+        self.heat = placement_heatmap(empty, empty, dict.fromkeys(self.legal,
+                                                                  1))
+
+        # Heap of (-count, rank) entries, where cell self.order[rank] is
+        # y * width + x
+        self.order = np.random.default_rng(seed).permutation(
+            self.width * self.height)
+        self._order = self.order.tolist()
+        self._is_done = np.zeros(len(self.order), dtype=bool)
+        self._build_heap()
+
+    def _build_heap(self):
+        """ Fill the heap with the cells not done, and their counts."""
+        ranks = np.flatnonzero(~self._is_done[self.order])
+        self._heap = list(zip(
+            (-self.heat.ravel()[self.order[ranks]]).tolist(), ranks.tolist()))
+        heapq.heapify(self._heap)
+
+    def block(self, cells):
+        """ Remove the placements covering cells that cannot hold a ship.
+
+        Args:
+            cells (iterable[tuple[int, int]]): (x, y) of the cells, e.g. a
+                miss, or a ship that sank and the cells around it
+        """
+        for x, y in cells:
+            if not (0 < x <= self.width and 0 < y <= self.height):
+                continue
+            for length, (rows, columns) in self.legal.items():
+                # Along the row of the cell, then along its column
+                for legal, heat, row, position in (
+                        (rows, self.heat, y - 1, x - 1),
+                        (columns, self.heat.T, x - 1, y - 1)):
+                    first = max(0, position - length + 1)
+                    line = legal[row, first:position + 1]
+                    for start in (first + np.flatnonzero(line)).tolist():
+                        heat[row, start:start + length] -= 1
+                    line[:] = False
+
+    def remove_ship(self, length):
+        """ Remove a ship that sank from the fleet.
+
+        If it was the last ship of its length, its placements are removed
+        from every count, which costs in proportion to the area of the
+        board.
+
+        Args:
+            length (int): length of the ship
+        """
+        if self.ships_afloat.get(length, 0) <= 0:
+            return
+        self.ships_afloat[length] -= 1
+        if self.ships_afloat[length]:
+            return
+        del self.ships_afloat[length]
+        rows, columns = self.legal.pop(length)
+        if rows.size:
+            self.heat -= _coverage(rows, length)
+        if columns.size:
+            self.heat -= _coverage(columns, length).T
+        # Most entries of the heap are now out of date
+        self._build_heap()
+
+    def mark_done(self, cell):
+        """ Exclude a cell from best_cell(), e.g. because it was attacked.
+
+        Args:
+            cell (tuple[int, int]): (x, y) cell coordinates
+        """
+        x, y = cell
+        self._is_done[(y - 1) * self.width + x - 1] = True
+
+    def best_cell(self):
+        """ Get the cell with the highest count not marked done yet.
+
+        Returns:
+            tuple[int, int] : (x, y) of the cell, or None if every cell is
+                done
+        """
+        heap = self._heap
+        heat = self.heat.ravel()
+        while heap:
+            negative_count, rank = heap[0]
+            cell = self._order[rank]
+            if self._is_done[cell]:
+                heapq.heappop(heap)
+                continue
+            count = int(heat[cell])
+            if count != -negative_count:
+                heapq.heapreplace(heap, (-count, rank))
+                continue
+            y, x = divmod(cell, self.width)
+            return x + 1, y + 1
+        return None
+
+    def hit_counts(self, hits):
+        """ Count the legal placements around ships that were hit.
+
+        Only the placements covering at least one of the hits, and next to
+        no other hit, are counted, as in placement_heatmap() (but once per
+        length, as in self.heat).
+
+        Args:
+            hits (set[tuple[int, int]]): (x, y) of the cells hit on ships
+                that have not sunk
+
+        Returns:
+            dict : (x, y) -> number of placements covering the cell
+        """
+        counts = {}
+        checked = set()
+        for x, y in hits:
+            for length, (rows, columns) in self.legal.items():
+                for legal, row, position, step in (
+                        (rows, y - 1, x - 1, (1, 0)),
+                        (columns, x - 1, y - 1, (0, 1))):
+                    first = max(0, position - length + 1)
+                    line = legal[row, first:position + 1]
+                    for start in (first + np.flatnonzero(line)).tolist():
+                        key = (length, step, row, start)
+                        if key in checked:
+                            continue
+                        checked.add(key)
+                        if step == (1, 0):
+                            x_start, y_start = start + 1, row + 1
+                        else:
+                            x_start, y_start = row + 1, start + 1
+                        x_end = x_start + step[0] * (length - 1)
+                        y_end = y_start + step[1] * (length - 1)
+                        if any((x_start - 1 <= hit_x <= x_end + 1
+                                and y_start - 1 <= hit_y <= y_end + 1)
+                               and not (x_start <= hit_x <= x_end
+                                        and y_start <= hit_y <= y_end)
+                               for hit_x, hit_y in hits):
+                            continue
+                        for offset in range(length):
+                            cell = (x_start + step[0] * offset,
+                                    y_start + step[1] * offset)
+                            counts[cell] = counts.get(cell, 0) + 1
+        return counts
+
+
+class IncrementalDensityPlayer(Player):
+    """ DensityPlayer for large boards, on top of PlacementCounts.
+
+    Each shot costs in proportion to the number of placements it rules out
+    (and sinking the last ship of a length to the area of the board),
+    rather than the area of the board times the size of the fleet.
+    """
+    def __init__(self, name=None, board=None, ships_per_length=None,
+                 seed=None):
+        """ Initialise the player with an automatic board and other attributes.
+
+        Args:
+            name (str): Player's name
+            board (Board): The player's board. If not provided, then a board
+                will be generated automatically
+            ships_per_length (dict): length of ship -> number of ships of the
+                opponent. Defaults to the fleet of the player's board.
+            seed (int): seed of the random generators breaking ties between
+                cells. Defaults to None.
+        """
+        super().__init__(board=Board() if board is None else board,
+                         name=name)
+        self.rng = random if seed is None else random.Random(seed)
+        if ships_per_length is None:
+            ships_per_length = self.board.ships_per_length
+        self.counts = PlacementCounts((self.board.width, self.board.height),
+                                      ships_per_length, seed)
+        # Ships of the opponent that have not sunk yet
+        self.ships_afloat = self.counts.ships_afloat
+        self.tracker = set()
+        # Cells hit on ships that have not sunk yet
+        self.hits = set()
+        self.target_coordinates = None
+
+    def select_target(self):
+        """ Select the cell not attacked yet with the highest count.
+
+        While a ship that was hit is afloat, only the placements around the
+        hits count (see PlacementCounts.hit_counts()).
+
+        Returns:
+            tuple[int, int] : (x, y) cell coordinates at which to launch the
+                next attack, or None if every cell has been attacked
+        """
+        cell = None
+        if self.hits:
+            counts = {cell: count for cell, count
+                      in self.counts.hit_counts(self.hits).items()
+                      if cell not in self.tracker}
+            if counts:
+                best = max(counts.values())
+                cell = self.rng.choice(sorted(
+                    cell for cell, count in counts.items() if count == best))
+        if cell is None:
+            cell = self.counts.best_cell()
+        if cell is not None:
+            self.counts.mark_done(cell)
+            self.tracker.add(cell)
+        self.target_coordinates = cell
+        return cell
+
+    def receive_result(self, is_ship_hit, has_ship_sunk):
+        """ Record the outcome of the latest attack.
+
+        Misses, and ships that sank with the cells around them, are blocked
+        in self.counts (see DensityPlayer.receive_result()).
+
+        Args:
+            is_ship_hit (bool): True if a ship was hit
+            has_ship_sunk (bool): True if the ship hit has sunk
+
+        Returns:
+            None
+        """
+        cell = self.target_coordinates
+        if cell is None:
+            return None
+        if not is_ship_hit:
+            self.counts.block([cell])
+            return None
+        self.hits.add(cell)
+        if not has_ship_sunk:
+            return None
+
+        (x_start, y_start), (x_end, y_end) = _sunk_ship(
+            lambda x, y: (x, y) in self.hits, cell)
+        self.hits.difference_update(
+            (x, y) for x in range(x_start, x_end + 1)
+            for y in range(y_start, y_end + 1))
+        self.counts.block(
+            (x, y) for x in range(x_start - 1, x_end + 2)
+            for y in range(y_start - 1, y_end + 2))
+        self.counts.remove_ship((x_end - x_start) + (y_end - y_start) + 1)
+        return None
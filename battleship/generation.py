@@ -0,0 +1,197 @@
+""" Budgets, reports and metrics for the generation of fleet layouts.
+
+ShipFactory.generate_ships() fills a GenerationReport while it lays out a
+fleet: how many times it started over, how many placements it drew and
+why it rejected some, and how long it took. A GenerationBudget bounds the
+number of draws and the time spent (DEFAULT_BUDGET unless another one is
+given), and when generation fails (the fleet cannot fit, or the budget ran
+out) the report comes with the LayoutGenerationError. GenerationMetrics
+adds reports up per board size and fleet, to find out which fleets are
+expensive to lay out.
+"""
+import time
+
+# Rejection reasons of GenerationReport.rejected:
+# - 'too_close': the placement overlaps or touches a ship already placed
+# - 'dead_end': the placement left no room for the ships after it, so it
+#   was undone
+REJECTION_REASONS = ('too_close', 'dead_end')
+
+# Outcomes of GenerationReport.outcome
+PLACED = 'placed'
+NO_LAYOUT = 'no_layout'
+GAVE_UP = 'gave_up'
+OUT_OF_BUDGET = 'out_of_budget'
+
+# Number of draws between two checks of the clock
+_CLOCK_INTERVAL = 256
+
+
+class GenerationBudget:
+    """ Limits on the effort spent laying out one fleet."""
+    def __init__(self, max_draws=None, time_limit=None):
+        """ Sets the limits. None means no limit.
+
+        Args:
+            max_draws (int): number of placements that may be drawn
+            time_limit (float): number of seconds that may be spent
+        """
+        self.max_draws = max_draws
+        self.time_limit = time_limit
+
+    def __repr__(self):
+        return (f"GenerationBudget(max_draws={self.max_draws}, "
+                f"time_limit={self.time_limit})")
+
+
+_NO_BUDGET = GenerationBudget()
+
+# Budget of ShipFactory when none is given: a fleet that takes this long is
+# most likely one that cannot fit
+DEFAULT_BUDGET = GenerationBudget(time_limit=10.0)
+
+
+class GenerationReport:
+    """ What it took to lay out one fleet, or why it could not be done."""
+    __slots__ = ('board_size', 'ships_per_length', 'budget', 'is_limited', 
+                 'attempts', 'draws', 'rejected', 'wall_time', 'outcome', 
+                 'failed_length', 'start', '_next_clock_check')
+
+    def __init__(self, board_size, ships_per_length, budget=None):
+        """ Starts an empty report, and the clock.
+
+        Args:
+            board_size (tuple[int, int]): (width, height) of the board
+            ships_per_length (dict): length of ship -> number of ships
+            budget (GenerationBudget): limits of the generation. Defaults to
+                no limits.
+        """
+        self.board_size = tuple(board_size)
+        self.ships_per_length = ships_per_length
+        self.budget = _NO_BUDGET if budget is None else budget
+        # Whether is_over_budget() can ever be True
+        self.is_limited = (self.budget.max_draws is not None 
+                           or self.budget.time_limit is not None)
+        # Fleets started from scratch
+        self.attempts = 0
+        # Placements drawn, and placements rejected per reason
+        self.draws = 0
+        self.rejected = {'too_close': 0, 'dead_end': 0}
+        self.wall_time = 0.0
+        # One of PLACED, NO_LAYOUT (the fleet cannot fit), GAVE_UP (no
+        # layout found, without proving there is none) or OUT_OF_BUDGET
+        self.outcome = None
+        # Length of the ship being placed when generation stopped
+        self.failed_length = None
+        self.start = time.perf_counter()
+        self._next_clock_check = _CLOCK_INTERVAL
+
+    def is_over_budget(self):
+        """ Check whether the draws or time spent so far exceed the budget.
+
+        Only reads the clock every few hundred draws, so it is cheap enough
+        to call after every draw.
+
+        Returns:
+            bool : True if generation should stop
+        """
+        budget = self.budget
+        if budget.max_draws is not None and self.draws > budget.max_draws:
+            return True
+        if budget.time_limit is not None and (
+                self.draws >= self._next_clock_check):
+            self._next_clock_check = self.draws + _CLOCK_INTERVAL
+            return time.perf_counter() - self.start > budget.time_limit
+        return False
+
+    def finish(self, outcome, failed_length=None):
+        """ Record how generation ended, and stop the clock.
+
+        Args:
+            outcome (str): PLACED, NO_LAYOUT, GAVE_UP or OUT_OF_BUDGET
+            failed_length (int): length of the ship that could not be placed
+        """
+        self.outcome = outcome
+        self.failed_length = failed_length
+        self.wall_time = time.perf_counter() - self.start
+
+    def as_dict(self):
+        """ Get the report as a dict of plain values, e.g. to log it."""
+        return {'board_size': self.board_size,
+                'ships_per_length': dict(self.ships_per_length),
+                'outcome': self.outcome,
+                'failed_length': self.failed_length,
+                'attempts': self.attempts,
+                'draws': self.draws,
+                'rejected': dict(self.rejected),
+                'wall_time': self.wall_time,
+                'max_draws': self.budget.max_draws,
+                'time_limit': self.budget.time_limit}
+
+    def __repr__(self):
+        return (f"GenerationReport({self.outcome}, attempts={self.attempts}, "
+                f"draws={self.draws}, rejected={self.rejected}, "
+                f"wall_time={self.wall_time:.6f})")
+
+
+class LayoutGenerationError(RuntimeError):
+    """ Raised when a fleet could not be laid out. self.report says why."""
+    def __init__(self, report):
+        reasons = {NO_LAYOUT: "they do not fit",
+                   GAVE_UP: "no layout was found",
+                   OUT_OF_BUDGET: f"the budget ran out ({report.budget!r})"}
+        super().__init__(
+            f"Unable to place ships {report.ships_per_length} on a board of "
+            f"size {report.board_size}: {reasons.get(report.outcome)} after "
+            f"{report.attempts} attempt(s), {report.draws} draws and "
+            f"{report.wall_time:.3f}s.")
+        self.report = report
+
+
+class GenerationMetrics:
+    """ Totals of many GenerationReports, per board size and fleet."""
+    def __init__(self):
+        # (board_size, ships_per_length items) -> totals
+        self.totals = {}
+
+    def record(self, report):
+        """ Add a finished report to the totals of its configuration.
+
+        Args:
+            report (GenerationReport): the report
+        """
+        key = (report.board_size, tuple(sorted(
+            report.ships_per_length.items())))
+        totals = self.totals.get(key)
+        if totals is None:
+            totals = self.totals[key] = {
+                'boards': 0, 'failures': 0, 'attempts': 0, 'draws': 0,
+                'rejected': dict.fromkeys(REJECTION_REASONS, 0),
+                'wall_time': 0.0, 'max_wall_time': 0.0}
+        totals['boards'] += 1
+        totals['failures'] += report.outcome != PLACED
+        totals['attempts'] += report.attempts
+        totals['draws'] += report.draws
+        for reason, count in report.rejected.items():
+            totals['rejected'][reason] += count
+        totals['wall_time'] += report.wall_time
+        totals['max_wall_time'] = max(totals['max_wall_time'],
+                                      report.wall_time)
+
+    def summary(self):
+        """ Get the totals of each configuration, most expensive first.
+
+        Returns:
+            list[dict] : one dict per configuration with its board_size and
+                ships_per_length, the number of boards and failures, the
+                totals of attempts, draws, rejected placements (per reason)
+                and wall time, and the mean and max wall time per board
+        """
+        rows = []
+        for (board_size, items), totals in self.totals.items():
+            row = {'board_size': board_size, 'ships_per_length': dict(items)}
+            row.update(totals)
+            row['rejected'] = dict(totals['rejected'])
+            row['mean_wall_time'] = totals['wall_time'] / totals['boards']
+            rows.append(row)
+        return sorted(rows, key=lambda row: -row['mean_wall_time'])
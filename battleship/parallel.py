@@ -0,0 +1,97 @@
+""" Generate very many fleets in parallel, reproducibly.
+
+The work is cut into chunks of a fixed size, and chunk i always draws from
+the random stream SeedSequence(seed, spawn_key=(i,)). What a chunk holds
+therefore only depends on the seed and on its index, not on which worker
+process generated it, so the output is identical for any number of
+processes (including none at all).
+"""
+from collections import deque
+import multiprocessing
+
+import numpy as np
+
+from battleship.ship import ShipFactory
+
+
+def _generate_chunk(board_size, items, entropy, chunk_index,
+                    number_of_fleets):
+    """ Generate one chunk of fleets. Runs in the worker processes."""
+    seed_sequence = np.random.SeedSequence(entropy, spawn_key=(chunk_index,))
+    ship_factory = ShipFactory(board_size=board_size,
+                               ships_per_length=dict(items))
+    return ship_factory.generate_fleets(number_of_fleets,
+                                        np.random.default_rng(seed_sequence))
+
+
+class ParallelFleetGenerator:
+    """ Class to generate fleets in bulk across worker processes."""
+    def __init__(self, board_size=(10,10), ships_per_length=None, seed=None,
+                 chunk_size=100_000, processes=None):
+        """ Initialises the generator.
+
+        Args:
+            board_size (tuple[int, int]): (width, height) of the board.
+                Defaults to (10, 10).
+            ships_per_length (dict): A dict with the length of ship as keys
+                and the count as values. Defaults to 1 ship each for lengths
+                1-5.
+            seed (int): master seed. Defaults to fresh entropy, which is then
+                kept in self.seed so that the run can be reproduced.
+            chunk_size (int): number of fleets per chunk. Part of what the
+                output depends on, along with the seed. Defaults to 100,000.
+            processes (int): number of worker processes. 0 generates
+                everything in the calling process. Defaults to the number
+                of CPUs.
+        """
+        self.board_size = tuple(board_size)
+        if ships_per_length is None:
+            ships_per_length = {1: 1, 2: 1, 3: 1, 4: 1, 5: 1}
+        self.ships_per_length = ships_per_length
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        self.seed = seed
+        self.chunk_size = chunk_size
+        if processes is None:
+            processes = multiprocessing.cpu_count()
+        self.processes = processes
+
+    def _chunk_arguments(self, number_of_fleets):
+        items = tuple(sorted(self.ships_per_length.items()))
+        for chunk_index, start in enumerate(range(0, number_of_fleets,
+                                                  self.chunk_size)):
+            size = min(self.chunk_size, number_of_fleets - start)
+            yield self.board_size, items, self.seed, chunk_index, size
+
+    def generate(self, number_of_fleets):
+        """ Generate fleets, streamed back in chunks and in order.
+
+        Only a few chunks per worker are in flight at any time, so memory
+        use does not grow with number_of_fleets as long as the caller
+        consumes the chunks.
+
+        Args:
+            number_of_fleets (int): total number of fleets to generate
+
+        Yields:
+            tuple[numpy.ndarray, numpy.ndarray] : (grids, coordinates) of
+                one chunk, as returned by ShipFactory.generate_fleets()
+
+        Raises:
+            RuntimeError: if the ships cannot all fit on the board
+        """
+        arguments = self._chunk_arguments(number_of_fleets)
+        if self.processes == 0:
+            for chunk_arguments in arguments:
+                yield _generate_chunk(*chunk_arguments)
+            return
+
+        with multiprocessing.Pool(self.processes) as pool:
+            pending = deque()
+            for chunk_arguments in arguments:
+                pending.append(pool.apply_async(_generate_chunk,
+                                                chunk_arguments))
+                if len(pending) >= 2 * self.processes:
+                    yield pending.popleft().get()
+            while pending:
+                yield pending.popleft().get()
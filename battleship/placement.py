@@ -0,0 +1,917 @@
+""" Tables of legal ship placements and samplers drawing fleets from them.
+
+Cells are numbered row-major: (x, y) is bit (y - 1) * width + (x - 1) of a
+board-wide bitmask. This module only deals with coordinates and masks;
+battleship.ship.ShipFactory turns its placements into Ship instances.
+"""
+import json
+import os
+import random
+from functools import lru_cache
+
+import numpy as np
+
+from battleship.generation import (DEFAULT_BUDGET, GAVE_UP, NO_LAYOUT, 
+                                   OUT_OF_BUDGET, PLACED, GenerationReport,
+                                   LayoutGenerationError)
+
+# Number of draws from a whole placement table before sample_layout() falls
+# back to listing the placements that are still free
+_BLIND_DRAWS = 8
+
+# Draws per ship sample_layout() may make while backtracking before it 
+# starts over from scratch: a search that went wrong early would otherwise 
+# have to undo most of its layouts before it could fix its first ships. 
+# Short searches restarted often find crowded layouts fastest.
+BACKTRACKING_DRAWS_PER_SHIP = 10
+
+# Rounds of redrawing the layouts that failed before sample_layouts() gives
+# up. Each round usually completes a good share of the rows left.
+MAX_REDRAW_ROUNDS = 1000
+
+# Boards with more cells than this are laid out by sample_sparse_layout(), 
+# without placement tables (whose size and masks grow with the board)
+LARGE_BOARD_CELLS = 4096
+
+# Draws from every placement of a ship before sample_sparse_layout() lists 
+# the free ones, and number of times it starts a fleet over
+_SPARSE_DRAWS = 64
+_SPARSE_RESTARTS = 8
+
+# LayoutCounter gives up rather than build arrays of partial layouts (and
+# of the intermediate results to expand or complete them) larger than this
+# many bytes
+MAX_COUNTING_BYTES = 256 * 2**20
+
+# Number of partial layouts LayoutCounter completes at once
+_BLOCK_SIZE = 32768
+
+
+class Placement:
+    """ One legal position of a ship on a board of a given size."""
+    __slots__ = ('index', 'start', 'end', 'length', 'cell_mask', 'halo_mask')
+
+    def __init__(self, index, start, end, width, height):
+        """ Builds the masks of a ship lying from start to end.
+
+        Args:
+            index (int): position of the placement in its placement_table()
+            start (tuple[int, int]): (x, y) of the top/left end of the ship
+            end (tuple[int, int]): (x, y) of the bottom/right end of the ship
+            width (int): width of the board
+            height (int): height of the board
+        """
+        (x_start, y_start), (x_end, y_end) = start, end
+        self.index = index
+        self.start = start
+        self.end = end
+        self.length = (x_end - x_start) + (y_end - y_start) + 1
+
+        # Cells of the ship
+        self.cell_mask = 0
+        for y in range(y_start, y_end + 1):
+            for x in range(x_start, x_end + 1):
+                self.cell_mask |= 1 << ((y - 1) * width + x - 1)
+
+        # Cells of the ship plus every cell near it (see Ship.is_near_cell),
+        # i.e. the cells no other ship may occupy
+        self.halo_mask = 0
+        for y in range(max(1, y_start - 1), min(height, y_end + 1) + 1):
+            for x in range(max(1, x_start - 1), min(width, x_end + 1) + 1):
+                self.halo_mask |= 1 << ((y - 1) * width + x - 1)
+
+    def __repr__(self):
+        return f"Placement(start={self.start}, end={self.end})"
+
+
+@lru_cache(maxsize=128)
+def placement_table(board_size, length):
+    """ Enumerate every legal placement of a ship of a given length.
+
+    Tables are computed once per (board_size, length) and cached.
+
+    Args:
+        board_size (tuple[int, int]): (width, height) of the board
+        length (int): length of the ship
+
+    Returns:
+        tuple[Placement] : every horizontal and vertical placement of the
+            ship that fits on the board (a ship of length 1 only once)
+    """
+    width, height = board_size
+    placements = []
+    for y in range(1, height + 1):
+        for x in range(1, width + 1):
+            ends = []
+            if x + length - 1 <= width:
+                ends.append((x + length - 1, y))
+            if length > 1 and y + length - 1 <= height:
+                ends.append((x, y + length - 1))
+            for end in ends:
+                placements.append(
+                    Placement(len(placements), (x, y), end, width, height))
+    return tuple(placements)
+
+
+def fleet_lengths(ships_per_length):
+    """ List the ship lengths of a fleet, longest first.
+
+    Args:
+        ships_per_length (dict): length of ship -> number of ships
+
+    Returns:
+        list[int] : one entry per ship, in the order ships get placed
+    """
+    return [length
+            for length, count in sorted(ships_per_length.items(), reverse=True)
+            for _ in range(count)]
+
+
+@lru_cache(maxsize=128)
+def fleet_tables(board_size, ships_per_length_items):
+    """ Get the placement tables of every ship of a fleet.
+
+    Args:
+        board_size (tuple[int, int]): (width, height) of the board
+        ships_per_length_items (tuple): ships_per_length.items() as a tuple,
+            so that it can be cached
+
+    Returns:
+        tuple[tuple[Placement]] : placement_table() of each ship, longest 
+            ships first
+    """
+    return tuple(placement_table(board_size, length)
+                 for length in fleet_lengths(dict(ships_per_length_items)))
+
+
+def fleet_may_fit(board_size, ships_per_length):
+    """ Check a necessary condition for a fleet to fit on a board.
+
+    A ship of length L together with the cells just right of and below it 
+    covers (L + 1) * 2 cells of the board extended by one column and one 
+    row, and these areas never overlap since ships do not touch. A fleet 
+    whose areas add up to more than the extended board cannot fit.
+
+    Likewise, cut into 2x2 blocks, a board has ceil(W / 2) * ceil(H / 2) 
+    blocks. The cells of a block all touch each other, so no two ships share
+    a block, and a ship of length L has cells in ceil(L / 2) blocks at least.
+
+    Args:
+        board_size (tuple[int, int]): (width, height) of the board
+        ships_per_length (dict): length of ship -> number of ships
+
+    Returns:
+        bool : False if the fleet certainly cannot fit on the board
+    """
+    width, height = board_size
+    area = sum((length + 1) * 2 * count 
+               for length, count in ships_per_length.items())
+    blocks = sum((length + 1) // 2 * count 
+                 for length, count in ships_per_length.items())
+    return (area <= (width + 1) * (height + 1) 
+            and blocks <= (width + 1) // 2 * ((height + 1) // 2)
+            and all(length <= max(width, height) 
+                    for length, count in ships_per_length.items() if count))
+
+
+def sample_layout(board_size, ships_per_length, rng=random, report=None):
+    """ Draw a random legal layout of a fleet.
+
+    Each ship is drawn uniformly among the placements that do not touch the
+    forbidden zone (cells and halos) of the ships placed before it. If a ship
+    has no such placement left, the sampler backtracks, and it starts over 
+    from scratch after BACKTRACKING_DRAWS_PER_SHIP draws per ship without a
+    layout. It 
+    keeps going until it finds a layout, proves there is none, or the 
+    budget of report runs out (without a budget, until it finds a layout),
+    and fails right away on fleets that fleet_may_fit() rules out.
+
+    Args:
+        board_size (tuple[int, int]): (width, height) of the board
+        ships_per_length (dict): length of ship -> number of ships
+        rng (random.Random): source of randomness. Defaults to the random
+            module
+        report (GenerationReport): where to record the draws, rejections
+            and outcome, and the budget to stay within. Defaults to a new
+            report without budget.
+
+    Returns:
+        list[Placement] : one placement per ship, longest ships first, or
+            None if no layout was found (see report.outcome)
+    """
+    if report is None:
+        report = GenerationReport(board_size, ships_per_length)
+    if not fleet_may_fit(board_size, ships_per_length):
+        # Stopped before placing the first (longest) ship
+        report.finish(NO_LAYOUT, fleet_lengths(ships_per_length)[0])
+        return None
+    tables = fleet_tables(board_size, tuple(ships_per_length.items()))
+    # int(random() * n) is much cheaper than randrange(n) in this hot loop
+    uniform = rng.random
+
+    while True:
+        report.attempts += 1
+        # Fast path: most placements are usually free, and a few blind 
+        # draws from the whole table are uniform over the free ones without
+        # scanning it
+        chosen = []
+        mask = 0
+        for table in tables:
+            size = len(table)
+            for draw in range(_BLIND_DRAWS if size else 0):
+                placement = table[int(uniform() * size)]
+                if not placement.cell_mask & mask:
+                    break
+            else:
+                draws = _BLIND_DRAWS if size else 0
+                report.draws += draws
+                report.rejected['too_close'] += draws
+                chosen = _sample_with_backtracking(tables, chosen, uniform, 
+                                                   report)
+                break
+            report.draws += draw + 1
+            report.rejected['too_close'] += draw
+            if report.is_limited and report.is_over_budget():
+                report.finish(OUT_OF_BUDGET, placement.length)
+                return None
+            chosen.append(placement)
+            mask |= placement.halo_mask
+        else:
+            report.finish(PLACED)
+            return chosen
+        # Without an outcome, the search ran out of draws: start over
+        if report.outcome is not None:
+            return chosen
+
+
+def _sample_with_backtracking(tables, chosen, uniform, report):
+    """ Complete a partial layout started by sample_layout().
+
+    Lists the free placements of each remaining ship and backtracks through 
+    the already chosen ones when a ship cannot be placed.
+
+    Args:
+        tables (tuple[tuple[Placement]]): placement tables of every ship
+        chosen (list[Placement]): placements of the first ships
+        uniform (callable): returns a random float in [0, 1)
+        report (GenerationReport): report of the layout being drawn
+
+    Returns:
+        list[Placement] : one placement per ship, or None if there is no 
+            legal layout or the budget ran out (see report.outcome), or if 
+            BACKTRACKING_DRAWS_PER_SHIP draws per ship found no layout 
+            (report.outcome is left as None)
+    """
+    lengths = fleet_lengths(report.ships_per_length)
+    rejected = report.rejected
+    max_draws = report.draws + BACKTRACKING_DRAWS_PER_SHIP * len(lengths)
+    # Deepest ship that could not be placed
+    stuck = len(chosen)
+
+    # forbidden[i] is the forbidden zone left by the first i ships
+    forbidden = [0]
+    for placement in chosen:
+        forbidden.append(forbidden[-1] | placement.halo_mask)
+
+    # Untried candidates of each level we may have to backtrack to. None
+    # means the level was drawn blindly and its candidates were never listed.
+    pending = [None] * len(chosen)
+    mask = forbidden[-1]
+    candidates = [candidate for candidate in tables[len(chosen)]
+                  if not candidate.cell_mask & mask]
+    rejected['too_close'] += len(tables[len(chosen)]) - len(candidates)
+
+    while True:
+        if not candidates:
+            stuck = max(stuck, len(chosen))
+            if not chosen:
+                report.finish(NO_LAYOUT, lengths[stuck])
+                return None
+            failed = chosen.pop()
+            rejected['dead_end'] += 1
+            forbidden.pop()
+            candidates = pending.pop()
+            if candidates is None:
+                mask = forbidden[-1]
+                candidates = [candidate for candidate in tables[len(chosen)]
+                              if not candidate.cell_mask & mask
+                              and candidate is not failed]
+                rejected['too_close'] += (len(tables[len(chosen)]) 
+                                          - len(candidates) - 1)
+            continue
+
+        if report.is_over_budget():
+            report.finish(OUT_OF_BUDGET, lengths[len(chosen)])
+            return None
+        if report.draws >= max_draws:
+            report.failed_length = lengths[stuck]
+            return None
+        report.draws += 1
+        pick = int(uniform() * len(candidates))
+        placement = candidates[pick]
+        candidates[pick] = candidates[-1]
+        candidates.pop()
+
+        chosen.append(placement)
+        if len(chosen) == len(tables):
+            report.finish(PLACED)
+            return chosen
+        mask = forbidden[-1] | placement.halo_mask
+        forbidden.append(mask)
+        pending.append(candidates)
+        candidates = [candidate for candidate in tables[len(chosen)]
+                      if not candidate.cell_mask & mask]
+        rejected['too_close'] += len(tables[len(chosen)]) - len(candidates)
+
+
+def sample_sparse_layout(board_size, ships_per_length, rng=random, 
+                         report=None):
+    """ Draw a random legal layout of a fleet on a large board.
+
+    Ships are drawn like in sample_layout(), but without placement tables: 
+    the forbidden zone is a set of cell numbers, so checking or placing a 
+    ship costs O(length) whatever the size of the board, and a whole fleet 
+    costs O(number of ships) as long as the board is not crowded.
+
+    Args:
+        board_size (tuple[int, int]): (width, height) of the board
+        ships_per_length (dict): length of ship -> number of ships
+        rng (random.Random): source of randomness. Defaults to the random
+            module
+        report (GenerationReport): where to record the draws, rejections
+            and outcome, and the budget to stay within. Defaults to a new
+            report without budget.
+
+    Returns:
+        list[tuple[tuple[int, int], tuple[int, int]]] : (start, end) of each
+            ship, longest ships first, or None if no layout was found. There
+            is no backtracking, so unlike sample_layout() this does not 
+            prove that the fleet cannot fit.
+    """
+    width, height = board_size
+    lengths = fleet_lengths(ships_per_length)
+    uniform = rng.random
+    if report is None:
+        report = GenerationReport(board_size, ships_per_length)
+
+    for _ in range(_SPARSE_RESTARTS):
+        report.attempts += 1
+        forbidden = set()
+        layout = []
+        for length in lengths:
+            placement = _draw_sparse_placement(width, height, length, 
+                                               forbidden, uniform, report)
+            if placement is None:
+                break
+            (x_start, y_start), (x_end, y_end) = placement
+            # Same zone as Placement.halo_mask
+            x_low, x_high = max(1, x_start - 1), min(width, x_end + 1)
+            for y in range(max(1, y_start - 1), min(height, y_end + 1) + 1):
+                row = (y - 1) * width
+                forbidden.update(range(row + x_low - 1, row + x_high))
+            layout.append(placement)
+        else:
+            report.finish(PLACED)
+            return layout
+        if report.outcome == OUT_OF_BUDGET:
+            return None
+        # The ships placed so far left no room for this one
+        report.rejected['dead_end'] += len(layout)
+        report.failed_length = length
+    report.finish(GAVE_UP, report.failed_length)
+    return None
+
+
+def _draw_sparse_placement(width, height, length, forbidden, uniform, 
+                           report):
+    """ Draw a placement of a ship whose cells are not in forbidden.
+
+    Placements are numbered like in placement_table() restricted to one 
+    direction: horizontal ones first, then vertical ones.
+
+    Returns:
+        tuple[tuple[int, int], tuple[int, int]] : (start, end) of the ship,
+            or None if every placement is forbidden or the budget of report
+            ran out
+    """
+    per_row = max(0, width - length + 1)
+    horizontal = per_row * height
+    vertical = width * max(0, height - length + 1) if length > 1 else 0
+    total = horizontal + vertical
+
+    def decode(number):
+        # Returns the first cell number of the placement and the step 
+        # between its cells
+        if number < horizontal:
+            y, x = divmod(number, per_row)
+            return y * width + x, 1
+        return number - horizontal, width
+
+    def is_free(first, step):
+        return not any(cell in forbidden 
+                       for cell in range(first, first + step * length, step))
+
+    for _ in range(_SPARSE_DRAWS if total else 0):
+        if report.is_over_budget():
+            report.finish(OUT_OF_BUDGET, length)
+            return None
+        report.draws += 1
+        first, step = decode(int(uniform() * total))
+        if is_free(first, step):
+            break
+        report.rejected['too_close'] += 1
+    else:
+        # Crowded board: pick among the free placements, if any
+        free = [number for number in range(total) if is_free(*decode(number))]
+        report.rejected['too_close'] += total - len(free)
+        if not free:
+            return None
+        report.draws += 1
+        first, step = decode(free[int(uniform() * len(free))])
+
+    y, x = divmod(first, width)
+    last = first + step * (length - 1)
+    y_end, x_end = divmod(last, width)
+    return (x + 1, y + 1), (x_end + 1, y_end + 1)
+
+
+def mask_rows(masks, number_of_cells):
+    """ Expand integer cell masks into rows of a boolean array.
+
+    Args:
+        masks (iterable[int]): board-wide bitmasks
+        number_of_cells (int): width * height of the board
+
+    Returns:
+        numpy.ndarray : (len(masks), number_of_cells) boolean array where
+            [i, j] is bit j of masks[i]
+    """
+    size = (number_of_cells + 7) // 8
+    data = b''.join(mask.to_bytes(size, 'little') for mask in masks)
+    bits = np.unpackbits(np.frombuffer(data, dtype=np.uint8), 
+                         bitorder='little')
+    return bits.reshape(-1, size * 8)[:, :number_of_cells].astype(bool)
+
+
+@lru_cache(maxsize=128)
+def placement_arrays(board_size, length):
+    """ Get placement_table(board_size, length) as boolean arrays.
+
+    Args:
+        board_size (tuple[int, int]): (width, height) of the board
+        length (int): length of the ship
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray] : (cells, halos), two (P, W*H)
+            boolean arrays with one row per placement of the table
+    """
+    table = placement_table(board_size, length)
+    number_of_cells = board_size[0] * board_size[1]
+    return (mask_rows([placement.cell_mask for placement in table], 
+                      number_of_cells),
+            mask_rows([placement.halo_mask for placement in table], 
+                      number_of_cells))
+
+
+@lru_cache(maxsize=128)
+def placement_coordinates(board_size, length):
+    """ Get the coordinates of placement_table(board_size, length).
+
+    Args:
+        board_size (tuple[int, int]): (width, height) of the board
+        length (int): length of the ship
+
+    Returns:
+        numpy.ndarray : (P, 4) int16 array with one 
+            (x_start, y_start, x_end, y_end) row per placement of the table
+    """
+    table = placement_table(board_size, length)
+    return np.array([placement.start + placement.end for placement in table],
+                    dtype=np.int16).reshape(-1, 4)
+
+
+@lru_cache(maxsize=128)
+def placement_words(board_size, length):
+    """ Get the masks of placement_table(board_size, length) as 64-bit words.
+
+    Args:
+        board_size (tuple[int, int]): (width, height) of the board
+        length (int): length of the ship
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray] : (cells, halos), two (P, words)
+            uint64 arrays holding the cell and halo mask of each placement, 
+            least significant word first
+    """
+    table = placement_table(board_size, length)
+    words = (board_size[0] * board_size[1] + 63) // 64
+
+    def to_words(masks):
+        data = b''.join(mask.to_bytes(words * 8, 'little') for mask in masks)
+        return np.frombuffer(data, dtype='<u8').astype(np.uint64).reshape(
+            -1, words)
+
+    return (to_words([placement.cell_mask for placement in table]),
+            to_words([placement.halo_mask for placement in table]))
+
+
+class LayoutCounter:
+    """ Exact count, cell marginals and uniform sampling of fleet layouts.
+
+    A layout is a set of placements, one per ship, where no ship touches the 
+    forbidden zone of another. Ships of the same length are interchangeable: 
+    a layout is only counted once whatever the order of its equal ships.
+
+    The counter enumerates every legal placement of all but the last two 
+    ships (vectorised with NumPy, equal ships in increasing table order), and 
+    completes each of these partial layouts in closed form: the number of 
+    ways to add the last two ships is a product of small 0/1 matrices. The 
+    completion count of every partial layout is kept, which makes sampling 
+    exactly uniform: pick a partial layout with probability proportional to 
+    its count, then the last two ships the same way.
+
+    This is exact but only practical for small fleets: the number of partial 
+    layouts grows with the product of the table sizes of the first ships. 
+    The size of every array is worked out before it is built, so a fleet 
+    that is too large fails without taking the memory.
+    """
+    def __init__(self, board_size, ships_per_length, max_bytes=None):
+        """ Counts the layouts of a fleet.
+
+        Args:
+            board_size (tuple[int, int]): (width, height) of the board
+            ships_per_length (dict): length of ship -> number of ships
+            max_bytes (int): give up rather than build arrays larger than
+                this. Defaults to MAX_COUNTING_BYTES.
+
+        Raises:
+            ValueError: if the fleet has too many partial layouts to be 
+                counted exactly within max_bytes
+        """
+        self.board_size = tuple(board_size)
+        self.ships_per_length = dict(ships_per_length)
+        self.lengths = fleet_lengths(self.ships_per_length)
+        if max_bytes is None:
+            max_bytes = MAX_COUNTING_BYTES
+        self.max_bytes = max_bytes
+
+        width, height = self.board_size
+        self.number_of_cells = width * height
+        self.tables = [placement_table(self.board_size, length) 
+                       for length in self.lengths]
+        self.arrays = [placement_arrays(self.board_size, length) 
+                       for length in self.lengths]
+
+        # Per-ship weights: weights[k][p] is the number of layouts in which 
+        # ship k lies on placement p of its table
+        self.weights = [np.zeros(len(table)) for table in self.tables]
+        self._count()
+
+    def _check_size(self, number_of_bytes):
+        """ Raise ValueError if arrays of this size should not be built."""
+        if number_of_bytes > self.max_bytes:
+            raise ValueError(f"Counting the layouts of this fleet exactly "
+                             f"would take more than {self.max_bytes} bytes.")
+
+    def _is_same_as_previous(self, k):
+        """ Check whether ship k has the same length as ship k - 1."""
+        return k > 0 and self.lengths[k - 1] == self.lengths[k]
+
+    def _count(self):
+        """ Fill in self.count, self.weights and the sampling tables."""
+        number_of_ships = len(self.lengths)
+        if number_of_ships == 0:
+            self.count = 1
+            return
+        if number_of_ships == 1:
+            self.count = len(self.tables[0])
+            self.weights[0][:] = 1
+            return
+
+        # Partial layouts of the first ships, one row per layout: the index 
+        # of each placement (paths) and the resulting forbidden zone (masks)
+        prefix = number_of_ships - 2
+        paths = np.zeros((1, 0), dtype=np.int32)
+        masks = np.zeros((1, self.number_of_cells), dtype=bool)
+        chunks_paths, chunks_counts = [], []
+
+        # Expand all but the last prefix level at once, then the last prefix
+        # level a block of parents at a time, completing each block
+        for k in range(max(prefix - 1, 0)):
+            paths, masks = self._expand(k, paths, masks)
+        if prefix == 0:
+            blocks = [(paths, masks)]
+        else:
+            step = max(1, _BLOCK_SIZE // len(self.tables[prefix - 1]))
+            blocks = (self._expand(prefix - 1, paths[i:i + step], 
+                                   masks[i:i + step])
+                      for i in range(0, len(paths), step))
+
+        # The paths (int32) and counts (int64) of the partial layouts kept, 
+        # twice over when they are concatenated
+        kept = 0
+        for block_paths, block_masks in blocks:
+            counts = self._complete(block_paths, block_masks)
+            keep = counts > 0
+            kept += int(np.count_nonzero(keep))
+            self._check_size(2 * kept * (4 * prefix + 8))
+            chunks_paths.append(block_paths[keep])
+            chunks_counts.append(counts[keep])
+
+        paths = np.concatenate(chunks_paths)
+        counts = np.concatenate(chunks_counts)
+        for k in range(prefix):
+            self.weights[k] += np.bincount(paths[:, k], weights=counts, 
+                                           minlength=len(self.tables[k]))
+        self._paths = paths
+        self._cumulative = np.cumsum(counts)
+        self.count = int(self._cumulative[-1]) if len(counts) else 0
+
+    def _expand(self, k, paths, masks):
+        """ Add every legal placement of ship k to each partial layout."""
+        cells, halos = self.arrays[k]
+        number_of_cells = self.number_of_cells
+        # float32 copy of the masks, and the float32 and bool products
+        self._check_size(len(masks) * (4 * number_of_cells + 5 * len(cells)))
+        free = _matmul(masks, cells.T) == 0
+        if self._is_same_as_previous(k):
+            free &= np.arange(len(cells)) > paths[:, -1:]
+        # Indices of the new partial layouts, their paths (int64, then 
+        # int32), and their masks (the parents', the halos and both ORed)
+        new = int(np.count_nonzero(free))
+        self._check_size(new * (16 + 12 * (k + 1) + 3 * number_of_cells))
+        rows, placements = np.nonzero(free)
+        return (np.column_stack([paths[rows], placements]).astype(np.int32),
+                masks[rows] | halos[placements])
+
+    def _last_two(self, paths, masks):
+        """ Legal placements of the last two ships given partial layouts.
+
+        Returns:
+            tuple : (free_a, free_b, compatible) where free_a[i, p] (resp. 
+                free_b) tells whether the second-to-last (resp. last) ship can 
+                lie on placement p given partial layout i, and 
+                compatible[p, q] whether the two can lie on p and q together
+        """
+        k = len(self.lengths) - 2
+        cells_a, halos_a = self.arrays[k]
+        cells_b, _ = self.arrays[k + 1]
+
+        free_a = _matmul(masks, cells_a.T) == 0
+        if self._is_same_as_previous(k):
+            free_a &= np.arange(len(cells_a)) > paths[:, -1:]
+        free_b = _matmul(masks, cells_b.T) == 0
+
+        compatible = _matmul(halos_a, cells_b.T) == 0
+        if self._is_same_as_previous(k + 1):
+            compatible &= (np.arange(len(cells_a))[:, None] 
+                           < np.arange(len(cells_b))[None, :])
+        return free_a, free_b, compatible
+
+    def _complete(self, paths, masks):
+        """ Count the completions of partial layouts by the last two ships.
+
+        Also adds their contribution to the weights of the last two ships.
+
+        Returns:
+            numpy.ndarray : (len(paths),) int64 array of completion counts
+        """
+        sizes = len(self.arrays[-2][0]) + len(self.arrays[-1][0])
+        # float32 copies of the masks, the free placements and the products
+        self._check_size(len(masks) * (8 * self.number_of_cells 
+                                       + 18 * sizes))
+        free_a, free_b, compatible = self._last_two(paths, masks)
+        # pairs_a[i, p] = number of ways to complete layout i with the 
+        # second-to-last ship on p; pairs_b the same for the last ship
+        pairs_a = free_a * _matmul(free_b, compatible.T)
+        pairs_b = free_b * _matmul(free_a, compatible)
+        self.weights[-2] += pairs_a.sum(axis=0, dtype=np.float64)
+        self.weights[-1] += pairs_b.sum(axis=0, dtype=np.float64)
+        return pairs_a.sum(axis=1, dtype=np.float64).astype(np.int64)
+
+    def marginals(self):
+        """ Probability that each cell is occupied in a uniform layout.
+
+        Returns:
+            numpy.ndarray : (height, width) float array. Cell (x, y) is at 
+                [y - 1, x - 1], as in Board._build_array()
+        """
+        width, height = self.board_size
+        occupied = np.zeros(self.number_of_cells)
+        for (cells, _), weights in zip(self.arrays, self.weights):
+            occupied += weights @ cells
+        if self.count:
+            occupied /= self.count
+        return occupied.reshape(height, width)
+
+    def sample(self, rng=random):
+        """ Draw a layout uniformly among all legal layouts.
+
+        Args:
+            rng (random.Random): source of randomness. Defaults to the random
+                module
+
+        Returns:
+            list[Placement] : one placement per ship, longest ships first, or
+                None if the fleet has no legal layout
+        """
+        if not self.count:
+            return None
+        if not self.lengths:
+            return []
+        if len(self.lengths) == 1:
+            return [self.tables[0][rng.randrange(self.count)]]
+
+        row = int(np.searchsorted(self._cumulative, rng.randrange(self.count),
+                                  side='right'))
+        path = [int(index) for index in self._paths[row]]
+        mask = np.zeros((1, self.number_of_cells), dtype=bool)
+        for k, index in enumerate(path):
+            mask |= self.arrays[k][1][index]
+
+        free_a, free_b, compatible = self._last_two(self._paths[row:row + 1],
+                                                    mask)
+        pairs_a = (free_a * _matmul(free_b, compatible.T))[0].astype(np.int64)
+        cumulative = np.cumsum(pairs_a)
+        index_a = int(np.searchsorted(cumulative, 
+                                      rng.randrange(int(cumulative[-1])),
+                                      side='right'))
+        choices_b = np.flatnonzero(free_b[0] & compatible[index_a])
+        index_b = int(choices_b[rng.randrange(len(choices_b))])
+
+        path += [index_a, index_b]
+        return [table[index] for table, index in zip(self.tables, path)]
+
+
+def _matmul(left, right):
+    """ Multiply two 0/1 arrays exactly, using fast float32 arithmetic.
+
+    Exact as long as the inner dimension stays below 2**24.
+    """
+    return np.asarray(left, dtype=np.float32) @ np.asarray(right, 
+                                                           dtype=np.float32)
+
+
+@lru_cache(maxsize=4)
+def layout_counter(board_size, ships_per_length_items):
+    """ Get the LayoutCounter of a fleet, kept in memory once built.
+
+    Args:
+        board_size (tuple[int, int]): (width, height) of the board
+        ships_per_length_items (tuple): ships_per_length.items() as a tuple,
+            so that it can be cached
+
+    Returns:
+        LayoutCounter : counter of the layouts of the fleet
+    """
+    return LayoutCounter(board_size, dict(ships_per_length_items))
+
+
+def layout_statistics(board_size, ships_per_length, cache_dir=None):
+    """ Get the number of layouts of a fleet and its cell marginals.
+
+    Results are cached on disk, one JSON file per board size and fleet, so 
+    that they are only ever computed once.
+
+    Args:
+        board_size (tuple[int, int]): (width, height) of the board
+        ships_per_length (dict): length of ship -> number of ships
+        cache_dir (str): directory of the cache. Defaults to the 
+            BATTLESHIP_CACHE_DIR environment variable, or else 
+            ~/.cache/battleship
+
+    Returns:
+        tuple[int, numpy.ndarray] : the number of legal layouts, and the 
+            (height, width) array of the probability that each cell is 
+            occupied in a uniformly drawn layout (see LayoutCounter.marginals)
+    """
+    if cache_dir is None:
+        cache_dir = os.environ.get('BATTLESHIP_CACHE_DIR', 
+                                   os.path.join('~', '.cache', 'battleship'))
+    width, height = board_size
+    fleet = '-'.join(f"{length}x{count}" 
+                     for length, count in sorted(ships_per_length.items())
+                     if count > 0)
+    path = os.path.join(os.path.expanduser(cache_dir), 
+                        f"layouts-{width}x{height}-{fleet}.json")
+
+    try:
+        with open(path) as cache_file:
+            cached = json.load(cache_file)
+        return int(cached['count']), np.array(cached['marginals'])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    counter = layout_counter((width, height), 
+                             tuple(sorted(ships_per_length.items())))
+    count, marginals = counter.count, counter.marginals()
+
+    # The cache is only an optimisation: never fail because of it
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.tmp', 'w') as cache_file:
+            json.dump({'board_size': [width, height],
+                       'ships_per_length': sorted(ships_per_length.items()),
+                       'count': str(count),
+                       'marginals': marginals.tolist()}, cache_file)
+        os.replace(path + '.tmp', path)
+    except OSError:
+        pass
+    return count, marginals
+
+
+def sample_layouts(board_size, ships_per_length, number_of_layouts, 
+                   rng=None):
+    """ Draw many random legal layouts of a fleet at once.
+
+    Vectorised counterpart of sample_layout(): every ship of every layout is 
+    drawn uniformly among the placements left free by the previous ships of 
+    that layout. Layouts where a ship finds no free placement are drawn 
+    again from scratch rather than backtracked, for up to MAX_REDRAW_ROUNDS
+    rounds.
+
+    Args:
+        board_size (tuple[int, int]): (width, height) of the board
+        ships_per_length (dict): length of ship -> number of ships
+        number_of_layouts (int): number of layouts to draw
+        rng (numpy.random.Generator): source of randomness. Defaults to a 
+            freshly seeded generator.
+
+    Returns:
+        numpy.ndarray : (number_of_layouts, number_of_ships) int32 array. 
+            Entry [i, k] is the index of the placement of ship k of layout i 
+            in its placement_table(), ships being ordered longest first.
+
+    Raises:
+        LayoutGenerationError: (a RuntimeError) if no layout of the fleet 
+            could be found within DEFAULT_BUDGET, or if some layouts still 
+            failed after MAX_REDRAW_ROUNDS rounds
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    board_size = tuple(board_size)
+    lengths = fleet_lengths(ships_per_length)
+    layouts = np.zeros((number_of_layouts, len(lengths)), dtype=np.int32)
+    if not lengths or not number_of_layouts:
+        return layouts
+    report = GenerationReport(board_size, ships_per_length, DEFAULT_BUDGET)
+    if sample_layout(board_size, ships_per_length, report=report) is None:
+        raise LayoutGenerationError(report)
+
+    # Rows of layouts that still have to be drawn
+    report = GenerationReport(board_size, ships_per_length)
+    todo = np.arange(number_of_layouts)
+    while len(todo):
+        if report.attempts == MAX_REDRAW_ROUNDS:
+            report.finish(GAVE_UP)
+            raise LayoutGenerationError(report)
+        report.attempts += 1
+        report.draws += len(todo) * len(lengths)
+        for first in range(0, len(todo), _BLOCK_SIZE):
+            rows = todo[first:first + _BLOCK_SIZE]
+            layouts[rows], failed = _draw_layouts(board_size, lengths, 
+                                                  len(rows), rng)
+            todo[first:first + len(rows)][~failed] = -1
+        todo = todo[todo >= 0]
+    return layouts
+
+
+def _draw_layouts(board_size, lengths, number_of_layouts, rng):
+    """ Draw one attempt at number_of_layouts layouts for sample_layouts().
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray] : the (number_of_layouts, 
+            len(lengths)) placement indices, and a boolean array telling 
+            which layouts failed and must be drawn again
+    """
+    words = (board_size[0] * board_size[1] + 63) // 64
+    forbidden = np.zeros((number_of_layouts, words), dtype=np.uint64)
+    layouts = np.zeros((number_of_layouts, len(lengths)), dtype=np.int32)
+    failed = np.zeros(number_of_layouts, dtype=bool)
+
+    for k, length in enumerate(lengths):
+        cells, halos = placement_words(board_size, length)
+        choice = np.zeros(number_of_layouts, dtype=np.int64)
+
+        # Blind draws from the whole table, as in sample_layout()
+        pending = np.flatnonzero(~failed)
+        for _ in range(_BLIND_DRAWS):
+            if not len(pending):
+                break
+            picks = rng.integers(len(cells), size=len(pending))
+            free = ~(forbidden[pending] & cells[picks]).any(axis=1)
+            choice[pending[free]] = picks[free]
+            pending = pending[~free]
+
+        # Uniform among the free placements of the few layouts left: the 
+        # largest random key wins
+        if len(pending):
+            free = ~(forbidden[pending, None, :] & cells[None]).any(axis=2)
+            keys = rng.random(free.shape)
+            keys[~free] = -1
+            choice[pending] = np.argmax(keys, axis=1)
+            failed[pending[~free.any(axis=1)]] = True
+
+        layouts[:, k] = choice
+        forbidden |= halos[choice]
+    return layouts, failed
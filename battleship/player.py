@@ -1,6 +1,7 @@
 import random
 
 from battleship.board import Board
+from battleship.candidates import CandidateCells
 from battleship.convert import CellConverter
 
 class Player:
@@ -105,15 +106,25 @@ class RandomPlayer(Player):
     However, it does not play at the positions:
     - that it has previously attacked
     """
-    def __init__(self, name=None):
+    def __init__(self, name=None, board=None, seed=None):
         """ Initialise the player with an automatic board and other attributes.
         
         Args:
             name (str): Player's name
+            board (Board): The player's board. If not provided, then a board
+                will be generated automatically
+            seed (int): seed of the player's own random generator, so that 
+                it always plays the same cells in the same order. Defaults to
+                None, which uses the random module.
         """
         # Initialise with a board with ships automatically arranged.
-        super().__init__(board=Board(), name=name)
+        super().__init__(board=Board() if board is None else board, 
+                         name=name)
         self.tracker = set()
+        self.rng = random if seed is None else random.Random(seed)
+        # Cells not drawn yet, built on the first draw (see 
+        # generate_random_target())
+        self.remaining = None
 
     def select_target(self):
         """ Generate a random cell that has previously not been attacked.
@@ -130,19 +141,31 @@ class RandomPlayer(Player):
 
     def generate_random_target(self):
         """ Generate a random cell that has previously not been attacked.
+
+        Cells are drawn from a random permutation of the cells of the board 
+        that is shuffled lazily, one cell per draw (Fisher-Yates, on 
+        CandidateCells), so each draw is O(1) however few cells are left.
                
         Returns:
             tuple[int, int] : (x, y) cell coordinates at which to launch the 
-                next attack
+                next attack, or None if every cell has been attacked
         """
-        has_been_attacked = True
-        random_cell = None
-        
-        while has_been_attacked:
-            random_cell = self.get_random_coordinates()
-            has_been_attacked = random_cell in self.tracker
-
-        return random_cell
+        remaining = self.remaining
+        if remaining is None or (remaining.width, remaining.height) != (
+                self.board.width, self.board.height):
+            remaining = self.remaining = CandidateCells(self.board.width, 
+                                                        self.board.height)
+            for cell in self.tracker:
+                if cell in remaining:
+                    remaining.remove(cell)
+
+        while remaining:
+            random_cell = remaining[self.rng.randrange(len(remaining))]
+            remaining.remove(random_cell)
+            # Cells may also have been added to the tracker directly
+            if random_cell not in self.tracker:
+                return random_cell
+        return None
 
     def get_random_coordinates(self):
         """ Generate random coordinates.
@@ -151,21 +174,24 @@ class RandomPlayer(Player):
             tuple[int, int] : (x, y) cell coordinates at which to launch the 
                 next attack
         """
-        x = random.randint(1, self.board.width)
-        y = random.randint(1, self.board.height)
+        x = self.rng.randint(1, self.board.width)
+        y = self.rng.randint(1, self.board.height)
         return (x, y)
 
 
 class AutomaticPlayer(Player):
     """ Player playing automatically using a strategy."""
-    def __init__(self, name=None):
+    def __init__(self, name=None, board=None):
         """ Initialise the player with an automatic board and other attributes.
         
         Args:
             name (str): Player's name
+            board (Board): The player's board. If not provided, then a board
+                will be generated automatically
         """
         # Initialise with a board with ships automatically arranged.
-        super().__init__(board=Board(), name=name)
+        super().__init__(board=Board() if board is None else board, 
+                         name=name)
         self.board.name = "Robot"
         
         # Set of cells that have been attacked
@@ -173,7 +199,9 @@ class AutomaticPlayer(Player):
         self.target_coordinates = ()
         self.unsuccessful_hit_coordinates = []
         self.successful_hit_coordinates = []
-        self.possible_cells = [(x,y) for x in range(1,self.board.width + 1) for y in range(1, self.board.height + 1)]
+        # Every cell of the board to begin with, without listing them all
+        self.possible_cells = CandidateCells(self.board.width, 
+                                             self.board.height)
 
     def is_vertical(self):
         """ Check whether the ship is vertical.
@@ -0,0 +1,151 @@
+""" Pool of pre-generated fleet layouts to speed up building many Boards.
+
+Set Board.layout_pool to a LayoutPool, and every Board created without
+ships (including those of Players created without a board) takes its
+layout from the pool instead of generating it.
+"""
+from collections import OrderedDict
+import time
+
+import numpy as np
+
+from battleship.ship import Ship, ShipFactory, ShipGeometry
+
+
+class _PoolEntry:
+    """ Layouts stored for one (size, ships_per_length) configuration."""
+    __slots__ = ('geometries', 'cursor', 'uses')
+
+    def __init__(self, geometries):
+        self.geometries = geometries
+        self.cursor = 0
+        self.uses = 0
+
+
+class LayoutPool:
+    """ Class handing out fleet layouts from batches generated in bulk."""
+    def __init__(self, batch_size=10_000, uses_per_layout=1, refill='batch',
+                 max_configurations=8, rng=None):
+        """ Initialises an empty pool.
+
+        Args:
+            batch_size (int): number of layouts generated at once when a
+                configuration has run out. Defaults to 10,000.
+            uses_per_layout (int): number of boards that may get the same
+                layout before it is thrown away. None reuses layouts forever,
+                cycling through the batch. Defaults to 1.
+            refill (str): what to do when the layouts of a configuration have
+                been used up: 'batch' generates a new batch of batch_size
+                layouts, 'single' generates a single layout for each request
+                from then on. Defaults to 'batch'.
+            max_configurations (int): number of configurations kept at once.
+                The least recently used one is evicted beyond that.
+                Defaults to 8.
+            rng (numpy.random.Generator): source of randomness for batches.
+                Defaults to a freshly seeded generator.
+
+        Raises:
+            ValueError: if batch_size is less than 1, or refill is not 
+                'batch' or 'single'
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        if refill not in ('batch', 'single'):
+            raise ValueError("refill must be either 'batch' or 'single'.")
+        self.batch_size = batch_size
+        self.uses_per_layout = uses_per_layout
+        self.refill = refill
+        self.max_configurations = max_configurations
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.entries = OrderedDict()
+
+        # Layouts served from a stored batch, layouts that had to be
+        # generated on request, configurations evicted, and seconds spent
+        # generating layouts
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation_time = 0.0
+
+    @staticmethod
+    def _key(size, ships_per_length):
+        return tuple(size), tuple(sorted(ships_per_length.items()))
+
+    def fill(self, size, ships_per_length, number_of_layouts=None):
+        """ Generate a batch of layouts for a configuration in advance.
+
+        Replaces whatever was stored for that configuration.
+
+        Args:
+            size (tuple[int, int]): (width, height) of the board
+            ships_per_length (dict): A dict with the length of ship as keys
+                and the count as values
+            number_of_layouts (int): size of the batch. Defaults to
+                batch_size.
+
+        Raises:
+            RuntimeError: if the ships cannot all fit on the board
+        """
+        if number_of_layouts is None:
+            number_of_layouts = self.batch_size
+        start = time.perf_counter()
+        ship_factory = ShipFactory(board_size=size,
+                                   ships_per_length=ships_per_length)
+        _, coordinates = ship_factory.generate_fleets(number_of_layouts,
+                                                      self.rng)
+        geometries = [[ShipGeometry.get((x_start, y_start), (x_end, y_end))
+                       for x_start, y_start, x_end, y_end in fleet]
+                      for fleet in coordinates.tolist()]
+        self.generation_time += time.perf_counter() - start
+
+        key = self._key(size, ships_per_length)
+        self.entries[key] = _PoolEntry(geometries)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_configurations:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def take(self, size, ships_per_length):
+        """ Get the ships of one layout for a configuration.
+
+        Args:
+            size (tuple[int, int]): (width, height) of the board
+            ships_per_length (dict): A dict with the length of ship as keys
+                and the count as values
+
+        Returns:
+            list[Ship] : new, undamaged ships in a legal layout
+
+        Raises:
+            RuntimeError: if the ships cannot all fit on the board
+        """
+        key = self._key(size, ships_per_length)
+        entry = self.entries.get(key)
+        if entry is None or entry.geometries is None:
+            if entry is None or self.refill == 'batch':
+                self.misses += 1
+                self.fill(size, ships_per_length)
+                entry = self.entries[key]
+            else:
+                # Used up, and refill == 'single'
+                self.misses += 1
+                self.entries.move_to_end(key)
+                start = time.perf_counter()
+                ships = ShipFactory(board_size=size,
+                                    ships_per_length=ships_per_length
+                                    ).generate_ships()
+                self.generation_time += time.perf_counter() - start
+                return ships
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+
+        geometries = entry.geometries[entry.cursor]
+        entry.cursor += 1
+        if entry.cursor == len(entry.geometries):
+            entry.cursor = 0
+            entry.uses += 1
+            if (self.uses_per_layout is not None
+                    and entry.uses >= self.uses_per_layout):
+                entry.geometries = None
+        return [Ship.from_geometry(geometry) for geometry in geometries]
@@ -0,0 +1,300 @@
+""" Monte Carlo targeting: shoot where the sampled fleets put a ship most.
+
+sample_posterior() draws whole layouts of the ships still afloat that agree
+with what the shots so far revealed (misses, hits on ships afloat, ships
+sunk and the cells around them), with the placement tables ShipFactory
+draws fleets from, and tallies how many of them put a ship on each cell.
+PosteriorSampler spreads the samples of a decision over worker processes,
+within a number of samples and a time limit, and PosteriorPlayer shoots
+at the cell with the highest tally.
+
+Samples are drawn in chunks of a fixed size, and chunk i of decision d
+draws from the random stream SeedSequence(seed, spawn_key=(d, i)), as in
+ParallelFleetGenerator. Without a time limit, the tallies therefore only
+depend on the seed, not on the number of processes.
+"""
+import multiprocessing
+import random
+import time
+
+import numpy as np
+
+from battleship.density import DensityPlayer
+from battleship.placement import fleet_lengths, mask_rows, placement_table
+
+# Draws from the whole table of a ship before listing its free placements,
+# as in placement.sample_layout()
+_BLIND_DRAWS = 8
+
+# Layouts that may fail to complete per sample asked for, before giving up
+# (e.g. if the observations cannot come from the fleet expected)
+_FAILURES_PER_SAMPLE = 20
+
+# Number of samples between two checks of the clock
+_CLOCK_INTERVAL = 16
+
+
+def _to_mask(cells):
+    """ Turn a boolean (height, width) array into a board-wide bitmask."""
+    packed = np.packbits(np.asarray(cells, dtype=bool).ravel(),
+                         bitorder='little')
+    return int.from_bytes(packed.tobytes(), 'little')
+
+
+def _draw_layout(lengths, free, covering, hits, uniform):
+    """ Draw one layout of the ships afloat that covers every hit.
+
+    Ships covering the hits are placed first, each drawn among the free
+    placements covering the first hit not covered yet. The other ships are
+    then drawn among their free placements, as sample_layout() does. There
+    is no backtracking: the layout is dropped if a ship cannot be placed.
+
+    Args:
+        lengths (list[int]): length of every ship afloat, longest first
+        free (dict): length -> placements that avoid the blocked cells
+        covering (dict): (hit bit, length) -> free placements covering it
+        hits (int): bitmask of the hits on ships afloat
+        uniform (callable): returns a random float in [0, 1)
+
+    Returns:
+        int : bitmask of the cells of the ships, or None
+    """
+    lengths = list(lengths)
+    halos = 0
+    cells = 0
+    uncovered = hits
+    while uncovered:
+        bit = uncovered & -uncovered
+        candidates = [placement for length in set(lengths)
+                      for placement in covering[bit, length]
+                      if not placement.cell_mask & halos]
+        if not candidates:
+            return None
+        placement = candidates[int(uniform() * len(candidates))]
+        lengths.remove(placement.length)
+        halos |= placement.halo_mask
+        cells |= placement.cell_mask
+        uncovered &= ~placement.cell_mask
+
+    for length in lengths:
+        table = free[length]
+        size = len(table)
+        for _ in range(_BLIND_DRAWS if size else 0):
+            placement = table[int(uniform() * size)]
+            if not placement.cell_mask & halos:
+                break
+        else:
+            candidates = [placement for placement in table
+                          if not placement.cell_mask & halos]
+            if not candidates:
+                return None
+            placement = candidates[int(uniform() * len(candidates))]
+        halos |= placement.halo_mask
+        cells |= placement.cell_mask
+    return cells
+
+
+def sample_posterior(board_size, ships_per_length, blocked, hits, samples,
+                     rng=random, deadline=None):
+    """ Tally the cells of random layouts that agree with the observations.
+
+    A layout agrees with them if its ships avoid the blocked cells, cover
+    every hit, and keep away from each other as ShipFactory's ships do.
+
+    Args:
+        board_size (tuple[int, int]): (width, height) of the board
+        ships_per_length (dict): length of ship -> number of ships afloat
+        blocked (numpy.ndarray): (height, width) boolean array of the cells
+            that cannot hold a ship afloat: misses, and the cells of the
+            ships sunk and their surroundings
+        hits (numpy.ndarray): (height, width) boolean array of the cells hit
+            on ships afloat
+        samples (int): number of layouts to draw
+        rng (random.Random): source of randomness. Defaults to the random
+            module
+        deadline (float): time.time() after which to stop drawing. Defaults
+            to None, for no limit.
+
+    Returns:
+        tuple[numpy.ndarray, int, int] : (tallies, samples drawn, attempts),
+            where tallies is a (height, width) int64 array of the number of
+            layouts with a ship on each cell
+    """
+    width, height = board_size
+    lengths = fleet_lengths(ships_per_length)
+    blocked_mask = _to_mask(blocked)
+    hits_mask = _to_mask(hits)
+    free = {length: [placement for placement in placement_table(
+                         (width, height), length)
+                     if not placement.cell_mask & blocked_mask]
+            for length in set(lengths)}
+    covering = {}
+    remaining = hits_mask
+    while remaining:
+        bit = remaining & -remaining
+        remaining ^= bit
+        for length in free:
+            covering[bit, length] = [placement for placement in free[length]
+                                     if placement.cell_mask & bit]
+
+    uniform = rng.random
+    layouts = []
+    attempts = 0
+    while (len(layouts) < samples
+           and attempts - len(layouts) < _FAILURES_PER_SAMPLE * samples):
+        if (deadline is not None and attempts % _CLOCK_INTERVAL == 0
+                and time.time() > deadline):
+            break
+        attempts += 1
+        layout = _draw_layout(lengths, free, covering, hits_mask, uniform)
+        if layout is not None:
+            layouts.append(layout)
+
+    tallies = np.zeros(width * height, dtype=np.int64)
+    if layouts:
+        tallies += mask_rows(layouts, width * height).sum(axis=0)
+    return tallies.reshape(height, width), len(layouts), attempts
+
+
+def _sample_chunk(board_size, items, blocked, hits, samples, entropy,
+                  spawn_key, deadline):
+    """ Draw one chunk of samples. Runs in the worker processes."""
+    seed_sequence = np.random.SeedSequence(entropy, spawn_key=spawn_key)
+    rng = random.Random(int(seed_sequence.generate_state(1)[0]))
+    return sample_posterior(board_size, dict(items), blocked, hits, samples,
+                            rng, deadline)
+
+
+class PosteriorSampler:
+    """ Class to draw the samples of each decision, possibly in parallel."""
+    def __init__(self, samples=500, time_limit=None, seed=None,
+                 chunk_size=50, processes=0):
+        """ Initialises the sampler. Worker processes start when first needed.
+
+        Args:
+            samples (int): number of layouts to draw per decision
+            time_limit (float): number of seconds a decision may take.
+                Defaults to None, for no limit.
+            seed (int): master seed. Defaults to fresh entropy, which is then
+                kept in self.seed so that the run can be reproduced.
+            chunk_size (int): number of samples per chunk
+            processes (int): number of worker processes. 0 draws every
+                sample in the calling process. Defaults to 0.
+        """
+        self.samples = samples
+        self.time_limit = time_limit
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.processes = processes
+        # Number of decisions so far, part of the seed of their chunks
+        self.decisions = 0
+        # Samples drawn and attempts made for the last decision
+        self.last_samples = 0
+        self.last_attempts = 0
+        self._pool = None
+
+    def tally(self, board_size, ships_per_length, blocked, hits):
+        """ Draw the samples of one decision and add their tallies up.
+
+        Args:
+            board_size (tuple[int, int]): (width, height) of the board
+            ships_per_length (dict): length of ship -> number of ships afloat
+            blocked (numpy.ndarray): (height, width) boolean array of the
+                cells that cannot hold a ship afloat
+            hits (numpy.ndarray): (height, width) boolean array of the cells
+                hit on ships afloat
+
+        Returns:
+            tuple[numpy.ndarray, int] : (tallies, samples), the number of
+                sampled layouts with a ship on each cell, as a
+                (height, width) int64 array, and the number of layouts
+        """
+        deadline = (None if self.time_limit is None
+                    else time.time() + self.time_limit)
+        items = tuple(sorted(ships_per_length.items()))
+        arguments = [
+            (tuple(board_size), items, blocked, hits,
+             min(self.chunk_size, self.samples - start), self.seed,
+             (self.decisions, chunk_index), deadline)
+            for chunk_index, start in enumerate(range(0, self.samples,
+                                                      self.chunk_size))]
+        self.decisions += 1
+
+        if self.processes == 0:
+            results = []
+            for chunk_arguments in arguments:
+                results.append(_sample_chunk(*chunk_arguments))
+                if deadline is not None and time.time() > deadline:
+                    break
+        else:
+            if self._pool is None:
+                self._pool = multiprocessing.Pool(self.processes)
+            results = self._pool.starmap(_sample_chunk, arguments)
+
+        width, height = board_size
+        tallies = np.zeros((height, width), dtype=np.int64)
+        for chunk_tallies, _, _ in results:
+            tallies += chunk_tallies
+        self.last_samples = sum(result[1] for result in results)
+        self.last_attempts = sum(result[2] for result in results)
+        return tallies, self.last_samples
+
+    def close(self):
+        """ Stop the worker processes, if any."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PosteriorPlayer(DensityPlayer):
+    """ Player shooting at the cell most sampled layouts put a ship on.
+
+    It keeps track of its observations as DensityPlayer does, and falls back
+    to DensityPlayer's heatmap when no layout agreeing with them was drawn.
+    """
+    def __init__(self, name=None, board=None, ships_per_length=None,
+                 seed=None, sampler=None):
+        """ Initialise the player with an automatic board and other attributes.
+
+        Args:
+            name (str): Player's name
+            board (Board): The player's board. If not provided, then a board
+                will be generated automatically
+            ships_per_length (dict): length of ship -> number of ships of the
+                opponent. Defaults to the fleet of the player's board.
+            seed (int): seed of the random generators. Defaults to None.
+            sampler (PosteriorSampler): how to draw samples for each
+                decision. Defaults to 500 samples in the calling process.
+        """
+        super().__init__(name=name, board=board,
+                         ships_per_length=ships_per_length, seed=seed)
+        if sampler is None:
+            sampler = PosteriorSampler(seed=seed)
+        self.sampler = sampler
+        # Tallies of the last decision
+        self.tallies = None
+
+    def select_target(self):
+        """ Select the cell not attacked yet with the highest tally.
+
+        Ties are broken at random.
+
+        Returns:
+            tuple[int, int] : (x, y) cell coordinates at which to launch the
+                next attack, or None if every cell has been attacked
+        """
+        self.tallies, samples = self.sampler.tally(
+            (self.board.width, self.board.height), self.ships_afloat,
+            self.blocked, self.hits)
+        if not samples:
+            return super().select_target()
+        return self._select_best(self.tallies.copy())
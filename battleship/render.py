@@ -0,0 +1,230 @@
+""" Incremental terminal rendering of boards.
+
+BoardRenderer keeps the last frame it drew for a board, and only rebuilds
+the rows whose cells changed since then. When asked to draw in place on a
+terminal, it patches the changed cells of the frame already on screen with
+ANSI cursor movements instead of printing a new frame.
+
+A frame can show a viewport, a rectangle of cells, rather than the whole
+board. Only the cells in the viewport are then looked at, which is the only
+way to draw boards with billions of cells.
+"""
+from functools import lru_cache
+import sys
+
+from battleship.convert import CellConverter
+
+# Characters from one cell of a row to the next, and between the row label
+# and the first cell
+_CELL_WIDTH = 6
+_LABEL_GAP = 4
+
+
+def clip_viewport(viewport, width, height):
+    """ Get the part of a viewport that lies on the board.
+
+    Args:
+        viewport (tuple[int, int, int, int]): (x, y, width, height) of the
+            viewport, where (x, y) is its top left cell. None for the whole
+            board.
+        width (int): width of the board
+        height (int): height of the board
+
+    Returns:
+        tuple[int, int, int, int] : (x, y, width, height) of the cells of the
+            viewport that are on the board
+
+    Raises:
+        ValueError: if no cell of the viewport is on the board
+    """
+    if viewport is None:
+        return 1, 1, width, height
+    x_first, y_first, viewport_width, viewport_height = viewport
+    x_last = min(width, x_first + viewport_width - 1)
+    y_last = min(height, y_first + viewport_height - 1)
+    x_first, y_first = max(1, x_first), max(1, y_first)
+    if x_first > x_last or y_first > y_last:
+        raise ValueError("The viewport does not show any cell of the board.")
+    return x_first, y_first, x_last - x_first + 1, y_last - y_first + 1
+
+
+def label_width(y_last):
+    """ Get the number of characters of the row labels of a frame."""
+    return max(2, len(str(y_last)))
+
+
+@lru_cache(maxsize=16)
+def frame_lines(width, x_first=1, label_width=2):
+    """ Get the header and divider lines of a frame.
+
+    Columns are labelled with letters, as CellConverter does, or with their
+    numbers if the frame goes beyond column Z.
+
+    Args:
+        width (int): number of columns of the frame
+        x_first (int): column of the board shown first. Defaults to 1.
+        label_width (int): number of characters of the row labels. Defaults
+            to 2.
+
+    Returns:
+        tuple[str, str] : (header, divider), each ending with a newline
+    """
+    columns = range(x_first, x_first + width)
+    prefix = ' ' * (label_width + _LABEL_GAP)
+    if columns[-1] + CellConverter.UPPERCASE_OFFSET <= ord('Z'):
+        array_first_line = [chr(code + CellConverter.UPPERCASE_OFFSET)
+                            for code in columns]
+        header = prefix + (' ' * 5).join(array_first_line) + ' \n'
+    else:
+        header = prefix + ''.join(f'{x:<{_CELL_WIDTH}}' 
+                                  for x in columns).rstrip() + '\n'
+    divider = ' ' * (label_width + 1) + '-' * _CELL_WIDTH * width + '-\n'
+    return header, divider
+
+
+def row_line(index_line, symbols, label_width=2):
+    """ Get the line of a frame showing one row of cells."""
+    space_before_line = (label_width - len(str(index_line))) * ' '
+    return (f'{space_before_line}{index_line} |  ' + '  |  '.join(symbols)
+            + '  |\n')
+
+
+class BoardRenderer:
+    """ Class drawing a board on a stream, redrawing only what changed."""
+    def __init__(self, board, stream=None):
+        """ Sets up a renderer that has not drawn anything yet.
+
+        Args:
+            board (Board): the board to draw
+            stream (file): where to draw. Defaults to sys.stdout at the time
+                of each draw.
+        """
+        self.board = board
+        self.stream = stream
+        # Symbols and lines of the last frame, and what they were built from
+        self.symbols = None
+        self.rows = None
+        self.show_ships = None
+        self.ships = None
+        self.viewport = None
+        self.shots = set()
+        # Whether the last frame is still the last thing on the terminal
+        self.anchored = False
+
+    def _symbol(self, cell, show_ships):
+        """ Symbol of one cell, as in Board._build_array()."""
+        ship = self.board.get_ship_at(cell)
+        if ship is None:
+            return 'O' if cell in self.shots else ' '
+        if ship.has_sunk():
+            return '$'
+        if ship.damage_mask >> ship.cell_index(cell) & 1:
+            return 'X'
+        if show_ships:
+            return 'S'
+        return 'O' if cell in self.shots else ' '
+
+    def update(self, show_ships=False, viewport=None):
+        """ Bring the frame up to date with the board.
+
+        Args:
+            show_ships (bool): show the ships that have not been hit
+            viewport (tuple[int, int, int, int]): (x, y, width, height) of
+                the cells to show, where (x, y) is the top left one. Defaults
+                to the whole board.
+
+        Returns:
+            list[tuple[int, int]] : (x, y) of the cells whose symbol changed,
+                or None if the whole frame was rebuilt
+
+        Raises:
+            ValueError: if no cell of the viewport is on the board
+        """
+        board = self.board
+        viewport = clip_viewport(viewport, board.width, board.height)
+        shots = board.marked_cells
+        if (self.symbols is None or show_ships != self.show_ships
+                or board.ships is not self.ships
+                or viewport != self.viewport
+                or not self.shots <= shots):
+            self.symbols = board._build_array(show_ships=show_ships,
+                                              viewport=viewport)
+            self.show_ships = show_ships
+            self.ships = board.ships
+            self.viewport = viewport
+            self.shots = set(shots)
+            self._build_rows()
+            return None
+
+        x_first, y_first, width, height = viewport
+        new_shots = shots - self.shots
+        self.shots |= new_shots
+        changed = []
+        for cell in new_shots:
+            x, y = cell
+            if not (0 < x <= board.width and 0 < y <= board.height):
+                continue
+            ship = board.get_ship_at(cell)
+            # Sinking a ship changes all of its cells
+            cells = ship.cells if ship is not None and ship.has_sunk() else (
+                cell,)
+            for x, y in cells:
+                if not (0 <= x - x_first < width and 0 <= y - y_first < height):
+                    continue
+                symbol = self._symbol((x, y), show_ships)
+                if self.symbols[y - y_first][x - x_first] != symbol:
+                    self.symbols[y - y_first][x - x_first] = symbol
+                    changed.append((x, y))
+        width = label_width(y_first + height - 1)
+        for y in {y for _, y in changed}:
+            self.rows[y - y_first] = row_line(y, self.symbols[y - y_first],
+                                              width)
+        return changed
+
+    def _build_rows(self):
+        """ Build every row line of the frame from self.symbols."""
+        _, y_first, _, height = self.viewport
+        width = label_width(y_first + height - 1)
+        self.rows = [row_line(index_line, symbols, width) 
+                     for index_line, symbols in enumerate(self.symbols, 
+                                                          y_first)]
+
+    def frame(self):
+        """ Get the last frame as a string, like Board._array_to_str()."""
+        x_first, y_first, width, height = self.viewport
+        header, divider = frame_lines(width, x_first,
+                                      label_width(y_first + height - 1))
+        return header + divider + divider.join(self.rows) + divider
+
+    def draw(self, show_ships=False, in_place=False, viewport=None):
+        """ Draw the board.
+
+        Args:
+            show_ships (bool): show the ships that have not been hit.
+                Defaults to False.
+            in_place (bool): if the stream is a terminal and nothing else
+                was drawn since the last frame, patch the cells of that frame
+                rather than drawing a new one. Defaults to False.
+            viewport (tuple[int, int, int, int]): (x, y, width, height) of
+                the cells to show, where (x, y) is the top left one. Defaults
+                to the whole board.
+
+        Raises:
+            ValueError: if no cell of the viewport is on the board
+        """
+        stream = sys.stdout if self.stream is None else self.stream
+        changed = self.update(show_ships, viewport)
+        if (in_place and self.anchored and changed is not None
+                and stream.isatty()):
+            # The cursor is 2 lines below the last divider of the frame
+            x_first, y_first, _, height = self.viewport
+            prefix = label_width(y_first + height - 1) + _LABEL_GAP
+            patches = [f'\x1b7\x1b[{2 * (height - y + y_first) + 1}A'
+                       f'\x1b[{prefix + (x - x_first) * _CELL_WIDTH + 1}G'
+                       f'{self.symbols[y - y_first][x - x_first]}\x1b8'
+                       for x, y in changed]
+            stream.write(''.join(patches))
+        else:
+            stream.write(self.frame() + '\n')
+        stream.flush()
+        self.anchored = in_place
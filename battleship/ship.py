@@ -1,9 +1,162 @@
 import random
+import weakref
+from functools import lru_cache
+
+import numpy as np
+
 from battleship.convert import CellConverter
+from battleship.generation import (DEFAULT_BUDGET, NO_LAYOUT, PLACED, 
+                                   GenerationReport, LayoutGenerationError)
+from battleship.placement import (LARGE_BOARD_CELLS, fleet_lengths, 
+                                  fleet_tables, layout_counter, 
+                                  layout_statistics, placement_arrays, 
+                                  placement_coordinates, sample_layout, 
+                                  sample_layouts, sample_sparse_layout)
+
+
+def bounding_boxes(ships):
+    """ Stack the bounding boxes of ships into an array.
+
+    Args:
+        ships (list[Ship]): ships to stack
+
+    Returns:
+        numpy.ndarray : (N, 4) integer array with one 
+            (x_start, y_start, x_end, y_end) row per ship
+    """
+    boxes = [(ship.geometry.x_start, ship.geometry.y_start, 
+              ship.geometry.x_end, ship.geometry.y_end) for ship in ships]
+    return np.array(boxes, dtype=np.int64).reshape(-1, 4)
+
+
+class ShipGeometry:
+    """ Immutable description of the cells a ship lies on.
+
+    Geometries are interned: ShipGeometry.get() returns the same instance for 
+    the same placement for as long as any Ship uses it, so every Ship (and so 
+    every Board) with that placement shares a single object. A Ship only 
+    keeps its own damage record on top of it.
+
+    The geometry does not depend on the board size: its bitmasks run along 
+    the ship (bit i is the i-th cell counting from (x_start, y_start)).
+    """
+    __slots__ = ('x_start', 'y_start', 'x_end', 'y_end', 'length', 
+                 'cell_mask', 'cells', '__weakref__')
+
+    # (x_start, y_start, x_end, y_end) -> ShipGeometry
+    _interned = weakref.WeakValueDictionary()
+
+    @classmethod
+    def get(cls, start, end):
+        """ Get the shared geometry of a ship lying from start to end.
+
+        Args:
+            start (tuple[int, int]): (x, y) coordinates of one end of the ship
+            end (tuple[int, int]): (x, y) coordinates of the other end
+
+        Returns:
+            ShipGeometry : the interned geometry for that placement
+        """
+        x_start, x_end = sorted((start[0], end[0]))
+        y_start, y_end = sorted((start[1], end[1]))
+        key = (x_start, y_start, x_end, y_end)
+        geometry = cls._interned.get(key)
+        if geometry is None:
+            geometry = cls(*key)
+            cls._interned[key] = geometry
+        return geometry
+
+    def __init__(self, x_start, y_start, x_end, y_end):
+        """ Use ShipGeometry.get() rather than building geometries directly,
+            so that they are shared.
+        """
+        if y_start == y_end:
+            length = x_end - x_start + 1
+            cells = [(x, y_start) for x in range(x_start, x_end + 1)]
+        elif x_start == x_end:
+            length = y_end - y_start + 1
+            cells = [(x_start, y) for y in range(y_start, y_end + 1)]
+        else:
+            length = 0
+            cells = []
+
+        setattr_ = super().__setattr__
+        setattr_('x_start', x_start)
+        setattr_('y_start', y_start)
+        setattr_('x_end', x_end)
+        setattr_('y_end', y_end)
+        setattr_('length', length)
+        setattr_('cell_mask', (1 << length) - 1)
+        setattr_('cells', frozenset(cells))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ShipGeometry is immutable")
+
+    def __reduce__(self):
+        # Copies and unpickled geometries go through get(), so that they are
+        # interned too
+        return (ShipGeometry.get, ((self.x_start, self.y_start), 
+                                   (self.x_end, self.y_end)))
+
+    def __repr__(self):
+        return (f"ShipGeometry(start=({self.x_start},{self.y_start}), "
+            f"end=({self.x_end},{self.y_end}))")
+
+    def cell_index(self, cell):
+        """ Get the position of a cell along the ship.
+
+        Args:
+            cell (tuple[int, int]): (x, y) cell coordinates
+
+        Returns:
+            int : i if cell is the i-th cell of the ship counting from 
+                (x_start, y_start), or -1 if the ship does not occupy the cell
+        """
+        x, y = cell
+        if self.y_start == self.y_end:
+            if y == self.y_start and self.x_start <= x <= self.x_end:
+                return x - self.x_start
+        elif self.x_start == self.x_end:
+            if x == self.x_start and self.y_start <= y <= self.y_end:
+                return y - self.y_start
+        return -1
+
+    def board_mask(self, width):
+        """ Get the cells of the ship as a bitmask over the whole board.
+
+        Cell (x, y) maps to bit (y - 1) * width + (x - 1), i.e. row-major.
+
+        Args:
+            width (int): width of the board in number of cells
+
+        Returns:
+            int : bitmask of the cells the ship occupies on the board
+        """
+        if self.y_start == self.y_end:
+            return self.cell_mask << ((self.y_start - 1) * width 
+                                      + self.x_start - 1)
+        mask = 0
+        for _, y in self.cells:
+            mask |= 1 << ((y - 1) * width + self.x_start - 1)
+        return mask
+
+    def cells_in_mask(self, mask):
+        """ Convert a bitmask along the ship into a frozenset of (x, y) cells."""
+        dx = 1 if self.y_start == self.y_end else 0
+        dy = 1 - dx
+        return frozenset((self.x_start + i * dx, self.y_start + i * dy) 
+                         for i in range(self.length) if mask >> i & 1)
+
 
 class Ship:
     """ Represent a ship that is placed on the board.
+
+    The placement is held by a shared ShipGeometry. The only per-ship state 
+    is damage_mask, where bit i is set once the i-th cell of the ship 
+    (counting from (x_start, y_start)) has been damaged.
     """
+    __slots__ = ('geometry', 'damage_mask')
+
     def __init__(self, start, end, should_validate=True):
         """ Creates a ship given its start and end coordinates on the board. 
         
@@ -22,33 +175,70 @@ class Ship:
             ValueError: if should_validate==True and 
                 if the ship is neither horizontal nor vertical
         """
-        # Start and end (x, y) cell coordinates of the ship
-        self.x_start, self.y_start = start
-        self.x_end, self.y_end = end
-
-        # make x_start on left and x_end on right
-        self.x_start, self.x_end = (
-            min(self.x_start, self.x_end), max(self.x_start, self.x_end)
-        )
-        
-        # make y_start on top and y_end on bottom
-        self.y_start, self.y_end = (
-            min(self.y_start, self.y_end), max(self.y_start, self.y_end)
-        )
+        self.geometry = ShipGeometry.get(start, end)
         
         if should_validate:
             if not self.is_horizontal() and not self.is_vertical():
                 raise ValueError("The given coordinates are invalid. "
                     "The ship needs to be either horizontal or vertical.")
 
-        # Set of all (x,y) cell coordinates that the ship occupies
-        self.cells = self.get_cells()
-        
-        # Set of (x,y) cell coordinates of the ship that have been damaged
-        self.damaged_cells = set()
+        self.damage_mask = 0
+
+    @classmethod
+    def from_geometry(cls, geometry):
+        """ Create an undamaged ship on an existing (valid) geometry.
+
+        Skips the normalisation and validation done by __init__().
+
+        Args:
+            geometry (ShipGeometry): geometry of the new ship
+
+        Returns:
+            Ship : a new ship sharing the given geometry
+        """
+        ship = cls.__new__(cls)
+        ship.geometry = geometry
+        ship.damage_mask = 0
+        return ship
+
+    @property
+    def x_start(self):
+        return self.geometry.x_start
+
+    @property
+    def y_start(self):
+        return self.geometry.y_start
+
+    @property
+    def x_end(self):
+        return self.geometry.x_end
+
+    @property
+    def y_end(self):
+        return self.geometry.y_end
+
+    @property
+    def cell_mask(self):
+        """ int : Bitmask of the cells of the ship (all of its bits set)."""
+        return self.geometry.cell_mask
+
+    @property
+    def cells(self):
+        """ frozenset[tuple] : Set of all (x,y) cell coordinates that the ship 
+            occupies. Shared with every ship on the same placement.
+        """
+        return self.geometry.cells
+
+    @property
+    def damaged_cells(self):
+        """ frozenset[tuple] : Set of (x,y) cell coordinates of the ship that 
+            have been damaged. Built from self.damage_mask, so it is read-only:
+            use receive_damage() to damage a cell.
+        """
+        return self.geometry.cells_in_mask(self.damage_mask)
     
     def __len__(self):
-        return self.length()
+        return self.geometry.length
         
     def __repr__(self):
         return (f"Ship(start=({self.x_start},{self.y_start}), "
@@ -60,12 +250,7 @@ class Ship:
         Returns:
             bool : True if the ship is vertical. False otherwise.
         """
-        # TODO: 
-        # Complete this method - self.x_start, self.y_start, self.x_end, self.y_end
-        if self.x_start == self.x_end:
-            return True
-        else:
-            return False
+        return self.geometry.x_start == self.geometry.x_end
    
     def is_horizontal(self):
         """ Check whether the ship is horizontal.
@@ -73,11 +258,7 @@ class Ship:
         Returns:
             bool : True if the ship is horizontal. False otherwise.
         """
-        # TODO: Complete this method
-        if self.y_start == self.y_end:
-            return True
-        else:
-            return False
+        return self.geometry.y_start == self.geometry.y_end
     
     def get_cells(self):
         """ Get the set of all cell coordinates that the ship occupies.
@@ -85,22 +266,10 @@ class Ship:
         For example, if the start cell is (3, 3) and end cell is (5, 3),
         then the method should return {(3, 3), (4, 3), (5, 3)}.
         
-        This method is used in __init__() to initialise self.cells
-        
         Returns:
             set[tuple] : Set of (x ,y) coordinates of all cells a ship occupies
         """
-        # TODO: Complete this method       
-        cells = set()
-        if self.is_horizontal():
-            for x_coord in range(self.x_start, self.x_end +1):
-                cells.add((x_coord, self.y_end))
-        
-        elif self.is_vertical():
-            for y_coord in range(self.y_start, self.y_end +1):
-                cells.add((self.x_start, y_coord))
-
-        return cells 
+        return set(self.geometry.cells)
 
     def length(self):
         """ Get length of ship (the number of cells the ship occupies).
@@ -108,8 +277,32 @@ class Ship:
         Returns:
             int : The number of cells the ship occupies
         """
-        # TODO: Complete this method
-        return len(self.get_cells())
+        return self.geometry.length
+
+    def cell_index(self, cell):
+        """ Get the position of a cell along the ship.
+
+        Args:
+            cell (tuple[int, int]): (x, y) cell coordinates
+
+        Returns:
+            int : i if cell is the i-th cell of the ship counting from 
+                (x_start, y_start), or -1 if the ship does not occupy the cell
+        """
+        return self.geometry.cell_index(cell)
+
+    def board_mask(self, width):
+        """ Get the cells of the ship as a bitmask over the whole board.
+
+        Cell (x, y) maps to bit (y - 1) * width + (x - 1), i.e. row-major.
+
+        Args:
+            width (int): width of the board in number of cells
+
+        Returns:
+            int : bitmask of the cells the ship occupies on the board
+        """
+        return self.geometry.board_mask(width)
 
     def is_occupying_cell(self, cell):
         """ Check whether the ship is occupying a given cell
@@ -122,11 +315,7 @@ class Ship:
             bool : return True if the given cell is one of the cells occupied 
                 by the ship. Otherwise, return False
         """
-        # TODO: Complete this method
-        if cell in self.get_cells():
-            return True 
-        else:
-            return False
+        return self.geometry.cell_index(cell) >= 0
     
     def receive_damage(self, cell):
         """ Receive attack at given cell. 
@@ -144,12 +333,11 @@ class Ship:
             bool : return True if the ship is occupying cell (ship is hit). 
                 Return False otherwise.
         """
-        # TODO: Complete this method
-        if self.is_occupying_cell(cell):
-            self.damaged_cells.add(cell)
-            return True
-        else:
+        index = self.geometry.cell_index(cell)
+        if index < 0:
             return False
+        self.damage_mask |= 1 << index
+        return True
     
     def count_damaged_cells(self):
         """ Count the number of cells that have been damaged.
@@ -157,8 +345,7 @@ class Ship:
         Returns:
             int : the number of cells that are damaged.
         """
-        # TODO: Complete this method
-        return len(self.damaged_cells)
+        return bin(self.damage_mask).count('1')
         
     def has_sunk(self):
         """ Check whether the ship has sunk.
@@ -167,13 +354,14 @@ class Ship:
             bool : return True if the ship is damaged at all its positions. 
                 Otherwise, return False
         """
-        # TODO: Complete this method
-        return self.get_cells() == self.damaged_cells
+        return self.damage_mask == self.geometry.cell_mask
 
     def is_near_ship(self, other_ship):
         """ Check whether a ship is near another ship instance.
         
-        Hint: Use the method is_near_cell(...) to complete this method.
+        A straight ship is its own bounding box, so other_ship is near this 
+        ship if and only if the two boxes overlap once this ship's box is 
+        padded by one cell on every side (see is_near_cell()).
 
         Args:
             other_ship (Ship): another Ship instance against which to compare
@@ -182,16 +370,36 @@ class Ship:
             bool : returns True if and only if the coordinate of other_ship is 
                 near to this ship. Returns False otherwise.
         """
-        # TODO: Complete this method
-        for o_cell in other_ship.get_cells():
-            if self.is_near_cell(o_cell):
-                return True
-        else:
-            return False
+        own, other = self.geometry, other_ship.geometry
+        return (other.length > 0
+                and own.x_start - 1 <= other.x_end 
+                and other.x_start <= own.x_end + 1
+                and own.y_start - 1 <= other.y_end 
+                and other.y_start <= own.y_end + 1)
+
+    def is_near_ships(self, boxes):
+        """ Check whether the ship is near each of many ships at once.
+
+        Vectorised version of is_near_ship().
+
+        Args:
+            boxes (numpy.ndarray): (N, 4) array of bounding boxes, one 
+                (x_start, y_start, x_end, y_end) row per ship, as returned 
+                by bounding_boxes()
+
+        Returns:
+            numpy.ndarray : (N,) boolean array, True where the ship in the 
+                corresponding row is near this ship
+        """
+        own = self.geometry
+        boxes = np.asarray(boxes)
+        return ((boxes[:, 2] >= own.x_start - 1) 
+                & (boxes[:, 0] <= own.x_end + 1)
+                & (boxes[:, 3] >= own.y_start - 1) 
+                & (boxes[:, 1] <= own.y_end + 1))
 
     def is_near_cell(self, cell):
         """ Check whether the ship is near an (x,y) cell coordinate.
-        # NOTE check this out w
         In the example below:
         - There is a ship of length 3 represented by the letter S.
         - The positions 1, 2, 3 and 4 are near the ship
@@ -220,9 +428,22 @@ class Ship:
                 and self.y_start-1 <= cell[1] <= self.y_end+1)
 
 
+@lru_cache(maxsize=128)
+def _fleet_geometries(board_size, ships_per_length_items):
+    """ ShipGeometry of every placement of every ship of a fleet.
+
+    Mirrors placement.fleet_tables(). Holding the geometries here also keeps 
+    them interned for as long as the tables are cached.
+    """
+    return tuple(tuple(ShipGeometry.get(placement.start, placement.end)
+                       for placement in table)
+                 for table in fleet_tables(board_size, ships_per_length_items))
+
+
 class ShipFactory:
     """ Class to create new ships in specific configurations."""
-    def __init__(self, board_size=(10,10), ships_per_length=None):
+    def __init__(self, board_size=(10,10), ships_per_length=None, 
+                 uniform=False, budget=None, metrics=None):
         """ Initialises the ShipFactory class with necessary information.
         
         Args: 
@@ -230,8 +451,23 @@ class ShipFactory:
                 terms of number of cells. Defaults to (10, 10)
             ships_per_length (dict): A dict with the length of ship as keys and
                 the count as values. Defaults to 1 ship each for lengths 1-5.
+            uniform (bool): should generate_ships() draw every legal layout 
+                with exactly the same probability? This counts all the 
+                layouts of the fleet first (see count_layouts()), so it is 
+                only practical for small fleets. Defaults to False.
+            budget (GenerationBudget): limits on the draws and time 
+                generate_ships() may spend on one fleet. Defaults to 
+                generation.DEFAULT_BUDGET; pass GenerationBudget() for no 
+                limits.
+            metrics (GenerationMetrics): where to add the report of each 
+                call to generate_ships(). Defaults to None.
         """
-        self.board_size = board_size
+        self.board_size = tuple(board_size)
+        self.uniform = uniform
+        self.budget = DEFAULT_BUDGET if budget is None else budget
+        self.metrics = metrics
+        # GenerationReport of the last call to generate_ships()
+        self.last_report = None
         
         if ships_per_length is None:
             # Default: lengths 1 to 5, one ship each
@@ -258,6 +494,92 @@ class ShipFactory:
         return Ship(start=converter.from_str(start),
                     end=converter.from_str(end))
 
+    def generate_fleets(self, number_of_fleets, rng=None):
+        """ Generate many fleets at once, as arrays rather than Ship objects.
+
+        Fleets follow the same rules as generate_ships(), and are drawn in 
+        a vectorised way (see battleship.placement.sample_layouts). Use 
+        Board.from_coordinates() to turn one of them into a Board.
+
+        Args:
+            number_of_fleets (int): number of fleets to generate
+            rng (numpy.random.Generator): source of randomness. Defaults to 
+                a freshly seeded generator.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray] : (grids, coordinates) where
+                - grids is a (number_of_fleets, height, width) int8 array 
+                  (wider for fleets of 127 ships or more): 
+                  cell (x, y) of fleet i is grids[i, y - 1, x - 1], 0 if it 
+                  is empty and k + 1 if it holds ship k
+                - coordinates is a (number_of_fleets, number_of_ships, 4) 
+                  int16 array: coordinates[i, k] is 
+                  (x_start, y_start, x_end, y_end) of ship k of fleet i
+                Ships are ordered longest first.
+
+        Raises:
+            RuntimeError: if the ships cannot all fit on the board
+        """
+        width, height = self.board_size
+        lengths = fleet_lengths(self.ships_per_length)
+        ship_ids = np.min_scalar_type(-len(lengths) - 1).type
+        grids = np.zeros((number_of_fleets, width * height), dtype=ship_ids)
+        coordinates = np.zeros((number_of_fleets, len(lengths), 4), 
+                               dtype=np.int16)
+
+        if width * height > LARGE_BOARD_CELLS:
+            # No placement tables on large boards: draw fleets one by one
+            if rng is None:
+                rng = np.random.default_rng()
+            grids = grids.reshape(number_of_fleets, height, width)
+            for i in range(number_of_fleets):
+                report = GenerationReport(self.board_size, 
+                                          self.ships_per_length)
+                layout = sample_sparse_layout(self.board_size, 
+                                              self.ships_per_length, rng, 
+                                              report)
+                if layout is None:
+                    raise LayoutGenerationError(report)
+                for k, ((x_start, y_start), (x_end, y_end)) in enumerate(
+                        layout):
+                    grids[i, y_start - 1:y_end, x_start - 1:x_end] = k + 1
+                    coordinates[i, k] = x_start, y_start, x_end, y_end
+            return grids, coordinates
+
+        layouts = sample_layouts(self.board_size, self.ships_per_length, 
+                                 number_of_fleets, rng)
+        for k, length in enumerate(lengths):
+            cells, _ = placement_arrays(self.board_size, length)
+            grids += cells[layouts[:, k]] * ship_ids(k + 1)
+            coordinates[:, k] = placement_coordinates(
+                self.board_size, length)[layouts[:, k]]
+        return grids.reshape(number_of_fleets, height, width), coordinates
+
+    def count_layouts(self):
+        """ Count every legal layout of the fleet on the board.
+
+        Layouts that only differ by swapping ships of the same length are 
+        counted once. The result is cached on disk (see 
+        battleship.placement.layout_statistics).
+
+        Returns:
+            int : the number of legal layouts
+        """
+        return layout_statistics(self.board_size, self.ships_per_length)[0]
+
+    def cell_marginals(self):
+        """ Get the probability that each cell holds a ship.
+
+        That is the exact probability over all legal layouts drawn uniformly, 
+        i.e. the prior of a player who knows nothing about the board yet. The 
+        result is cached on disk alongside count_layouts().
+
+        Returns:
+            numpy.ndarray : (height, width) array of probabilities. Cell 
+                (x, y) is at [y - 1, x - 1].
+        """
+        return layout_statistics(self.board_size, self.ships_per_length)[1]
+
     def generate_ships(self):
         """ Generate a list of ships in the appropriate configuration.
         
@@ -268,59 +590,67 @@ class ShipFactory:
         too close to one another (as defined earlier in Ship::is_near_ship())
         
         The coordinates should also be valid given self.board_size
+
+        Ships are drawn from the cached tables of legal placements for 
+        self.board_size (see battleship.placement), longest ships first. 
+        Each ship is uniform among the placements left free by the previous 
+        ones, which does not make whole layouts uniform; set self.uniform 
+        for that. Boards larger than placement.LARGE_BOARD_CELLS use 
+        placement.sample_sparse_layout() instead, which scales with the 
+        number of ships rather than the size of the board.
+        
+        Every call fills a GenerationReport (self.last_report) with the 
+        attempts, draws, rejected placements and time it took, and stops 
+        once self.budget is spent.
         
         Returns:
             list[Ships] : A list of Ship instances (+ start and end coords), adhering to the rules above
+
+        Raises:
+            LayoutGenerationError: (a RuntimeError) if the ships cannot all 
+                fit on the board, or were not placed within the budget. Its 
+                report says which.
         """
-        # TODO: Complete this method
-        ships = []
-        ship_cells = set()
-
-        # NOTE I think I may still need to check valid lengths and stuff? Ask helper ** 
-        # I want to iterate through each of the ship entries in the self.ships_per_length, 
-        for ship_length, ship_quantity in sorted(self.ships_per_length.items(), key = lambda x:x[0], reverse = True):
-            if ship_quantity > 0:
-                for _ in range(ship_quantity):
-                    valid_ship = False
-                    attempts = 0 
-
-                    while not valid_ship and attempts < 100:
-                        attempts += 1
-                        valid_ship = True 
-
-                        if random.choice(['horizontal', 'vertical']) == 'horizontal':
-                            x_start = random.randint(1, 10 - ship_length)
-                            y_start = random.randint(1, 10)
-
-                            x_end = x_start + ship_length - 1
-                            y_end = y_start
-
-                        else:
-                            x_start = random.randint(1, 10)
-                            y_start = random.randint(1, 10 - ship_length)
-
-                            x_end = x_start
-                            y_end = y_start + ship_length - 1
-
-                        new_ship = Ship((x_start, y_start), (x_end, y_end))
-
-                        new_ship_cells = set(new_ship.get_cells())
-                        if any(new_cell in ship_cells for new_cell in new_ship_cells):
-                            valid_ship = False
-                            continue  # Skip the rest of the loop and try again
-
-                        if any(new_ship.is_near_ship(existing_ship) for existing_ship in ships):
-                            valid_ship = False
-                            continue  # Skip the rest of the loop and try again
-
-                        # If we made it here, the ship is valid
-                        ships.append(new_ship)
-                        ship_cells.update(new_ship_cells)
-
-                    if attempts == 100:
-                        raise RuntimeError(f"Unable to place ship of length {ship_length} after 100 attempts.")
-                # print("for _ in range(ship_quantity): ships, ship_cells: ", ships, ship_cells)
-        return ships
+        report = GenerationReport(self.board_size, self.ships_per_length, 
+                                  self.budget)
+        self.last_report = report
+        try:
+            return self._generate_ships(report)
+        finally:
+            if self.metrics is not None:
+                self.metrics.record(report)
+
+    def _generate_ships(self, report):
+        """ generate_ships(), recording what it takes in report."""
+        width, height = self.board_size
+        if not self.uniform and width * height > LARGE_BOARD_CELLS:
+            layout = sample_sparse_layout(self.board_size, 
+                                          self.ships_per_length, 
+                                          report=report)
+            if layout is None:
+                raise LayoutGenerationError(report)
+            return [Ship.from_geometry(ShipGeometry.get(start, end))
+                    for start, end in layout]
+
+        if self.uniform:
+            report.attempts += 1
+            placements = layout_counter(
+                self.board_size, 
+                tuple(sorted(self.ships_per_length.items()))).sample()
+            if placements is None:
+                report.finish(NO_LAYOUT)
+            else:
+                report.draws += len(placements)
+                report.finish(PLACED)
+        else:
+            placements = sample_layout(self.board_size, self.ships_per_length,
+                                       report=report)
+        if placements is None:
+            raise LayoutGenerationError(report)
+        geometries = _fleet_geometries(self.board_size, 
+                                       tuple(self.ships_per_length.items()))
+        return [Ship.from_geometry(table[placement.index])
+                for table, placement in zip(geometries, placements)]
         
         
 if __name__ == '__main__':
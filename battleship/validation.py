@@ -0,0 +1,88 @@
+""" Validation of many fleet layouts at once.
+
+validate_layouts() applies the rules of Board.validate_ships() to a whole
+array of layouts with NumPy, without building any Ship or Board. Each
+layout gets the error code of the first rule it breaks, in the order
+Board.validate_ships() checks them, so that a layout is valid here if and
+only if Board.validate_ships() accepts it, and the code matches the
+ValueError it would raise.
+"""
+import numpy as np
+
+# Error codes, in the order the rules are checked
+VALID = 0
+OUT_OF_BOUNDS = 1
+WRONG_SHIP_LENGTHS = 2
+SHIPS_TOO_CLOSE = 3
+
+
+def validate_layouts(coordinates, size=(10,10), ships_per_length=None):
+    """ Validate many layouts of the same number of ships.
+
+    Args:
+        coordinates (array-like): (number_of_layouts, number_of_ships, 4)
+            array with one (x_start, y_start, x_end, y_end) row per ship,
+            such as ShipFactory.generate_fleets() or
+            LayoutCorpus.coordinates() return. The ends of a ship may come
+            in either order, as for Ship.
+        size (tuple[int, int]): (width, height) of the board. Defaults to
+            (10, 10).
+        ships_per_length (dict): A dict with the length of ship as keys and
+            the count as values. Defaults to 1 ship each for lengths 1-5.
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray] : (valid, errors) where valid is
+            a boolean array, True for the layouts Board.validate_ships()
+            accepts, and errors an int8 array with the error code of each
+            layout: VALID, OUT_OF_BOUNDS (a ship is beyond the bounds of the
+            board), WRONG_SHIP_LENGTHS (the ships do not match
+            ships_per_length) or SHIPS_TOO_CLOSE (two ships overlap or are
+            near each other)
+    """
+    width, height = size
+    if ships_per_length is None:
+        ships_per_length = {1: 1, 2: 1, 3: 1, 4: 1, 5: 1}
+    # As Board does, ignore lengths and counts that are not positive
+    ships_per_length = {length: count
+                        for length, count in ships_per_length.items()
+                        if length > 0 and count > 0}
+
+    coordinates = np.asarray(coordinates, dtype=np.int64)
+    number_of_layouts, number_of_ships = coordinates.shape[:2]
+    x_start = np.minimum(coordinates[..., 0], coordinates[..., 2])
+    x_end = np.maximum(coordinates[..., 0], coordinates[..., 2])
+    y_start = np.minimum(coordinates[..., 1], coordinates[..., 3])
+    y_end = np.maximum(coordinates[..., 1], coordinates[..., 3])
+
+    out_of_bounds = np.any((x_start < 1) | (y_start < 1) | (x_end > width)
+                           | (y_end > height), axis=1)
+
+    # Ships that are neither horizontal nor vertical have length 0 (see
+    # ShipGeometry), which never matches ships_per_length
+    lengths = np.where(y_start == y_end, x_end - x_start + 1,
+                       np.where(x_start == x_end, y_end - y_start + 1, 0))
+    if number_of_ships != sum(ships_per_length.values()):
+        wrong_lengths = np.ones(number_of_layouts, dtype=bool)
+    else:
+        # With the right total, matching every count leaves no other length
+        wrong_lengths = np.zeros(number_of_layouts, dtype=bool)
+        for length, count in ships_per_length.items():
+            wrong_lengths |= (np.count_nonzero(lengths == length, axis=1)
+                              != count)
+
+    # Ship.is_near_ship() between each ship and every ship after it, across
+    # all layouts at once
+    too_close = np.zeros(number_of_layouts, dtype=bool)
+    for index in range(number_of_ships - 1):
+        others = slice(index + 1, None)
+        near = ((lengths[:, others] > 0)
+                & (x_start[:, [index]] - 1 <= x_end[:, others])
+                & (x_start[:, others] <= x_end[:, [index]] + 1)
+                & (y_start[:, [index]] - 1 <= y_end[:, others])
+                & (y_start[:, others] <= y_end[:, [index]] + 1))
+        too_close |= near.any(axis=1)
+
+    errors = np.select([out_of_bounds, wrong_lengths, too_close],
+                       [OUT_OF_BOUNDS, WRONG_SHIP_LENGTHS, SHIPS_TOO_CLOSE],
+                       VALID).astype(np.int8)
+    return errors == VALID, errors
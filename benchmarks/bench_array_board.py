@@ -0,0 +1,61 @@
+""" Shots per second with Board, ArrayBoard and ArrayBoard.attack_many.
+
+Fires at every cell of each board in a random order: one call per shot
+with Board.is_attacked_at and ArrayBoard.is_attacked_at, and a single call
+per board with ArrayBoard.attack_many.
+
+Run with: python3 -m benchmarks.bench_array_board [number_of_boards]
+"""
+import sys
+import time
+
+import numpy as np
+
+from battleship.array_board import ArrayBoard
+from battleship.board import Board
+from battleship.ship import ShipFactory
+
+
+def main(number_of_boards=1000):
+    rng = np.random.default_rng(0)
+    for board_size in ((10, 10), (100, 100)):
+        width, height = board_size
+        ships_per_length = {length: max(1, width * height // 1500) 
+                            for length in range(1, 6)}
+        _, fleets = ShipFactory(board_size=board_size, 
+                                ships_per_length=ships_per_length
+                                ).generate_fleets(number_of_boards, rng)
+        cells = np.stack(np.meshgrid(np.arange(1, width + 1), 
+                                     np.arange(1, height + 1)), 
+                         axis=-1).reshape(-1, 2)
+        orders = [rng.permutation(cells) for _ in range(number_of_boards)]
+        shots = number_of_boards * len(cells)
+        print(f"{width}x{height} board, {sum(ships_per_length.values())} ships")
+
+        for board_class in (Board, ArrayBoard):
+            boards = [board_class.from_coordinates(
+                          fleet, board_size, ships_per_length) 
+                      for fleet in fleets]
+            start = time.perf_counter()
+            for board, order in zip(boards, orders):
+                for cell in order.tolist():
+                    board.is_attacked_at(tuple(cell))
+            elapsed = time.perf_counter() - start
+            assert all(board.have_all_ships_sunk() for board in boards)
+            print(f"  {board_class.__name__ + '.is_attacked_at':26}"
+                  f"{shots / elapsed:14,.0f} shots per second")
+
+        boards = [ArrayBoard.from_coordinates(fleet, board_size, 
+                                              ships_per_length) 
+                  for fleet in fleets]
+        start = time.perf_counter()
+        for board, order in zip(boards, orders):
+            board.attack_many(order)
+        elapsed = time.perf_counter() - start
+        assert all(board.have_all_ships_sunk() for board in boards)
+        print(f"  {'ArrayBoard.attack_many':26}"
+              f"{shots / elapsed:14,.0f} shots per second")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,48 @@
+""" Cost of each move of AutomaticPlayer over a whole game.
+
+Plays AutomaticPlayer against a crowded board until every ship has sunk,
+with possible_cells as a CandidateCells (the current player) and as the
+plain list of every cell it used to be, and prints the mean time of a move
+(select_target() + receive_result()) in each tenth of the game.
+
+Run with: python3 -m benchmarks.bench_automatic_player [board_side]
+"""
+import random
+import sys
+import time
+
+from battleship.board import Board
+from battleship.player import AutomaticPlayer
+
+
+def play(side, use_list):
+    random.seed(0)
+    target = Board(size=(side, side), ships_per_length={
+        length: side * side // 500 for length in range(1, 6)})
+    player = AutomaticPlayer(board=Board(size=(side, side)))
+    if use_list:
+        player.possible_cells = [(x, y) for x in range(1, side + 1)
+                                 for y in range(1, side + 1)]
+
+    times = []
+    while not target.have_all_ships_sunk():
+        start = time.perf_counter()
+        cell = player.select_target()
+        result = target.is_attacked_at(cell)
+        player.receive_result(*result)
+        times.append(time.perf_counter() - start)
+    tenth = max(1, len(times) // 10)
+    return len(times), [sum(times[i:i + tenth]) / len(times[i:i + tenth])
+                        for i in range(0, tenth * 10, tenth)]
+
+
+def main(side=200):
+    for name, use_list in (('CandidateCells', False), ('list', True)):
+        moves, means = play(side, use_list)
+        print(f"{name:>14}, {side}x{side}, {moves} moves, mean us per move "
+              f"by tenth of the game:")
+        print('    ' + ' '.join(f'{mean * 1e6:8.1f}' for mean in means))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,133 @@
+""" Simulated shots per second with the bitboard core and with Board.
+
+Each simulated game fires at random cells of a 10x10 board until every ship
+has sunk, checking for the end of the game after every shot like Game.play
+does. Compared engines:
+- the set-of-tuples Board as it originally was (copied here: every Ship
+  kept sets of cells, and each shot scanned every ship three times)
+- Board as it is now (cell index and live counters)
+- BitBoardAdapter, the bitboard core behind the Board interface
+- BitBoard itself, attacking bits directly
+
+Run with: python3 -m benchmarks.bench_bitboard [number_of_games]
+"""
+import random
+import sys
+import time
+
+from battleship.bitboard import BitBoard, BitBoardAdapter
+from battleship.board import Board
+from battleship.ship import Ship, ShipFactory
+
+
+class LegacyShip:
+    """ Set-based Ship as it used to be, kept here for comparison only."""
+    def __init__(self, start, end):
+        self.x_start, self.x_end = sorted((start[0], end[0]))
+        self.y_start, self.y_end = sorted((start[1], end[1]))
+        self.damaged_cells = set()
+
+    def get_cells(self):
+        if self.y_start == self.y_end:
+            return {(x, self.y_start)
+                    for x in range(self.x_start, self.x_end + 1)}
+        return {(self.x_start, y) for y in range(self.y_start, self.y_end + 1)}
+
+    def is_occupying_cell(self, cell):
+        return cell in self.get_cells()
+
+    def receive_damage(self, cell):
+        if self.is_occupying_cell(cell):
+            self.damaged_cells.add(cell)
+            return True
+        return False
+
+    def has_sunk(self):
+        return self.get_cells() == self.damaged_cells
+
+
+class LegacyBoard:
+    """ Set-of-tuples Board as it used to be, kept here for comparison only."""
+    def __init__(self, ships):
+        self.ships = ships
+        self.marked_cells = set()
+
+    def have_all_ships_sunk(self):
+        return all(ship.has_sunk() for ship in self.ships)
+
+    def is_attacked_at(self, cell):
+        self.marked_cells.add(cell)
+        is_ship_hit = any([ship.is_occupying_cell(cell) for ship in self.ships])
+        if is_ship_hit:
+            for ship in self.ships:
+                if ship.is_occupying_cell(cell):
+                    ship.receive_damage(cell)
+        has_ship_sunk = False
+        for ship in self.ships:
+            if ship.is_occupying_cell(cell):
+                has_ship_sunk = ship.has_sunk()
+        return is_ship_hit, has_ship_sunk
+
+
+def play_board(board, cells):
+    shots = 0
+    for cell in cells:
+        board.is_attacked_at(cell)
+        shots += 1
+        if board.have_all_ships_sunk():
+            break
+    return shots
+
+
+def play_bit_board(bit_board, bits):
+    shots = 0
+    for bit in bits:
+        bit_board.attack(bit)
+        shots += 1
+        if bit_board.is_game_over():
+            break
+    return shots
+
+
+def main(number_of_games=2000):
+    rng = random.Random(0)
+    factory = ShipFactory()
+    fleets = [[(ship.x_start, ship.y_start, ship.x_end, ship.y_end) 
+               for ship in factory.generate_ships()] 
+              for _ in range(number_of_games)]
+    orders = []
+    for _ in range(number_of_games):
+        cells = [(x, y) for x in range(1, 11) for y in range(1, 11)]
+        rng.shuffle(cells)
+        orders.append(cells)
+
+    def ships(fleet, ship_class=Ship):
+        return [ship_class((x_start, y_start), (x_end, y_end)) 
+                for x_start, y_start, x_end, y_end in fleet]
+
+    engines = {
+        "set-of-tuples Board": (
+            lambda fleet: LegacyBoard(ships(fleet, LegacyShip)), 
+            play_board, lambda cells: cells),
+        "Board": (lambda fleet: Board(ships(fleet)), play_board, 
+                  lambda cells: cells),
+        "BitBoardAdapter": (lambda fleet: BitBoardAdapter(ships(fleet)), 
+                            play_board, lambda cells: cells),
+        "BitBoard": (lambda fleet: BitBoard.from_ships(ships(fleet)), 
+                     play_bit_board, 
+                     lambda cells: [(y - 1) * 10 + x - 1 for x, y in cells]),
+    }
+    baseline = None
+    for name, (build, play, convert) in engines.items():
+        boards = [build(fleet) for fleet in fleets]
+        targets = [convert(cells) for cells in orders]
+        start = time.perf_counter()
+        shots = sum(play(board, cells) for board, cells in zip(boards, targets))
+        rate = shots / (time.perf_counter() - start)
+        baseline = baseline or rate
+        print(f"{name:20} {rate:12,.0f} shots per second "
+              f"({rate / baseline:5.1f}x)")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
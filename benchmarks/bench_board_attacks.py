@@ -0,0 +1,76 @@
+""" Cost of a shot (Board.is_attacked_at) as fleets grow.
+
+Fires at every cell of a board, and compares Board.is_attacked_at with a
+copy of the previous implementation, which scanned every ship three times
+per shot. Also compares Board.have_all_ships_sunk, called twice per shot
+by Game.play, with its previous implementation, which walked every ship.
+
+Run with: python3 -m benchmarks.bench_board_attacks
+"""
+import time
+
+from battleship.board import Board
+from battleship.ship import Ship
+
+
+def legacy_is_attacked_at(board, cell):
+    """ Previous Board.is_attacked_at, kept here for comparison only."""
+    board.marked_cells.add(cell)
+    is_ship_hit = any([ship.is_occupying_cell(cell) for ship in board.ships])
+    if is_ship_hit:
+        for ship in board.ships:
+            if ship.is_occupying_cell(cell):
+                ship.receive_damage(cell)
+    has_ship_sunk = False
+    for ship in board.ships:
+        if ship.is_occupying_cell(cell):
+            has_ship_sunk = ship.has_sunk()
+    return is_ship_hit, has_ship_sunk
+
+
+def legacy_have_all_ships_sunk(board):
+    """ Previous Board.have_all_ships_sunk, kept here for comparison only."""
+    return all(ship.has_sunk() for ship in board.ships)
+
+
+def time_per_check(board, have_all_ships_sunk, repeats=2000):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        have_all_ships_sunk(board)
+    return (time.perf_counter() - start) / repeats
+
+
+def time_per_shot(board_size, ships_per_length, attack):
+    board = Board(size=board_size, ships_per_length=ships_per_length)
+    # Fresh, undamaged copies of the ships for each run
+    board.ships = [Ship.from_geometry(ship.geometry) for ship in board.ships]
+    cells = [(x, y) for x in range(1, board_size[0] + 1) 
+             for y in range(1, board_size[1] + 1)]
+    start = time.perf_counter()
+    for cell in cells:
+        attack(board, cell)
+    elapsed = time.perf_counter() - start
+    assert legacy_have_all_ships_sunk(board)
+    return elapsed / len(cells), sum(ships_per_length.values())
+
+
+def main():
+    for board_size, sets in [((10, 10), 1), ((40, 40), 20), 
+                             ((100, 100), 100)]:
+        ships_per_length = {length: sets for length in range(1, 6)}
+        legacy, number_of_ships = time_per_shot(board_size, ships_per_length, 
+                                                legacy_is_attacked_at)
+        current, _ = time_per_shot(board_size, ships_per_length, 
+                                   Board.is_attacked_at)
+        print(f"{number_of_ships:>5} ships: legacy {legacy * 1e6:9.2f} us, "
+              f"indexed {current * 1e6:6.2f} us per shot "
+              f"({legacy / current:.0f}x)")
+        board = Board(size=board_size, ships_per_length=ships_per_length)
+        legacy = time_per_check(board, legacy_have_all_ships_sunk)
+        current = time_per_check(board, Board.have_all_ships_sunk)
+        print(f"{'':>11} have_all_ships_sunk: legacy {legacy * 1e6:7.2f} us, "
+              f"counters {current * 1e6:5.2f} us")
+
+
+if __name__ == '__main__':
+    main()
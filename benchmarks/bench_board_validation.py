@@ -0,0 +1,74 @@
+""" Speed of Board.find_ship_conflicts against all-pairs validation.
+
+Validates legal fleets (the worst case for the all-pairs checks, which
+cannot stop early) from 5 to 20,000 ships. The all-pairs baselines are
+copies of the previous Board.are_ships_too_close implementations:
+- the original loop, copying the list of ships and removing each ship
+  from it before comparing it with the others
+- the NumPy version, comparing each ship with the bounding boxes of the
+  ships after it
+
+Run with: python3 -m benchmarks.bench_board_validation
+"""
+import time
+
+from battleship.board import Board
+from battleship.ship import ShipFactory, bounding_boxes
+
+
+def original_are_ships_too_close(ships):
+    for ship in ships:
+        temp_ships = ships.copy()
+        temp_ships.remove(ship)
+        for other_ships in temp_ships:
+            if ship.is_near_ship(other_ships):
+                return True
+    return False
+
+
+def numpy_are_ships_too_close(ships):
+    boxes = bounding_boxes(ships)
+    for index, ship in enumerate(ships[:-1]):
+        if ship.is_near_ships(boxes[index + 1:]).any():
+            return True
+    return False
+
+
+def timed(function, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    print(f"{'ships':>7} {'original':>12} {'numpy':>12} {'index':>12}")
+    for board_size, sets in [((10, 10), 1), ((100, 100), 20), 
+                             ((300, 300), 200), ((1000, 1000), 1000), 
+                             ((1000, 1000), 4000)]:
+        ships_per_length = {length: sets for length in range(1, 6)}
+        ships = ShipFactory(board_size=board_size, 
+                            ships_per_length=ships_per_length).generate_ships()
+        board = Board(ships=ships, size=board_size, 
+                      ships_per_length=ships_per_length, 
+                      should_validate=False)
+        repeats = max(1, 2000 // len(ships))
+        timings = []
+        if len(ships) <= 1000:
+            timings.append(timed(
+                lambda: original_are_ships_too_close(ships), repeats))
+        else:
+            timings.append(None)
+        if len(ships) <= 5000:
+            timings.append(timed(
+                lambda: numpy_are_ships_too_close(ships), repeats))
+        else:
+            timings.append(None)
+        timings.append(timed(board.find_ship_conflicts, repeats))
+        print(f"{len(ships):>7} " + " ".join(
+            f"{'-':>12}" if timing is None else f"{timing * 1e3:9.3f} ms" 
+            for timing in timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+""" Validating many layouts: validate_layouts against Board.validate_ships.
+
+Damages about half of a batch of default fleets (a ship moved, stretched
+or turned), then validates them one Board at a time and all at
+once with validate_layouts, and checks that both agree.
+
+Run with: python3 -m benchmarks.bench_bulk_validation [number_of_layouts]
+"""
+import sys
+import time
+
+import numpy as np
+
+from battleship.board import Board
+from battleship.ship import ShipFactory
+from battleship.validation import VALID, validate_layouts
+
+
+def damaged_layouts(number_of_layouts, rng):
+    _, coordinates = ShipFactory().generate_fleets(number_of_layouts, rng)
+    coordinates = coordinates.astype(np.int64)
+    layouts = np.arange(number_of_layouts)
+    ships = rng.integers(coordinates.shape[1], size=number_of_layouts)
+    moves = rng.integers(-2, 3, size=(number_of_layouts, 4))
+    kinds = rng.integers(4, size=number_of_layouts)
+    moved = kinds == 1
+    coordinates[layouts[moved], ships[moved]] += np.tile(moves[moved, :2],
+                                                         2)
+    stretched = kinds == 2
+    coordinates[layouts[stretched], ships[stretched], 2:] += moves[stretched,
+                                                                   2:]
+    return coordinates
+
+
+def is_valid(layout):
+    try:
+        Board.from_coordinates(layout).validate_ships()
+    except ValueError:
+        return False
+    return True
+
+
+def main(number_of_layouts=100_000):
+    coordinates = damaged_layouts(number_of_layouts,
+                                  np.random.default_rng(0))
+
+    checked = min(number_of_layouts, 20_000)
+    start = time.perf_counter()
+    expected = [is_valid(layout) for layout in coordinates[:checked]]
+    board_rate = checked / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    valid, errors = validate_layouts(coordinates)
+    bulk_rate = number_of_layouts / (time.perf_counter() - start)
+    assert valid[:checked].tolist() == expected
+    assert np.array_equal(valid, errors == VALID)
+
+    print(f"{np.count_nonzero(valid)} of {number_of_layouts} layouts valid")
+    print(f"Board.validate_ships: {board_rate:12,.0f} layouts/s")
+    print(f"validate_layouts:     {bulk_rate:12,.0f} layouts/s "
+          f"({bulk_rate / board_rate:.0f}x)")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
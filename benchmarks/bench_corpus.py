@@ -0,0 +1,78 @@
+""" Storing and loading many fleet layouts: layout corpus against pickle.
+
+Writes the same default fleets as a pickled list of Boards and as a layout
+corpus, then compares the size of the files, the time to write them, the
+time before the first board can be used, and the time to build boards
+picked at random.
+
+Run with: python3 -m benchmarks.bench_corpus [number_of_layouts]
+"""
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from battleship.board import Board
+from battleship.corpus import CorpusWriter, LayoutCorpus
+from battleship.ship import ShipFactory
+
+
+def main(number_of_layouts=100_000):
+    _, coordinates = ShipFactory().generate_fleets(
+        number_of_layouts, np.random.default_rng(0))
+    picks = random.Random(0).sample(range(number_of_layouts),
+                                    min(1000, number_of_layouts))
+
+    with tempfile.TemporaryDirectory() as directory:
+        pickle_path = os.path.join(directory, 'layouts.pickle')
+        corpus_path = os.path.join(directory, 'layouts.bin')
+
+        boards = [Board.from_coordinates(fleet) for fleet in coordinates]
+        start = time.perf_counter()
+        with open(pickle_path, 'wb') as file:
+            pickle.dump(boards, file, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle_write = time.perf_counter() - start
+        del boards
+
+        start = time.perf_counter()
+        with CorpusWriter(corpus_path) as writer:
+            writer.append_layouts((10, 10), ShipFactory().ships_per_length,
+                                  coordinates)
+        corpus_write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with open(pickle_path, 'rb') as file:
+            boards = pickle.load(file)
+        pickle_open = time.perf_counter() - start
+        start = time.perf_counter()
+        for index in picks:
+            boards[index].ships
+        pickle_access = time.perf_counter() - start
+        del boards
+
+        start = time.perf_counter()
+        corpus = LayoutCorpus(corpus_path)
+        corpus_open = time.perf_counter() - start
+        start = time.perf_counter()
+        for index in picks:
+            corpus.board(index)
+        corpus_access = time.perf_counter() - start
+        corpus.close()
+
+        print(f"{number_of_layouts} layouts")
+        for name, path, write, opening, access in (
+                ('pickle', pickle_path, pickle_write, pickle_open,
+                 pickle_access),
+                ('corpus', corpus_path, corpus_write, corpus_open,
+                 corpus_access)):
+            print(f"{name}: {os.path.getsize(path) / 1e6:8.2f} MB, "
+                  f"write {write:7.3f} s, open {opening * 1e3:9.2f} ms, "
+                  f"{len(picks)} random boards {access * 1e3:7.2f} ms")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,56 @@
+""" Moves per game and time per decision of DensityPlayer.
+
+Plays whole games on the default 10x10 board and on a larger one with
+DensityPlayer and with RandomPlayer, and prints the mean number of moves
+to sink the fleet and the median and worst time of select_target().
+
+Run with: python3 -m benchmarks.bench_density_player [games]
+"""
+import random
+import statistics
+import sys
+import time
+
+from battleship.board import Board
+from battleship.density import DensityPlayer
+from battleship.player import RandomPlayer
+
+SETUPS = [
+    ((10, 10), {1: 1, 2: 1, 3: 1, 4: 1, 5: 1}),
+    ((30, 30), {length: 4 for length in range(1, 6)}),
+]
+
+
+def play(player_class, size, ships_per_length, games):
+    moves = []
+    times = []
+    for seed in range(games):
+        target = Board(size=size, ships_per_length=ships_per_length)
+        player = player_class(board=Board(size=size,
+                                          ships_per_length=ships_per_length),
+                              seed=seed)
+        count = 0
+        while not target.have_all_ships_sunk():
+            start = time.perf_counter()
+            cell = player.select_target()
+            times.append(time.perf_counter() - start)
+            player.receive_result(*target.is_attacked_at(cell))
+            count += 1
+        moves.append(count)
+    return statistics.mean(moves), statistics.median(times), max(times)
+
+
+def main(games=100):
+    random.seed(0)
+    print(f"{'board':>7}  {'player':<13} {'moves':>7} {'median us':>10} "
+          f"{'worst us':>9}")
+    for size, ships_per_length in SETUPS:
+        for player_class in (DensityPlayer, RandomPlayer):
+            moves, median, worst = play(player_class, size, ships_per_length,
+                                        games)
+            print(f"{'x'.join(map(str, size)):>7}  {player_class.__name__:<13} "
+                  f"{moves:7.1f} {median * 1e6:10.1f} {worst * 1e6:9.1f}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,60 @@
+""" Which fleets are expensive to lay out, according to GenerationMetrics.
+
+Creates boards for a range of fleets, from the default one to fleets that
+barely fit (or do not), under a per-board budget, and prints the metrics
+collected for each fleet, most expensive first.
+
+Run with: python3 -m benchmarks.bench_generation_metrics [boards_per_fleet]
+"""
+import sys
+
+from battleship.board import Board
+from battleship.generation import (GenerationBudget, GenerationMetrics,
+                                   LayoutGenerationError)
+
+FLEETS = [
+    ((10, 10), {1: 1, 2: 1, 3: 1, 4: 1, 5: 1}),
+    ((10, 10), {1: 4, 2: 3, 3: 2, 4: 1}),
+    ((10, 10), {1: 20}),
+    ((10, 10), {1: 24}),
+    ((10, 10), {1: 26}),
+    ((5, 6), {1: 2, 2: 2, 3: 2}),
+    ((3, 3), {3: 3}),
+    ((1000, 1000), {length: 200 for length in range(1, 6)}),
+]
+
+
+def main(boards_per_fleet=200):
+    Board.generation_budget = GenerationBudget(max_draws=100_000,
+                                               time_limit=0.05)
+    Board.generation_metrics = GenerationMetrics()
+    try:
+        for size, ships_per_length in FLEETS:
+            for _ in range(boards_per_fleet):
+                try:
+                    Board(size=size, ships_per_length=ships_per_length)
+                except LayoutGenerationError:
+                    pass
+        summary = Board.generation_metrics.summary()
+    finally:
+        Board.generation_budget = None
+        Board.generation_metrics = None
+
+    print(f"{'board':>9}  {'fleet':<32} {'failed':>6} {'attempts':>8} "
+          f"{'draws':>9} {'too close':>10} {'dead end':>9} {'mean ms':>8} "
+          f"{'max ms':>8}")
+    for row in summary:
+        boards = row['boards']
+        fleet = ' '.join(f'{count}x{length}' for length, count
+                         in sorted(row['ships_per_length'].items()))
+        print(f"{'x'.join(map(str, row['board_size'])):>9}  {fleet[:32]:<32} "
+              f"{row['failures']:>6} {row['attempts'] / boards:8.1f} "
+              f"{row['draws'] / boards:9.1f} "
+              f"{row['rejected']['too_close'] / boards:10.1f} "
+              f"{row['rejected']['dead_end'] / boards:9.1f} "
+              f"{row['mean_wall_time'] * 1e3:8.3f} "
+              f"{row['max_wall_time'] * 1e3:8.3f}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,52 @@
+""" Time per move of DensityPlayer and IncrementalDensityPlayer by board size.
+
+DensityPlayer computes its heatmap from scratch for every move, which costs
+in proportion to the area of the board times the number of ship lengths.
+IncrementalDensityPlayer only updates the placements each result rules
+out. This plays the first moves of a game on boards of growing size with
+both, and prints the mean time of a move (select_target() +
+receive_result()) and the time to create the player.
+
+Run with: python3 -m benchmarks.bench_incremental_density [moves]
+"""
+import random
+import sys
+import time
+
+from battleship.board import Board
+from battleship.density import DensityPlayer, IncrementalDensityPlayer
+
+SIDES = [10, 50, 100, 200, 400]
+
+
+def play(player_class, side, moves):
+    random.seed(0)
+    ships_per_length = {length: max(1, side * side // 2000)
+                        for length in range(1, 6)}
+    target = Board(size=(side, side), ships_per_length=ships_per_length)
+    start = time.perf_counter()
+    player = player_class(board=Board(size=(side, side),
+                                      ships_per_length=ships_per_length),
+                          seed=0)
+    setup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    count = 0
+    while count < moves and not target.have_all_ships_sunk():
+        cell = player.select_target()
+        player.receive_result(*target.is_attacked_at(cell))
+        count += 1
+    return setup, (time.perf_counter() - start) / count
+
+
+def main(moves=500):
+    print(f"{'board':>9}  {'player':<24} {'setup ms':>9} {'us per move':>12}")
+    for side in SIDES:
+        for player_class in (DensityPlayer, IncrementalDensityPlayer):
+            setup, per_move = play(player_class, side, moves)
+            print(f"{side:>4}x{side:<4}  {player_class.__name__:<24} "
+                  f"{setup * 1e3:9.1f} {per_move * 1e6:12.1f}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
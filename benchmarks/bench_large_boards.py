@@ -0,0 +1,49 @@
+""" Scaling of ShipFactory.generate_ships with board size and fleet size.
+
+Boards go from 10x10 to 10,000x10,000, with fleets covering about 1% of the
+cells (at least the default fleet), and then from 100 to 10,000 ships on a
+1000x1000 board. Time per ship should stay roughly constant.
+
+Run with: python3 -m benchmarks.bench_large_boards
+"""
+import time
+
+from battleship.ship import ShipFactory
+
+
+def time_per_fleet(board_size, ships_per_length, repeats):
+    ship_factory = ShipFactory(board_size=board_size, 
+                               ships_per_length=ships_per_length)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        ship_factory.generate_ships()
+    return (time.perf_counter() - start) / repeats
+
+
+def report(board_size, ships_per_length, repeats):
+    number_of_ships = sum(ships_per_length.values())
+    elapsed = time_per_fleet(board_size, ships_per_length, repeats)
+    print(f"{board_size[0]:>6}x{board_size[1]:<6} {number_of_ships:>8} ships"
+          f" {elapsed * 1e3:10.2f} ms per fleet"
+          f" {elapsed / number_of_ships * 1e6:8.2f} us per ship")
+
+
+def main():
+    print("Board size")
+    for side in (10, 100, 1000, 10000):
+        # Ships of lengths 1-5 cover 15 cells per set of 5 ships
+        sets = max(1, side * side // 1500)
+        ships_per_length = {length: sets for length in range(1, 6)}
+        report((side, side), ships_per_length, 
+               max(1, 10000 // (5 * sets)))
+
+    print("Fleet size")
+    for number_of_ships in (100, 1000, 10000):
+        ships_per_length = {length: number_of_ships // 5 
+                            for length in range(1, 6)}
+        report((1000, 1000), ships_per_length, 
+               max(1, 10000 // number_of_ships))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+""" Measures how far ShipFactory's default sampler is from uniform layouts.
+
+Compares the cell occupancy of fleets drawn by ShipFactory.generate_ships
+with the exact marginals of uniformly drawn layouts (ShipFactory.
+cell_marginals), and times the exact uniform sampler.
+
+Run with: python3 -m benchmarks.bench_layout_bias [number_of_fleets]
+"""
+import sys
+import time
+
+import numpy as np
+
+from battleship.ship import ShipFactory
+
+
+def occupancy(ship_factory, number_of_fleets):
+    """ Empirical probability that each cell is occupied."""
+    width, height = ship_factory.board_size
+    counts = np.zeros((height, width))
+    for _ in range(number_of_fleets):
+        for ship in ship_factory.generate_ships():
+            for x, y in ship.cells:
+                counts[y - 1, x - 1] += 1
+    return counts / number_of_fleets
+
+
+def main(number_of_fleets=20000):
+    start = time.perf_counter()
+    exact = ShipFactory().cell_marginals()
+    count = ShipFactory().count_layouts()
+    print(f"{count} layouts of the default fleet on a 10x10 board "
+          f"({time.perf_counter() - start:.1f} s, cached on disk afterwards)")
+
+    for uniform in (False, True):
+        ship_factory = ShipFactory(uniform=uniform)
+        start = time.perf_counter()
+        empirical = occupancy(ship_factory, number_of_fleets)
+        elapsed = time.perf_counter() - start
+        # Standard error of each cell estimate, to tell bias from noise
+        noise = np.sqrt(exact * (1 - exact) / number_of_fleets).max()
+        print(f"uniform={uniform!s:5}: max |empirical - exact| = "
+              f"{np.abs(empirical - exact).max():.4f} "
+              f"(noise ~{noise:.4f}), "
+              f"{elapsed / number_of_fleets * 1e6:.0f} us per fleet")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,43 @@
+""" Time saved by a LayoutPool when creating many players.
+
+Creates RandomPlayers (each of which builds its own Board) with and without
+Board.layout_pool set, and reports the pool's hit/miss counters.
+
+Run with: python3 -m benchmarks.bench_layout_pool [number_of_players]
+"""
+import sys
+import time
+
+from battleship.board import Board
+from battleship.player import AutomaticPlayer, RandomPlayer
+from battleship.pool import LayoutPool
+
+
+def timed(number_of_players):
+    start = time.perf_counter()
+    for _ in range(number_of_players // 2):
+        RandomPlayer()
+        AutomaticPlayer()
+    return (time.perf_counter() - start) / number_of_players
+
+
+def main(number_of_players=20000):
+    without_pool = timed(number_of_players)
+
+    for uses_per_layout in (1, None):
+        pool = LayoutPool(uses_per_layout=uses_per_layout)
+        Board.layout_pool = pool
+        try:
+            with_pool = timed(number_of_players)
+        finally:
+            Board.layout_pool = None
+        print(f"uses_per_layout={uses_per_layout}")
+        print(f"  without pool : {without_pool * 1e6:8.1f} us per player")
+        print(f"  with pool    : {with_pool * 1e6:8.1f} us per player "
+              f"({without_pool / with_pool:.1f}x)")
+        print(f"  hits {pool.hits}, misses {pool.misses}, "
+              f"{pool.generation_time:.2f} s spent generating layouts")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,33 @@
+""" Throughput of ParallelFleetGenerator for different numbers of processes.
+
+Also checks that every run produced exactly the same fleets.
+
+Run with: python3 -m benchmarks.bench_parallel_generation [number_of_fleets]
+"""
+import hashlib
+import multiprocessing
+import sys
+import time
+
+from battleship.parallel import ParallelFleetGenerator
+
+
+def main(number_of_fleets=2_000_000):
+    digests = set()
+    processes = 0
+    while processes <= multiprocessing.cpu_count():
+        generator = ParallelFleetGenerator(seed=2024, processes=processes)
+        digest = hashlib.sha256()
+        start = time.perf_counter()
+        for _, coordinates in generator.generate(number_of_fleets):
+            digest.update(coordinates.tobytes())
+        elapsed = time.perf_counter() - start
+        digests.add(digest.hexdigest())
+        print(f"{processes:3} processes: {number_of_fleets / elapsed:12,.0f} "
+              f"fleets per second")
+        processes = max(1, 2 * processes)
+    print("identical output:", len(digests) == 1)
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,77 @@
+""" Sampling throughput of PosteriorSampler, and games of PosteriorPlayer.
+
+Prints the layouts per second PosteriorSampler draws in the middle of a
+game (with misses, a sunk ship and a hit to agree with) for different
+numbers of processes, then the mean number of moves to sink the default
+fleet and the median time per decision of PosteriorPlayer for a few
+sample budgets, next to DensityPlayer.
+
+Run with: python3 -m benchmarks.bench_posterior_player [games]
+"""
+import random
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from battleship.board import Board
+from battleship.density import DensityPlayer
+from battleship.posterior import PosteriorPlayer, PosteriorSampler
+
+SHIPS_PER_LENGTH = {1: 1, 2: 1, 3: 1, 4: 1, 5: 1}
+
+
+def throughput(processes, samples=20_000):
+    blocked = np.zeros((10, 10), dtype=bool)
+    hits = np.zeros((10, 10), dtype=bool)
+    blocked[::3, ::2] = True
+    blocked[6:9, 0:4] = True
+    hits[4, 5] = True
+    afloat = {1: 1, 3: 1, 4: 1, 5: 1}
+    with PosteriorSampler(samples=samples, seed=0, chunk_size=1000,
+                          processes=processes) as sampler:
+        # Start the workers before timing
+        sampler.tally((10, 10), afloat, blocked, hits)
+        start = time.perf_counter()
+        _, drawn = sampler.tally((10, 10), afloat, blocked, hits)
+        return drawn / (time.perf_counter() - start)
+
+
+def play(make_player, games):
+    moves = []
+    times = []
+    for seed in range(games):
+        target = Board()
+        player = make_player(seed)
+        count = 0
+        while not target.have_all_ships_sunk():
+            start = time.perf_counter()
+            cell = player.select_target()
+            times.append(time.perf_counter() - start)
+            player.receive_result(*target.is_attacked_at(cell))
+            count += 1
+        moves.append(count)
+    return statistics.mean(moves), statistics.median(times)
+
+
+def main(games=20):
+    random.seed(0)
+    for processes in (0, 1, 2, 4):
+        print(f"{processes} processes: {throughput(processes):10.0f} "
+              f"layouts per second")
+
+    print(f"\n{'player':<24} {'moves':>6} {'median ms':>10}")
+    players = [('DensityPlayer', lambda seed: DensityPlayer(seed=seed))]
+    for samples in (50, 200, 1000):
+        players.append((f'PosteriorPlayer({samples})',
+                        lambda seed, samples=samples: PosteriorPlayer(
+                            seed=seed, sampler=PosteriorSampler(
+                                samples=samples, seed=seed))))
+    for name, make_player in players:
+        moves, median = play(make_player, games)
+        print(f"{name:<24} {moves:6.1f} {median * 1e3:10.3f}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,53 @@
+""" Latency of each move of RandomPlayer over a whole game.
+
+RandomPlayer used to draw random coordinates until it found a cell it had
+not attacked yet, which takes more and more draws as the board fills up.
+It now draws from a lazily shuffled permutation of the cells. This plays
+every cell of large boards with both, and prints the mean and worst time
+of a move in each tenth of the game.
+
+Run with: python3 -m benchmarks.bench_random_player [board_side]
+"""
+import random
+import sys
+import time
+
+from battleship.board import Board
+from battleship.player import RandomPlayer
+
+
+def legacy_target(player):
+    """ Previous RandomPlayer.generate_random_target, for comparison only."""
+    while True:
+        cell = player.get_random_coordinates()
+        if cell not in player.tracker:
+            return cell
+
+
+def play(side, legacy):
+    player = RandomPlayer(board=Board(size=(side, side)), seed=0)
+    times = []
+    for _ in range(side * side):
+        start = time.perf_counter()
+        if legacy:
+            player.tracker.add(legacy_target(player))
+        else:
+            player.select_target()
+        times.append(time.perf_counter() - start)
+    tenth = len(times) // 10
+    return [times[i:i + tenth] for i in range(0, tenth * 10, tenth)]
+
+
+def main(side=300):
+    random.seed(0)
+    for name, legacy in (('permutation', False), ('retry', True)):
+        tenths = play(side, legacy)
+        print(f"{name:>11}, {side}x{side}, us per move by tenth of the game")
+        print('       mean ' + ' '.join(f'{sum(part) / len(part) * 1e6:7.1f}'
+                                        for part in tenths))
+        print('      worst ' + ' '.join(f'{max(part) * 1e6:7.1f}'
+                                        for part in tenths))
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
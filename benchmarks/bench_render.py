@@ -0,0 +1,69 @@
+""" Cost of drawing a board after every shot, as Game.play does.
+
+Compares, over a whole game on boards of different sizes:
+- the previous Board.print, rebuilding the whole frame every time
+- Board.print, only rebuilding the rows that changed
+- Board.print(in_place=True) on a terminal, only patching changed cells
+Output goes to an in-memory stream, so the bytes written are what a real
+terminal would have to process.
+
+Run with: python3 -m benchmarks.bench_render
+"""
+import io
+import random
+import time
+
+from battleship.board import Board
+from battleship.render import BoardRenderer
+
+
+class FakeTerminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+def legacy_print(board, stream):
+    """ Previous Board.print, kept here for comparison only."""
+    array_board = board._build_array(show_ships=False)
+    stream.write(board._array_to_str(array_board) + '\n')
+
+
+def play(board_size, draw):
+    board = Board(size=board_size, ships_per_length={
+        length: max(1, board_size[0] * board_size[1] // 1500) 
+        for length in range(1, 6)})
+    cells = [(x, y) for x in range(1, board_size[0] + 1) 
+             for y in range(1, board_size[1] + 1)]
+    random.Random(0).shuffle(cells)
+    stream = FakeTerminal()
+    start = time.perf_counter()
+    for cell in cells:
+        draw(board, stream)
+        board.is_attacked_at(cell)
+    return (time.perf_counter() - start) / len(cells), len(stream.getvalue()) / len(cells)
+
+
+def main():
+    for board_size in ((10, 10), (26, 26), (60, 60)):
+        renderers = {}
+
+        def renderer(board, stream):
+            if board not in renderers:
+                renderers[board] = BoardRenderer(board, stream)
+            return renderers[board]
+
+        results = {
+            "previous print": play(board_size, legacy_print),
+            "Board.print": play(board_size, lambda board, stream: 
+                                renderer(board, stream).draw()),
+            "in place": play(board_size, lambda board, stream: 
+                             renderer(board, stream).draw(in_place=True)),
+        }
+        print(f"{board_size[0]}x{board_size[1]} board")
+        for name, (elapsed, size) in results.items():
+            print(f"  {name:15} {elapsed * 1e6:9.1f} us {size:10,.0f} "
+                  f"characters per draw")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+""" Speed benchmark for generating random fleets with ShipFactory.
+
+Compares ShipFactory.generate_ships (placement tables + masks) against a
+copy of the previous rejection sampler, which built a throwaway set-based
+Ship for every attempt and was retried by Board until a whole fleet was
+valid. Also times the batched ShipFactory.generate_fleets.
+
+Run with: python3 -m benchmarks.bench_ship_generation [number_of_fleets]
+"""
+import random
+import sys
+import time
+
+from battleship.ship import ShipFactory
+
+
+class LegacyShip:
+    """ Set-based Ship as it used to be, kept here for comparison only."""
+    def __init__(self, start, end):
+        self.x_start, self.x_end = sorted((start[0], end[0]))
+        self.y_start, self.y_end = sorted((start[1], end[1]))
+        if self.x_start != self.x_end and self.y_start != self.y_end:
+            raise ValueError("The ship needs to be horizontal or vertical.")
+        self.cells = self.get_cells()
+        self.damaged_cells = set()
+
+    def get_cells(self):
+        if self.y_start == self.y_end:
+            return {(x, self.y_start)
+                    for x in range(self.x_start, self.x_end + 1)}
+        return {(self.x_start, y) for y in range(self.y_start, self.y_end + 1)}
+
+    def is_near_cell(self, cell):
+        return (self.x_start - 1 <= cell[0] <= self.x_end + 1
+                and self.y_start - 1 <= cell[1] <= self.y_end + 1)
+
+    def is_near_ship(self, other_ship):
+        return any(self.is_near_cell(cell) for cell in other_ship.get_cells())
+
+
+def legacy_generate_ships(ships_per_length):
+    """ Previous ShipFactory.generate_ships, kept here for comparison only."""
+    ships = []
+    ship_cells = set()
+    for ship_length, ship_quantity in sorted(ships_per_length.items(),
+                                             reverse=True):
+        for _ in range(ship_quantity):
+            attempts = 0
+            while attempts < 100:
+                attempts += 1
+                if random.choice(['horizontal', 'vertical']) == 'horizontal':
+                    x_start = random.randint(1, 10 - ship_length)
+                    y_start = random.randint(1, 10)
+                    x_end, y_end = x_start + ship_length - 1, y_start
+                else:
+                    x_start = random.randint(1, 10)
+                    y_start = random.randint(1, 10 - ship_length)
+                    x_end, y_end = x_start, y_start + ship_length - 1
+
+                new_ship = LegacyShip((x_start, y_start), (x_end, y_end))
+                new_ship_cells = new_ship.get_cells()
+                if any(cell in ship_cells for cell in new_ship_cells):
+                    continue
+                if any(new_ship.is_near_ship(ship) for ship in ships):
+                    continue
+                ships.append(new_ship)
+                ship_cells.update(new_ship_cells)
+                break
+            else:
+                raise RuntimeError("Unable to place ship")
+    return ships
+
+
+def legacy_generate_fleet(ships_per_length):
+    """ Retry loop that Board used to wrap around the legacy factory."""
+    while True:
+        try:
+            return legacy_generate_ships(ships_per_length)
+        except RuntimeError:
+            pass
+
+
+def timed(function, number_of_fleets):
+    start = time.perf_counter()
+    for _ in range(number_of_fleets):
+        function()
+    return (time.perf_counter() - start) / number_of_fleets
+
+
+def main(number_of_fleets=5000):
+    specs = {
+        "default": {1: 1, 2: 1, 3: 1, 4: 1, 5: 1},
+        "crowded": {1: 2, 2: 2, 3: 2, 4: 2, 5: 1},
+    }
+    for name, ships_per_length in specs.items():
+        factory = ShipFactory(ships_per_length=ships_per_length)
+        legacy = timed(lambda: legacy_generate_fleet(ships_per_length),
+                       number_of_fleets)
+        current = timed(factory.generate_ships, number_of_fleets)
+        print(f"{name:8} fleet {ships_per_length}")
+        print(f"  legacy sampler : {legacy * 1e6:8.1f} us per fleet")
+        print(f"  ShipFactory    : {current * 1e6:8.1f} us per fleet")
+        print(f"  speed-up       : {legacy / current:8.1f}x")
+        start = time.perf_counter()
+        factory.generate_fleets(100 * number_of_fleets)
+        batched = (time.perf_counter() - start) / (100 * number_of_fleets)
+        print(f"  generate_fleets: {batched * 1e6:8.1f} us per fleet "
+              f"({1 / batched:,.0f} fleets per second)")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
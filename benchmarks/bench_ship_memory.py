@@ -0,0 +1,61 @@
+""" Memory benchmark for holding many fleets of Ship instances alive.
+
+Compares the current Ship (shared ShipGeometry + per-ship damage mask)
+against a copy of the previous Ship layout (per-instance __dict__, a set of
+cells and a set of damaged cells).
+
+Run with: python3 -m benchmarks.bench_ship_memory [number_of_fleets]
+"""
+import sys
+import tracemalloc
+
+from battleship.ship import Ship, ShipFactory
+
+
+class LegacyShip:
+    """ Ship as it used to be stored, kept here for comparison only."""
+    def __init__(self, start, end):
+        self.x_start, self.x_end = sorted((start[0], end[0]))
+        self.y_start, self.y_end = sorted((start[1], end[1]))
+        if self.y_start == self.y_end:
+            self.cells = {(x, self.y_start)
+                          for x in range(self.x_start, self.x_end + 1)}
+        else:
+            self.cells = {(self.x_start, y)
+                          for y in range(self.y_start, self.y_end + 1)}
+        self.damaged_cells = set()
+
+
+def measure(ship_class, layouts, number_of_fleets):
+    """ Build number_of_fleets fleets and return the bytes they hold."""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    fleets = []
+    for i in range(number_of_fleets):
+        layout = layouts[i % len(layouts)]
+        fleets.append([ship_class(start, end) for start, end in layout])
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return after - before
+
+
+def main(number_of_fleets=20000):
+    factory = ShipFactory()
+    layouts = []
+    for _ in range(500):
+        layouts.append([((ship.x_start, ship.y_start), (ship.x_end, ship.y_end))
+                        for ship in factory.generate_ships()])
+
+    legacy = measure(LegacyShip, layouts, number_of_fleets)
+    current = measure(Ship, layouts, number_of_fleets)
+
+    print(f"{number_of_fleets} fleets of {len(layouts[0])} ships")
+    print(f"  legacy Ship : {legacy / 2**20:8.1f} MiB "
+          f"({legacy / number_of_fleets:7.0f} B per fleet)")
+    print(f"  Ship        : {current / 2**20:8.1f} MiB "
+          f"({current / number_of_fleets:7.0f} B per fleet)")
+    print(f"  reduction   : {legacy / current:8.1f}x")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
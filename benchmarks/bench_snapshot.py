@@ -0,0 +1,51 @@
+""" Cost of trying hypothetical shots on a board and rolling them back.
+
+Compares copy.deepcopy of a board (the only option before snapshots) with
+snapshot() + restore(), around 0, 1 and 5 hypothetical shots, on default
+boards halfway through a game.
+
+Run with: python3 -m benchmarks.bench_snapshot [repeats]
+"""
+import copy
+import random
+import sys
+import time
+
+from battleship.array_board import ArrayBoard
+from battleship.bitboard import BitBoardAdapter
+from battleship.board import Board
+
+
+def half_played(board_class):
+    board = board_class()
+    cells = [(x, y) for x in range(1, 11) for y in range(1, 11)]
+    random.Random(0).shuffle(cells)
+    for cell in cells[:50]:
+        board.is_attacked_at(cell)
+    return board, cells[50:]
+
+
+def main(repeats=20000):
+    for board_class in (Board, BitBoardAdapter, ArrayBoard):
+        board, remaining = half_played(board_class)
+        start = time.perf_counter()
+        for _ in range(repeats // 20):
+            copy.deepcopy(board)
+        deepcopy_time = (time.perf_counter() - start) / (repeats // 20)
+        print(f"{board_class.__name__}: deepcopy {deepcopy_time * 1e6:8.1f} us")
+
+        for number_of_shots in (0, 1, 5):
+            shots = remaining[:number_of_shots]
+            start = time.perf_counter()
+            for _ in range(repeats):
+                token = board.snapshot()
+                for cell in shots:
+                    board.is_attacked_at(cell)
+                board.restore(token)
+            elapsed = (time.perf_counter() - start) / repeats
+            print(f"  snapshot + {number_of_shots} shots + restore "
+                  f"{elapsed * 1e6:8.2f} us")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,64 @@
+""" Cost of boards that are mostly empty ocean.
+
+For square boards up to 100,000x100,000 cells, each with a default fleet,
+measures the time to:
+- create an AutomaticPlayer (the previous one listed every cell up front)
+- play a few hundred of its shots
+- print a 20x20 viewport around a ship, against printing the whole board
+  (only attempted while the board is small enough)
+
+Run with: python3 -m benchmarks.bench_sparse_board [number_of_shots]
+"""
+import io
+import random
+import sys
+import time
+
+from battleship.board import Board
+from battleship.player import AutomaticPlayer
+from battleship.render import BoardRenderer
+
+
+def main(number_of_shots=300):
+    random.seed(0)
+    for side in (100, 1000, 10_000, 100_000):
+        board = Board(size=(side, side))
+        target = Board(size=(side, side))
+
+        if side <= 1000:
+            start = time.perf_counter()
+            [(x, y) for x in range(1, side + 1) for y in range(1, side + 1)]
+            listing = f"{(time.perf_counter() - start) * 1e3:9.2f} ms"
+        else:
+            listing = "    skipped"
+        start = time.perf_counter()
+        player = AutomaticPlayer(board=board)
+        create = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(number_of_shots):
+            player.receive_result(*target.is_attacked_at(
+                player.select_target()))
+        shots = (time.perf_counter() - start) / number_of_shots
+
+        ship = target.ships[0]
+        viewport = (ship.x_start - 5, ship.y_start - 5, 20, 20)
+        start = time.perf_counter()
+        BoardRenderer(target, io.StringIO()).draw(show_ships=True,
+                                                  viewport=viewport)
+        view = time.perf_counter() - start
+        if side <= 1000:
+            start = time.perf_counter()
+            BoardRenderer(target, io.StringIO()).draw(show_ships=True)
+            whole = f"{(time.perf_counter() - start) * 1e3:9.2f} ms"
+        else:
+            whole = "    skipped"
+
+        print(f"{side}x{side}: list every cell {listing}, "
+              f"AutomaticPlayer() {create * 1e3:7.3f} ms, "
+              f"shot {shots * 1e6:7.1f} us, "
+              f"20x20 viewport {view * 1e3:6.2f} ms, whole board {whole}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
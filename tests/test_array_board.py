@@ -0,0 +1,103 @@
+import random
+
+import numpy as np
+
+from battleship.array_board import ArrayBoard
+from battleship.board import Board
+from battleship.game import Game
+from battleship.player import AutomaticPlayer, RandomPlayer
+from battleship.ship import Ship
+from tests.test_board import check_snapshots
+
+def copy_ships(ships):
+    return [Ship.from_geometry(ship.geometry) for ship in ships]
+
+def test_array_board_matches_board():
+    rng = random.Random(0)
+    for _ in range(20):
+        board = Board(size=(8, 7), ships_per_length={1: 2, 2: 2, 3: 1})
+        array_board = ArrayBoard(ships=copy_ships(board.ships), size=(8, 7), 
+                                 ships_per_length={1: 2, 2: 2, 3: 1})
+        other_array_board = ArrayBoard(ships=copy_ships(board.ships), 
+                                       size=(8, 7), 
+                                       ships_per_length={1: 2, 2: 2, 3: 1})
+        # Including repeated cells
+        cells = [(rng.randint(1, 8), rng.randint(1, 7)) for _ in range(80)]
+
+        expected = [board.is_attacked_at(cell) for cell in cells]
+        assert [array_board.is_attacked_at(cell) for cell in cells] == expected
+        is_ship_hit, has_ship_sunk = other_array_board.attack_many(cells)
+        assert list(zip(is_ship_hit.tolist(), has_ship_sunk.tolist())) == expected
+
+        for other in (array_board, other_array_board):
+            assert other.ships_remaining == board.ships_remaining
+            assert other.cells_remaining == board.cells_remaining
+            assert other.have_all_ships_sunk() == board.have_all_ships_sunk()
+            assert ([ship.damaged_cells for ship in other.ships] 
+                    == [ship.damaged_cells for ship in board.ships])
+            assert other._build_array(True) == board._build_array(True)
+
+def test_attack_many_in_chunks():
+    board = ArrayBoard()
+    cells = [(x, y) for y in range(1, 11) for x in range(1, 11)]
+    random.Random(1).shuffle(cells)
+    sunk = 0
+    for start in range(0, 100, 7):
+        is_ship_hit, has_ship_sunk = board.attack_many(cells[start:start + 7])
+        sunk += int((is_ship_hit & has_ship_sunk).sum())
+    assert sunk == 5
+    assert board.have_all_ships_sunk()
+    assert board.cells_remaining == 0
+    assert len(board.marked_cells) == 100
+
+    # Cells off the board are misses
+    is_ship_hit, has_ship_sunk = board.attack_many([(0, 1), (11, 3)])
+    assert not is_ship_hit.any() and not has_ship_sunk.any()
+    assert board.is_attacked_at((5, 0)) == (False, False)
+
+def test_attack_many_off_board():
+    # Shots off the board stand for cell (1, 1) internally
+    ships = [Ship(start=(1, 1), end=(1, 1)), Ship(start=(3, 1), end=(3, 2))]
+    cells = [(0, 5), (1, 1), (9, 9), (3, 1), (1, 1), (3, 2)]
+    board = Board(ships=copy_ships(ships), size=(4, 4), 
+                  ships_per_length={1: 1, 2: 1})
+    expected = [board.is_attacked_at(cell) for cell in cells]
+    array_board = ArrayBoard(ships=copy_ships(ships), size=(4, 4), 
+                             ships_per_length={1: 1, 2: 1})
+    is_ship_hit, has_ship_sunk = array_board.attack_many(cells)
+    assert list(zip(is_ship_hit.tolist(), has_ship_sunk.tolist())) == expected
+    assert array_board.hit_points.tolist() == [0, 0]
+    assert array_board.ships_remaining == 0
+    assert array_board.cells_remaining == 0
+    assert array_board.have_all_ships_sunk()
+
+def test_array_board_game():
+    alice = RandomPlayer(name="Alice")
+    alice.board = ArrayBoard()
+    bob = AutomaticPlayer(name="Bob")
+    bob.board = ArrayBoard()
+    bob.board.name = "Robot"
+    Game(player1=alice, player2=bob).play()
+    assert alice.has_lost() or bob.has_lost()
+
+def test_array_board_snapshot_restore():
+    check_snapshots(ArrayBoard(size=(6, 6), 
+                               ships_per_length={1: 2, 2: 1, 3: 1}))
+
+    # A batch of shots is undone in one step
+    board = ArrayBoard()
+    before = (board.shots.copy(), board.hit_points.copy())
+    token = board.snapshot()
+    board.attack_many([(x, y) for x in range(1, 11) for y in (1, 2, 1)])
+    board.is_attacked_at((5, 5))
+    board.restore(token)
+    assert (board.shots == before[0]).all()
+    assert (board.hit_points == before[1]).all()
+    assert board.cells_remaining == 15 and board.ships_remaining == 5
+
+if __name__ == "__main__":
+    test_array_board_matches_board()
+    test_attack_many_in_chunks()
+    test_attack_many_off_board()
+    test_array_board_game()
+    test_array_board_snapshot_restore()
\ No newline at end of file
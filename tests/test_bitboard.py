@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from battleship.bitboard import (BitBoard, BitBoardAdapter, halo, neighbours, 
+                                 shift_down, shift_left, shift_right, 
+                                 shift_up)
+from battleship.board import Board
+from battleship.game import Game
+from battleship.player import AutomaticPlayer, RandomPlayer
+from battleship.ship import Ship
+from tests.test_board import check_snapshots
+
+def to_mask(cells, width):
+    mask = 0
+    for x, y in cells:
+        mask |= 1 << ((y - 1) * width + x - 1)
+    return mask
+
+def test_shifts_and_halo():
+    width, height = 7, 5
+    rng = random.Random(0)
+    for _ in range(50):
+        cells = {(rng.randint(1, width), rng.randint(1, height)) 
+                 for _ in range(4)}
+        mask = to_mask(cells, width)
+
+        def moved(dx, dy):
+            return to_mask({(x + dx, y + dy) for x, y in cells 
+                            if 0 < x + dx <= width and 0 < y + dy <= height}, 
+                           width)
+
+        assert shift_left(mask, width, height) == moved(-1, 0)
+        assert shift_right(mask, width, height) == moved(1, 0)
+        assert shift_up(mask, width, height) == moved(0, -1)
+        assert shift_down(mask, width, height) == moved(0, 1)
+
+        around = {(x + dx, y + dy) for x, y in cells 
+                  for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                  if 0 < x + dx <= width and 0 < y + dy <= height}
+        assert halo(mask, width, height) == to_mask(around, width)
+        assert neighbours(mask, width, height) == to_mask(around - cells, 
+                                                          width)
+
+def test_bitboard_validation():
+    ships = [Ship(start=(3, 1), end=(3, 5)), Ship(start=(5, 2), end=(6, 2)), 
+             Ship(start=(4, 6), end=(4, 6))]
+    bit_board = BitBoard.from_ships(ships)
+    assert bit_board.are_ships_too_close()
+    assert bit_board.find_ships_too_close() == [(0, 2)]
+    assert not BitBoard.from_ships(ships[:2]).are_ships_too_close()
+    with pytest.raises(ValueError):
+        BitBoard.from_ships([Ship(start=(9, 1), end=(11, 1))])
+
+def test_bitboard_matches_board():
+    rng = random.Random(1)
+    for _ in range(20):
+        board = Board()
+        adapter = BitBoardAdapter(ships=[Ship.from_geometry(ship.geometry) 
+                                         for ship in board.ships])
+        for _ in range(90):
+            cell = (rng.randint(1, 10), rng.randint(1, 10))
+            assert adapter.is_attacked_at(cell) == board.is_attacked_at(cell)
+            assert adapter.have_all_ships_sunk() == board.have_all_ships_sunk()
+        assert adapter.ships_remaining == board.ships_remaining
+        assert adapter.cells_remaining == board.cells_remaining
+        assert adapter.marked_cells == board.marked_cells
+        assert ([ship.damaged_cells for ship in adapter.ships] 
+                == [ship.damaged_cells for ship in board.ships])
+        assert adapter._build_array(True) == board._build_array(True)
+
+def test_bitboard_game():
+    alice = RandomPlayer(name="Alice")
+    alice.board = BitBoardAdapter()
+    bob = AutomaticPlayer(name="Bob")
+    bob.board = BitBoardAdapter()
+    Game(player1=alice, player2=bob).play()
+    assert alice.has_lost() or bob.has_lost()
+
+def test_bitboard_snapshot_restore():
+    check_snapshots(BitBoardAdapter(size=(6, 6), 
+                                    ships_per_length={1: 2, 2: 1, 3: 1}))
+
+if __name__ == "__main__":
+    test_shifts_and_halo()
+    test_bitboard_validation()
+    test_bitboard_matches_board()
+    test_bitboard_game()
+    test_bitboard_snapshot_restore()
\ No newline at end of file
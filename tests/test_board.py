@@ -1,3 +1,7 @@
+import random
+
+import pytest
+
 from battleship.board import Board
 from battleship.ship import Ship
 
@@ -18,6 +22,120 @@ def test_board():
     assert is_ship_hit == True
     assert has_ship_sunk == False
 
+def test_find_ship_conflicts():
+    ships = [
+        Ship(start=(3, 1), end=(3, 5)),
+        Ship(start=(4, 5), end=(6, 5)),   # diagonal to ship 0's end: too close
+        Ship(start=(9, 1), end=(9, 3)),
+        Ship(start=(8, 3), end=(10, 3)),  # overlaps ship 2
+        Ship(start=(1, 10), end=(1, 11)), # off the board
+        Ship(start=(6, 9), end=(6, 9)),
+    ]
+    board = Board(ships=ships, should_validate=False)
+    out_of_bounds, too_close = board.find_ship_conflicts()
+    assert out_of_bounds == [4]
+    assert too_close == [(0, 1), (2, 3)]
+    assert board.are_ships_too_close()
+    assert not board.are_ships_within_bounds()
+
+    with pytest.raises(ValueError, match="beyond the bounds"):
+        board.validate_ships()
+    board.ships = ships[:4]
+    # Only assigning changes the ships, so that the index follows
+    assert board.ships == tuple(ships[:4])
+    board.ships_per_length = {3: 3, 5: 1}
+    with pytest.raises(ValueError, match=r"Ship\(start=\(9,1\), end=\(9,3\)\) and"):
+        board.validate_ships()
+
+def test_find_ship_conflicts_large_fleet():
+    # One 1x1 ship every other cell of every other row: all far enough apart
+    ships = [Ship(start=(x, y), end=(x, y)) 
+             for x in range(1, 400, 2) for y in range(1, 400, 2)]
+    board = Board(ships=ships, size=(400, 400), should_validate=False)
+    assert board.find_ship_conflicts() == ([], [])
+    board.ships += (Ship(start=(2, 2), end=(2, 2)),)
+    assert len(board.find_ship_conflicts()[1]) == 4
+
+def test_is_attacked_at_after_changing_ships():
+    board = Board()
+    board.ships = [Ship(start=(2, 2), end=(2, 3)), Ship(start=(5, 5), end=(5, 5))]
+    assert board.get_ship_at((2, 3)) is board.ships[0]
+    assert board.get_ship_at((1, 1)) is None
+    assert board.is_attacked_at((1, 1)) == (False, False)
+    assert board.is_attacked_at((2, 2)) == (True, False)
+    assert board.is_attacked_at((2, 2)) == (True, False)
+    assert board.is_attacked_at((2, 3)) == (True, True)
+    assert board.is_attacked_at((5, 5)) == (True, True)
+    assert board.have_all_ships_sunk()
+
+def test_remaining_counters():
+    board = Board(ships=[Ship(start=(2, 2), end=(2, 3)), 
+                         Ship(start=(5, 5), end=(7, 5))], 
+                  should_validate=False)
+    assert (board.ships_remaining, board.cells_remaining) == (2, 5)
+    board.is_attacked_at((1, 1))
+    board.is_attacked_at((2, 2))
+    board.is_attacked_at((2, 2))  # Repeated hits do not count twice
+    assert (board.ships_remaining, board.cells_remaining) == (2, 4)
+    board.is_attacked_at((2, 3))
+    board.is_attacked_at((2, 3))
+    assert (board.ships_remaining, board.cells_remaining) == (1, 3)
+    for x in (5, 6, 7, 7):
+        board.is_attacked_at((x, 5))
+    assert (board.ships_remaining, board.cells_remaining) == (0, 0)
+    assert board.have_all_ships_sunk()
+
+    # Counts start from the damage the ships already have
+    ship = Ship(start=(1, 1), end=(1, 2))
+    ship.receive_damage((1, 1))
+    board.ships = [ship]
+    assert (board.ships_remaining, board.cells_remaining) == (1, 1)
+
+def state(board):
+    return (set(board.marked_cells), board.ships_remaining, 
+            board.cells_remaining, board.have_all_ships_sunk(), 
+            [ship.damage_mask for ship in board.ships])
+
+def check_snapshots(board):
+    """ Shoot at random, and check restore() against the states seen."""
+    rng = random.Random(0)
+    tokens = [(board.snapshot(), state(board))]
+    for _ in range(120):
+        board.is_attacked_at((rng.randint(1, board.width), 
+                              rng.randint(1, board.height)))
+        if rng.random() < 0.2:
+            tokens.append((board.snapshot(), state(board)))
+    assert board.have_all_ships_sunk()
+    for token, expected in reversed(tokens):
+        board.restore(token)
+        assert state(board) == expected
+    with pytest.raises(ValueError):
+        board.restore(tokens[-1][0])
+
+    # A snapshot taken before undo() is stale once new attacks are made
+    board.is_attacked_at((1, 1))
+    token = board.snapshot()
+    board.undo()
+    assert state(board) == tokens[0][1]
+    board.is_attacked_at((2, 2))
+    with pytest.raises(ValueError):
+        board.restore(token)
+    board.restore(tokens[0][0])
+    assert state(board) == tokens[0][1]
+    # So is one taken before the ships changed
+    board.ships = board.ships
+    with pytest.raises(ValueError):
+        board.restore(tokens[0][0])
+    with pytest.raises(IndexError):
+        board.undo()
+
+def test_snapshot_restore():
+    check_snapshots(Board(size=(6, 6), ships_per_length={1: 2, 2: 1, 3: 1}))
 
 if __name__ == "__main__":
-    test_board()
\ No newline at end of file
+    test_board()
+    test_find_ship_conflicts()
+    test_find_ship_conflicts_large_fleet()
+    test_is_attacked_at_after_changing_ships()
+    test_remaining_counters()
+    test_snapshot_restore()
\ No newline at end of file
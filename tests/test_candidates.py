@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from battleship.board import Board
+from battleship.candidates import CandidateCells
+from battleship.player import AutomaticPlayer
+from battleship.ship import Ship
+
+def test_candidate_cells_match_list():
+    width, height = 7, 5
+    cells = [(x, y) for x in range(1, width + 1) for y in range(1, height + 1)]
+    candidates = CandidateCells(width, height)
+    assert list(candidates) == cells
+    rng = random.Random(0)
+    for cell in rng.sample(cells, 25):
+        cells.remove(cell)
+        candidates.remove(cell)
+        assert len(candidates) == len(cells)
+        assert sorted(candidates) == cells
+        assert [candidates[index] for index in range(-len(cells), 0)] == list(
+            candidates)
+        assert rng.choice(candidates) in cells
+    assert all((cell in candidates) == (cell in cells)
+               for cell in [(0, 1), (8, 1), (1, 6), None] + cells)
+
+    with pytest.raises(ValueError):
+        candidates.remove(cell)
+    with pytest.raises(IndexError):
+        candidates[len(cells)]
+
+    # Slots past the candidates are dropped, so once every cell is removed
+    # no slot is stored, only where each of the 35 cells went
+    for cell in cells:
+        candidates.remove(cell)
+    assert not candidates and candidates.cell_at == {}
+    assert len(candidates.slot_of) == width * height
+
+def test_random_choice_is_uniform():
+    candidates = CandidateCells(4, 4)
+    for cell in [(1, 1), (2, 3), (4, 4), (3, 1)]:
+        candidates.remove(cell)
+    rng = random.Random(0)
+    counts = {}
+    for _ in range(12_000):
+        cell = rng.choice(candidates)
+        counts[cell] = counts.get(cell, 0) + 1
+    assert len(counts) == 12
+    assert all(800 < count < 1200 for count in counts.values())
+
+def test_automatic_player_on_huge_board():
+    ship = Ship((1, 1), (5, 1))
+    board = Board(ships=[ship], size=(100_000, 100_000),
+                  ships_per_length={5: 1})
+    player = AutomaticPlayer(board=board)
+    # No cell is listed up front
+    candidates = player.possible_cells
+    assert len(candidates) == 100_000 * 100_000
+    assert not candidates.cell_at and not candidates.slot_of
+    random.seed(0)
+    targets = set()
+    for _ in range(100):
+        player.receive_result(False, False)
+        targets.add(player.select_target())
+    assert len(targets) == 100
+    assert len(candidates) == 100_000 * 100_000 - 100
+    assert not any(cell in candidates for cell in targets)
+    # Each removal stores at most one slot and where two cells went
+    assert len(candidates.cell_at) <= 100 and len(candidates.slot_of) <= 200
+
+if __name__ == "__main__":
+    test_candidate_cells_match_list()
+    test_random_choice_is_uniform()
+    test_automatic_player_on_huge_board()
@@ -0,0 +1,133 @@
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from battleship.array_board import ArrayBoard
+from battleship.board import Board
+from battleship.corpus import (CorpusWriter, LayoutCorpus, decode_layout,
+                               encode_layouts, record_size)
+from battleship.ship import ShipFactory
+
+def layout(board):
+    return [[ship.x_start, ship.y_start, ship.x_end, ship.y_end]
+            for ship in board.ships]
+
+def test_record_round_trip():
+    ships_per_length = {3: 1, 1: 2}
+    coordinates = [[(1, 1, 1, 1), (3, 1, 3, 1), (5, 2, 5, 4)]]
+    record = encode_layouts((6, 7), ships_per_length, coordinates)
+    assert len(record) == record_size(ships_per_length) == 40
+
+    board_size, decoded_ships_per_length, decoded = decode_layout(record)
+    assert board_size == (6, 7)
+    assert decoded_ships_per_length == ships_per_length
+    assert decoded.tolist() == [list(ship) for ship in coordinates[0]]
+
+    # Values that do not fit in 16-bit words are not wrapped around
+    with pytest.raises(ValueError):
+        encode_layouts((70000, 7), {1: 1}, [[(1, 1, 1, 1)]])
+    with pytest.raises(ValueError):
+        encode_layouts((6, 7), {1: 1}, [[(70000, 1, 70000, 1)]])
+    with pytest.raises(ValueError):
+        encode_layouts((6, 7), {1: 1}, [[(-1, 1, -1, 1)]])
+
+    # Layouts that are not the fleet given would shift every later record
+    for ships_per_length, coordinates in [
+            ({1: 2}, [[(1, 1, 1, 1)]]),
+            ({1: 1}, [[(1, 1, 1, 1), (3, 1, 3, 1)]]),
+            ({3: 1, 1: 2}, [[(1, 1, 1, 1), (3, 1, 3, 1), (5, 2, 5, 5)]]),
+            ({2: 1}, [[(1, 1, 2, 2)]])]:
+        with pytest.raises(ValueError):
+            encode_layouts((6, 7), ships_per_length, coordinates)
+    # In any order, with lengths that do not appear
+    assert encode_layouts((6, 7), {1: 2, 3: 1, 2: 0}, [[
+        (5, 4, 5, 2), (1, 1, 1, 1), (3, 1, 3, 1)]])
+
+def test_corpus(tmp_path):
+    path = os.path.join(tmp_path, 'layouts.bin')
+    rng = np.random.default_rng(0)
+    _, small = ShipFactory(board_size=(6, 6), ships_per_length={1: 1, 2: 2}
+                           ).generate_fleets(50, rng)
+    _, default = ShipFactory().generate_fleets(100, rng)
+    board = Board(size=(12, 8), ships_per_length={4: 2})
+
+    with CorpusWriter(path) as writer:
+        writer.append_layouts((6, 6), {1: 1, 2: 2}, small)
+        writer.append_board(board)
+    # Appending to an existing corpus keeps what was there
+    with CorpusWriter(path) as writer:
+        assert len(writer) == 51
+        writer.append_layouts((10, 10), {1: 1, 2: 1, 3: 1, 4: 1, 5: 1},
+                              default)
+
+    with LayoutCorpus(path) as corpus:
+        assert len(corpus) == 151
+        assert corpus.layout(3)[2].tolist() == small[3].tolist()
+        assert np.array_equal(corpus.coordinates(51), default)
+        assert np.array_equal(corpus.coordinates(0, 50), small)
+        with pytest.raises(ValueError):
+            corpus.coordinates(0, 52)
+
+        restored = corpus.board(50)
+        assert (restored.width, restored.height) == (12, 8)
+        assert restored.ships_per_length == {4: 2}
+        assert layout(restored) == layout(board)
+
+        restored = corpus.board(150, board_class=ArrayBoard)
+        assert isinstance(restored, ArrayBoard)
+        assert layout(restored) == default[-1].tolist()
+        restored.validate_ships()
+
+def test_interrupted_append(tmp_path):
+    path = os.path.join(tmp_path, 'layouts.bin')
+    _, fleets = ShipFactory().generate_fleets(20, np.random.default_rng(0))
+    with CorpusWriter(path) as writer:
+        writer.append_layouts((10, 10), {1: 1, 2: 1, 3: 1, 4: 1, 5: 1},
+                              fleets[:10])
+    size = os.path.getsize(path)
+
+    # Records written, but neither the index nor the trailer
+    writer = CorpusWriter(path)
+    writer.append_layouts((10, 10), {1: 1, 2: 1, 3: 1, 4: 1, 5: 1},
+                          fleets[10:])
+    writer.file.close()
+    assert os.path.getsize(path) > size
+    with LayoutCorpus(path) as corpus:
+        assert len(corpus) == 10
+        assert np.array_equal(corpus.coordinates(0, 10), fleets[:10])
+
+    # The next append drops the records no index refers to
+    with CorpusWriter(path) as writer:
+        assert len(writer) == 10
+        writer.append_layouts((10, 10), {1: 1, 2: 1, 3: 1, 4: 1, 5: 1},
+                              fleets[10:])
+    with LayoutCorpus(path) as corpus:
+        assert len(corpus) == 20
+        assert np.array_equal(corpus.coordinates(0, 10), fleets[:10])
+        assert np.array_equal(corpus.coordinates(10, 20), fleets[10:])
+
+    # A writer that appends nothing leaves the file as it was
+    size = os.path.getsize(path)
+    with CorpusWriter(path):
+        pass
+    assert os.path.getsize(path) == size
+
+def test_not_a_corpus(tmp_path):
+    path = os.path.join(tmp_path, 'layouts.bin')
+    with open(path, 'wb') as file:
+        file.write(b'not a corpus' * 10)
+    with pytest.raises(ValueError):
+        LayoutCorpus(path)
+    with pytest.raises(ValueError):
+        CorpusWriter(path)
+
+if __name__ == "__main__":
+    test_record_round_trip()
+    with tempfile.TemporaryDirectory() as directory:
+        test_corpus(directory)
+    with tempfile.TemporaryDirectory() as directory:
+        test_interrupted_append(directory)
+    with tempfile.TemporaryDirectory() as directory:
+        test_not_a_corpus(directory)
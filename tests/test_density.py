@@ -0,0 +1,163 @@
+import random
+
+import numpy as np
+
+from battleship.board import Board
+from battleship.density import (DensityPlayer, IncrementalDensityPlayer,
+                                PlacementCounts, placement_heatmap)
+from battleship.placement import placement_table
+from battleship.ship import Ship
+
+def count_placements(blocked, hits, ships_per_length):
+    """ placement_heatmap() listing every placement, for comparison."""
+    height, width = blocked.shape
+    heatmap = np.zeros((height, width), dtype=np.int64)
+    for length, count in ships_per_length.items():
+        for placement in placement_table((width, height), length):
+            (x_start, y_start), (x_end, y_end) = placement.start, placement.end
+            cells = np.zeros((height, width), dtype=bool)
+            cells[y_start - 1:y_end, x_start - 1:x_end] = True
+            halo = np.zeros((height, width), dtype=bool)
+            halo[max(0, y_start - 2):y_end + 1,
+                 max(0, x_start - 2):x_end + 1] = True
+            if (blocked & cells).any() or (hits & halo & ~cells).any():
+                continue
+            if hits.any() and not (hits & cells).any():
+                continue
+            heatmap[cells] += count
+    return heatmap
+
+def test_placement_heatmap():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        height, width = rng.integers(1, 9, 2)
+        blocked = rng.random((height, width)) < 0.2
+        hits = (rng.random((height, width)) < 0.05) & ~blocked
+        ships_per_length = {length: int(rng.integers(0, 3))
+                            for length in range(1, 6)}
+        expected = count_placements(blocked, hits, ships_per_length)
+        if not expected.any():
+            expected = count_placements(blocked | hits, hits & False,
+                                        ships_per_length)
+        assert (placement_heatmap(blocked, hits, ships_per_length)
+                == expected).all()
+
+    # Empty 3x2 board: 2 horizontal placements of a ship of length 2 per row
+    # and 3 vertical ones
+    assert placement_heatmap(np.zeros((2, 3), dtype=bool),
+                             np.zeros((2, 3), dtype=bool),
+                             {2: 1}).tolist() == [[2, 3, 2], [2, 3, 2]]
+
+def test_density_player_finishes_ships():
+    target = Board(ships=[Ship(start=(2, 2), end=(4, 2)),
+                          Ship(start=(7, 5), end=(7, 9))],
+                   size=(10, 10), ships_per_length={3: 1, 5: 1})
+    player = DensityPlayer(board=Board(size=(10, 10),
+                                       ships_per_length={3: 1, 5: 1}), seed=0)
+    player.shots[1, 2] = True
+    player.target_coordinates = (3, 2)
+    player.receive_result(*target.is_attacked_at((3, 2)))
+    # The next shots are in line with the hit, until the ship sinks
+    for _ in range(4):
+        cell = player.select_target()
+        assert cell in [(1, 2), (2, 2), (4, 2), (5, 2), (3, 1), (3, 3)]
+        result = target.is_attacked_at(cell)
+        player.receive_result(*result)
+        if result[1]:
+            break
+    assert player.ships_afloat == {3: 0, 5: 1}
+    assert not player.hits.any()
+    assert player.blocked[0:3, 0:5].all()
+
+def test_density_player_plays_whole_games():
+    random.seed(0)
+    moves = []
+    for seed in range(20):
+        target = Board()
+        player = DensityPlayer(seed=seed)
+        targets = set()
+        while not target.have_all_ships_sunk():
+            cell = player.select_target()
+            assert cell not in targets
+            targets.add(cell)
+            player.receive_result(*target.is_attacked_at(cell))
+        assert not player.hits.any()
+        assert not any(player.ships_afloat.values())
+        moves.append(len(targets))
+    # A random player needs about 95 moves
+    assert sum(moves) / len(moves) < 60
+
+    # Once every cell is attacked, there is nothing left to select
+    player = DensityPlayer(board=Board(size=(3, 3), ships_per_length={1: 1}))
+    assert len({player.select_target() for _ in range(9)}) == 9
+    assert player.select_target() is None
+
+def test_placement_counts_match_heatmap():
+    rng = np.random.default_rng(1)
+    for seed in range(200):
+        height, width = (int(side) for side in rng.integers(1, 10, 2))
+        ships_per_length = {length: int(rng.integers(0, 3))
+                            for length in range(1, 6)}
+        counts = PlacementCounts((width, height), ships_per_length, seed)
+        afloat = {length: count for length, count in ships_per_length.items()
+                  if count}
+        blocked = np.zeros((height, width), dtype=bool)
+        for _ in range(int(rng.integers(0, 30))):
+            if rng.random() < 0.85:
+                x, y = int(rng.integers(1, width + 1)), int(
+                    rng.integers(1, height + 1))
+                counts.block([(x, y)])
+                blocked[y - 1, x - 1] = True
+            elif afloat:
+                length = list(afloat)[int(rng.integers(len(afloat)))]
+                counts.remove_ship(length)
+                afloat[length] -= 1
+                if not afloat[length]:
+                    del afloat[length]
+        assert counts.ships_afloat == afloat
+        # Placements count once per length afloat
+        lengths = dict.fromkeys(afloat, 1)
+        no_hits = np.zeros((height, width), dtype=bool)
+        assert (counts.heat == placement_heatmap(blocked, no_hits,
+                                                 lengths)).all()
+        best = counts.best_cell()
+        assert counts.heat[best[1] - 1, best[0] - 1] == counts.heat.max()
+
+        hits = (rng.random((height, width)) < 0.1) & ~blocked
+        hit_cells = {(x + 1, y + 1) for y, x in zip(*np.nonzero(hits))}
+        heatmap = np.zeros((height, width), dtype=np.int64)
+        for (x, y), count in counts.hit_counts(hit_cells).items():
+            heatmap[y - 1, x - 1] = count
+        if heatmap.any():
+            assert (heatmap == placement_heatmap(blocked, hits,
+                                                 lengths)).all()
+
+    # Cells marked done are skipped
+    counts = PlacementCounts((3, 1), {3: 1})
+    counts.mark_done((1, 1))
+    counts.mark_done(counts.best_cell())
+    assert counts.best_cell() not in [(1, 1), None]
+    counts.mark_done(counts.best_cell())
+    assert counts.best_cell() is None
+
+def test_incremental_density_player_plays_whole_games():
+    random.seed(0)
+    for size, ships_per_length in [((10, 10), None),
+                                   ((40, 30), {1: 3, 2: 3, 3: 2, 5: 2})]:
+        target = Board(size=size, ships_per_length=ships_per_length)
+        player = IncrementalDensityPlayer(
+            board=Board(size=size, ships_per_length=ships_per_length), seed=1)
+        while not target.have_all_ships_sunk():
+            cell = player.select_target()
+            assert cell not in target.marked_cells
+            player.receive_result(*target.is_attacked_at(cell))
+        assert not player.hits
+        assert player.ships_afloat == {}
+        assert len(player.tracker) < size[0] * size[1]
+
+if __name__ == "__main__":
+    test_placement_heatmap()
+    test_density_player_finishes_ships()
+    test_density_player_plays_whole_games()
+    test_placement_counts_match_heatmap()
+    test_incremental_density_player_plays_whole_games()
@@ -0,0 +1,96 @@
+import pytest
+
+from battleship.board import Board
+from battleship.generation import (DEFAULT_BUDGET, NO_LAYOUT, OUT_OF_BUDGET,
+                                   PLACED, GenerationBudget, GenerationMetrics,
+                                   LayoutGenerationError)
+from battleship.ship import ShipFactory
+
+def test_generation_report():
+    board = Board()
+    report = board.generation_report
+    assert report.outcome == PLACED
+    assert report.attempts == 1 and report.draws >= 5
+    assert report.wall_time > 0
+    assert Board(ships=board.ships).generation_report is None
+
+    # Crowded: some placements are rejected, some undone
+    ship_factory = ShipFactory(board_size=(5, 6),
+                               ships_per_length={1: 2, 2: 2, 3: 2})
+    rejected = {'too_close': 0, 'dead_end': 0}
+    for _ in range(50):
+        ship_factory.generate_ships()
+        for reason, count in ship_factory.last_report.rejected.items():
+            rejected[reason] += count
+    assert rejected['too_close'] > 0 and rejected['dead_end'] > 0
+
+def test_generation_failures():
+    ship_factory = ShipFactory(board_size=(3, 3), ships_per_length={3: 3})
+    with pytest.raises(LayoutGenerationError) as error:
+        ship_factory.generate_ships()
+    assert isinstance(error.value, RuntimeError)
+    assert error.value.report is ship_factory.last_report
+    assert error.value.report.outcome == NO_LAYOUT
+    assert error.value.report.as_dict()['failed_length'] == 3
+
+    ship_factory = ShipFactory(budget=GenerationBudget(max_draws=3))
+    with pytest.raises(LayoutGenerationError) as error:
+        ship_factory.generate_ships()
+    assert error.value.report.outcome == OUT_OF_BUDGET
+
+    # Large boards
+    ship_factory = ShipFactory(board_size=(100, 100), ships_per_length={1: 200},
+                               budget=GenerationBudget(max_draws=100))
+    with pytest.raises(LayoutGenerationError) as error:
+        ship_factory.generate_ships()
+    assert error.value.report.outcome == OUT_OF_BUDGET
+
+def test_generation_time_limit():
+    # 20 ships of length 2 pass fleet_may_fit() on a 10x10 board, but are 
+    # too crowded to be laid out in time
+    ship_factory = ShipFactory(ships_per_length={2: 20},
+                               budget=GenerationBudget(time_limit=0.05))
+    with pytest.raises(LayoutGenerationError) as error:
+        ship_factory.generate_ships()
+    report = error.value.report
+    assert report.outcome == OUT_OF_BUDGET
+    assert 0.05 < report.wall_time < 1
+    assert report.failed_length == 2
+
+def test_default_budget():
+    # Boards are generated within a budget unless told otherwise
+    assert ShipFactory().budget is DEFAULT_BUDGET
+    assert DEFAULT_BUDGET.time_limit is not None
+    for ships_per_length in [{1: 26}, {1: 40}, {6: 1, 11: 1}]:
+        with pytest.raises(LayoutGenerationError) as error:
+            Board(ships_per_length=ships_per_length)
+        assert error.value.report.outcome == NO_LAYOUT
+        assert error.value.report.budget is DEFAULT_BUDGET
+
+def test_generation_metrics():
+    Board.generation_metrics = GenerationMetrics()
+    try:
+        for _ in range(5):
+            Board()
+            Board(size=(5, 6), ships_per_length={1: 2, 2: 2, 3: 2})
+        with pytest.raises(LayoutGenerationError):
+            Board(size=(3, 3), ships_per_length={3: 3})
+        summary = Board.generation_metrics.summary()
+    finally:
+        Board.generation_metrics = None
+
+    assert len(summary) == 3
+    assert [row['mean_wall_time'] for row in summary] == sorted(
+        (row['mean_wall_time'] for row in summary), reverse=True)
+    totals = {row['board_size']: row for row in summary}
+    assert totals[(10, 10)]['boards'] == 5
+    assert totals[(10, 10)]['failures'] == 0
+    assert totals[(3, 3)]['failures'] == 1
+    assert totals[(5, 6)]['ships_per_length'] == {1: 2, 2: 2, 3: 2}
+
+if __name__ == "__main__":
+    test_generation_report()
+    test_generation_failures()
+    test_generation_time_limit()
+    test_default_budget()
+    test_generation_metrics()
@@ -0,0 +1,37 @@
+import numpy as np
+
+from battleship.parallel import ParallelFleetGenerator
+
+def test_parallel_generation_is_reproducible():
+    ships_per_length = {1: 2, 2: 1, 3: 1}
+    outputs = []
+    for processes in (0, 1, 3):
+        generator = ParallelFleetGenerator(board_size=(6, 6), 
+                                           ships_per_length=ships_per_length, 
+                                           seed=1234, chunk_size=70, 
+                                           processes=processes)
+        chunks = list(generator.generate(500))
+        # Streamed in chunks of chunk_size, the last one being shorter
+        assert [len(grids) for grids, _ in chunks] == [70] * 7 + [10]
+        outputs.append(np.concatenate([coordinates 
+                                       for _, coordinates in chunks]))
+    assert outputs[0].shape == (500, 4, 4)
+    assert (outputs[0] == outputs[1]).all()
+    assert (outputs[0] == outputs[2]).all()
+
+def test_parallel_generation_seed():
+    first = ParallelFleetGenerator(seed=1, processes=0)
+    second = ParallelFleetGenerator(seed=2, processes=0)
+    _, first_coordinates = next(first.generate(100))
+    _, second_coordinates = next(second.generate(100))
+    assert not (first_coordinates == second_coordinates).all()
+
+    # Without a seed, the generator picks one and remembers it
+    generator = ParallelFleetGenerator(processes=0)
+    _, coordinates = next(generator.generate(100))
+    replay = ParallelFleetGenerator(seed=generator.seed, processes=0)
+    assert (next(replay.generate(100))[1] == coordinates).all()
+
+if __name__ == "__main__":
+    test_parallel_generation_is_reproducible()
+    test_parallel_generation_seed()
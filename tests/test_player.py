@@ -1,3 +1,4 @@
+from battleship.board import Board
 from battleship.player import RandomPlayer
 
 def test_player():
@@ -5,6 +6,27 @@ def test_player():
     print(player.select_target())
     print(player.select_target())
     print(player.select_target())
+
+def test_random_player_plays_every_cell_once():
+    player = RandomPlayer(board=Board(size=(12, 7)), seed=3)
+    player.tracker.add((5, 5))
+    targets = [player.select_target() for _ in range(12 * 7 - 1)]
+    assert sorted(targets + [(5, 5)]) == [(x, y) for x in range(1, 13)
+                                          for y in range(1, 8)]
+    assert player.select_target() is None
+
+    # Same seed, same game
+    again = RandomPlayer(board=Board(size=(12, 7)), seed=3)
+    again.tracker.add((5, 5))
+    assert [again.select_target() for _ in range(12 * 7 - 1)] == targets
+    other = RandomPlayer(board=Board(size=(12, 7)), seed=4)
+    assert [other.select_target() for _ in range(12 * 7)] != targets
+
+    # A new board starts a new permutation, without the cells played
+    player.board = Board(size=(13, 7))
+    assert {player.select_target() for _ in range(7)} == {
+        (13, y) for y in range(1, 8)}
+    assert player.select_target() is None
     
 def is_cell_on_min_edge(cell):
     """ Check whether a cell is on the edge or outside the board.
@@ -24,4 +46,5 @@ def is_cell_on_min_edge(cell):
 print("is_cell_on_min_edge: ", is_cell_on_min_edge((1,5)))
     
 if __name__ == "__main__":
-    test_player()
\ No newline at end of file
+    test_player()
+    test_random_player_plays_every_cell_once()
\ No newline at end of file
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from battleship.board import Board
+from battleship.player import RandomPlayer
+from battleship.pool import LayoutPool
+
+def layout(ships):
+    return [(ship.x_start, ship.y_start, ship.x_end, ship.y_end) 
+            for ship in ships]
+
+def test_layout_pool():
+    pool = LayoutPool(batch_size=20, uses_per_layout=2, 
+                      rng=np.random.default_rng(0))
+    ships_per_length = {1: 1, 2: 1, 3: 1}
+    layouts = [layout(pool.take((6, 6), ships_per_length)) 
+               for _ in range(40)]
+    # The batch is generated once, then each layout is handed out twice
+    assert pool.misses == 1 and pool.hits == 39
+    assert layouts[:20] == layouts[20:]
+
+    # Used up: a new batch is generated
+    pool.take((6, 6), ships_per_length)
+    assert pool.misses == 2
+
+    # Every board gets its own ships
+    first = pool.take((6, 6), ships_per_length)
+    first[0].receive_damage(first[0].get_cells().pop())
+    assert all(ship.count_damaged_cells() == 0 
+               for ship in pool.take((6, 6), ships_per_length))
+
+def test_layout_pool_single_refill():
+    pool = LayoutPool(batch_size=5, refill='single')
+    for _ in range(8):
+        ships = pool.take((10, 10), {1: 1, 2: 1})
+        Board(ships=ships, ships_per_length={1: 1, 2: 1})
+    assert pool.misses == 4 and pool.hits == 4
+
+def test_layout_pool_arguments():
+    for batch_size in (0, -1):
+        with pytest.raises(ValueError):
+            LayoutPool(batch_size=batch_size)
+    with pytest.raises(ValueError):
+        LayoutPool(refill='never')
+
+def test_layout_pool_eviction():
+    pool = LayoutPool(batch_size=5, max_configurations=2)
+    pool.fill((6, 6), {1: 1})
+    pool.fill((6, 6), {2: 1})
+    pool.take((6, 6), {1: 1})
+    pool.fill((6, 6), {3: 1})  # Evicts {2: 1}, the least recently used
+    assert pool.evictions == 1
+    assert len(pool.entries) == 2
+    pool.take((6, 6), {1: 1})
+    assert pool.misses == 0
+    pool.take((6, 6), {2: 1})
+    assert pool.misses == 1
+
+def test_board_layout_pool():
+    pool = LayoutPool(batch_size=10)
+    Board.layout_pool = pool
+    try:
+        for _ in range(10):
+            RandomPlayer()
+    finally:
+        Board.layout_pool = None
+    assert pool.misses == 1 and pool.hits == 9
+
+if __name__ == "__main__":
+    test_layout_pool()
+    test_layout_pool_single_refill()
+    test_layout_pool_arguments()
+    test_layout_pool_eviction()
+    test_board_layout_pool()
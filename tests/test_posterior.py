@@ -0,0 +1,87 @@
+import random
+
+import numpy as np
+
+from battleship.board import Board
+from battleship.posterior import (PosteriorPlayer, PosteriorSampler,
+                                  sample_posterior)
+
+def test_samples_agree_with_observations():
+    blocked = np.zeros((8, 10), dtype=bool)
+    hits = np.zeros((8, 10), dtype=bool)
+    # A miss, a sunk ship of length 2 at (2, 2)-(3, 2) and its surroundings,
+    # and two hits
+    blocked[6, 6] = True
+    blocked[0:3, 0:4] = True
+    hits[5, 2] = hits[5, 3] = True
+    tallies, samples, attempts = sample_posterior(
+        (10, 8), {1: 2, 3: 1, 4: 1}, blocked, hits, 300, random.Random(0))
+    assert samples == 300 and attempts >= 300
+    assert tallies.shape == (8, 10)
+    assert not tallies[blocked].any()
+    assert (tallies[hits] == samples).all()
+    # The hits are on a ship of length 3 or 4, so the cells next to them,
+    # diagonally, never hold a ship
+    assert not tallies[[4, 4, 6, 6], [1, 4, 1, 4]].any()
+    assert tallies.sum() == samples * (2 + 3 + 4)
+
+    # Observations no layout agrees with
+    hits[:] = True
+    hits[blocked] = False
+    tallies, samples, attempts = sample_posterior(
+        (10, 8), {1: 2}, blocked, hits, 10)
+    assert samples == 0 and not tallies.any() and attempts <= 200
+
+def test_sampler_is_reproducible():
+    blocked = np.zeros((10, 10), dtype=bool)
+    hits = np.zeros((10, 10), dtype=bool)
+    blocked[2, :] = True
+    hits[5, 5] = True
+    ships_per_length = {1: 1, 2: 1, 3: 1, 4: 1, 5: 1}
+    tallies = []
+    for processes in (0, 2):
+        with PosteriorSampler(samples=230, seed=7, chunk_size=40,
+                              processes=processes) as sampler:
+            first, samples = sampler.tally((10, 10), ships_per_length,
+                                           blocked, hits)
+            assert samples == sampler.last_samples == 230
+            second, _ = sampler.tally((10, 10), ships_per_length, blocked,
+                                      hits)
+        # Each decision gets its own random streams
+        assert not (first == second).all()
+        tallies.append((first, second))
+    assert (tallies[0][0] == tallies[1][0]).all()
+    assert (tallies[0][1] == tallies[1][1]).all()
+
+    # Out of time
+    sampler = PosteriorSampler(samples=1000, time_limit=0)
+    tallies, samples = sampler.tally((10, 10), ships_per_length, blocked,
+                                     hits)
+    assert samples == 0 and not tallies.any()
+
+def test_posterior_player_plays_whole_games():
+    random.seed(0)
+    moves = []
+    for seed in range(5):
+        target = Board()
+        player = PosteriorPlayer(seed=seed,
+                                 sampler=PosteriorSampler(samples=100,
+                                                          seed=seed))
+        targets = set()
+        while not target.have_all_ships_sunk():
+            cell = player.select_target()
+            assert cell not in targets
+            targets.add(cell)
+            player.receive_result(*target.is_attacked_at(cell))
+        assert not player.hits.any() and player.tallies is not None
+        moves.append(len(targets))
+    assert sum(moves) / len(moves) < 70
+
+    # Without samples, the player falls back to DensityPlayer's heatmap
+    player = PosteriorPlayer(sampler=PosteriorSampler(time_limit=0))
+    assert player.select_target() is not None
+
+if __name__ == "__main__":
+    test_samples_agree_with_observations()
+    test_sampler_is_reproducible()
+    test_posterior_player_plays_whole_games()
@@ -0,0 +1,109 @@
+import io
+import random
+import re
+
+import pytest
+
+from battleship.array_board import ArrayBoard
+from battleship.bitboard import BitBoardAdapter
+from battleship.board import Board
+from battleship.render import BoardRenderer
+from battleship.ship import Ship
+
+class FakeTerminal(io.StringIO):
+    def isatty(self):
+        return True
+
+def test_renderer_matches_full_redraw():
+    rng = random.Random(0)
+    for board_class in (Board, ArrayBoard, BitBoardAdapter):
+        board = board_class(size=(12, 9))
+        renderers = [BoardRenderer(board, io.StringIO()) for _ in range(2)]
+        for _ in range(150):
+            board.is_attacked_at((rng.randint(1, 12), rng.randint(1, 9)))
+            for show_ships, renderer in zip((False, True), renderers):
+                renderer.draw(show_ships=show_ships)
+                expected = board._array_to_str(
+                    board._build_array(show_ships=show_ships))
+                assert renderer.frame() == expected
+                assert renderer.stream.getvalue().endswith(expected + '\n')
+
+def test_board_print(capsys):
+    board = Board()
+    board.print()
+    board.is_attacked_at((1, 1))
+    board.print(show_ships=True)
+    expected = board._array_to_str(board._build_array(show_ships=True))
+    assert capsys.readouterr().out.endswith(expected + '\n')
+
+def test_renderer_patches_terminal():
+    board = Board()
+    terminal = FakeTerminal()
+    renderer = BoardRenderer(board, terminal)
+    renderer.draw(in_place=True)
+    screen = terminal.getvalue().split('\n')
+    # The cursor is at the start of the last (empty) line
+    cursor = len(screen) - 1
+
+    for x, y in [(x, y) for x in range(1, 11) for y in range(1, 11)][:60]:
+        terminal.seek(0)
+        terminal.truncate()
+        board.is_attacked_at((x, y))
+        renderer.draw(in_place=True)
+        output = terminal.getvalue()
+        patches = re.findall(r'\x1b7\x1b\[(\d+)A\x1b\[(\d+)G(.)\x1b8', output)
+        assert len(output) == sum(len(f'\x1b7\x1b[{up}A\x1b[{column}G{symbol}\x1b8')
+                                  for up, column, symbol in patches)
+        for up, column, symbol in patches:
+            line = screen[cursor - int(up)]
+            column = int(column) - 1
+            screen[cursor - int(up)] = line[:column] + symbol + line[column + 1:]
+        expected = board._array_to_str(board._build_array())
+        assert '\n'.join(screen) == expected + '\n'
+
+    # Not in place: a whole new frame
+    terminal.seek(0)
+    terminal.truncate()
+    renderer.draw()
+    assert terminal.getvalue() == expected + '\n'
+
+def test_viewport():
+    rng = random.Random(1)
+    for board_class in (Board, ArrayBoard, BitBoardAdapter):
+        board = board_class(size=(12, 9))
+        renderer = BoardRenderer(board, io.StringIO())
+        for _ in range(60):
+            board.is_attacked_at((rng.randint(1, 12), rng.randint(1, 9)))
+            renderer.update(show_ships=True, viewport=(3, 2, 6, 20))
+            full = board._build_array(show_ships=True)
+            assert renderer.symbols == [row[2:8] for row in full[1:9]]
+            lines = renderer.frame().splitlines()
+            assert lines[0] == ' ' * 6 + '     '.join('CDEFGH') + ' '
+            assert lines[2].startswith(' 2 |  ' + '  |  '.join(full[1][2:8]))
+
+    with pytest.raises(ValueError):
+        renderer.update(viewport=(13, 1, 5, 5))
+
+def test_viewport_on_huge_board():
+    ship = Ship((99_990, 99_995), (99_990, 99_999))
+    board = Board(ships=[ship], size=(100_000, 100_000),
+                  ships_per_length={5: 1})
+    board.is_attacked_at((99_990, 99_996))
+    board.is_attacked_at((99_989, 99_996))
+    stream = io.StringIO()
+    BoardRenderer(board, stream).draw(show_ships=True, 
+                                      viewport=(99_988, 99_994, 4, 10))
+    lines = stream.getvalue().splitlines()
+    # Columns beyond Z are numbered, row labels widen to fit, and the
+    # viewport stops at the edge of the board
+    assert lines[0].split() == ['99988', '99989', '99990', '99991']
+    assert lines[4] == ' 99995 |     |     |  S  |     |'
+    assert lines[6] == ' 99996 |     |  O  |  X  |     |'
+    assert lines[-3] == '100000 |     |     |     |     |'
+    assert len(lines) == 2 + 2 * 7 + 1
+
+if __name__ == "__main__":
+    test_renderer_matches_full_redraw()
+    test_renderer_patches_terminal()
+    test_viewport()
+    test_viewport_on_huge_board()
@@ -1,4 +1,9 @@
-from battleship.ship import Ship, ShipFactory
+import copy
+import pickle
+
+import pytest
+
+from battleship.ship import Ship, ShipFactory, bounding_boxes
 
 def test_horizontal():
     start = (4, 5)
@@ -31,6 +36,70 @@ def test_ships():
     print(ships)
 
 
+def test_damage_mask():
+    ship = Ship(start=(2, 6), end=(2, 4))
+    assert ship.cells == {(2, 4), (2, 5), (2, 6)}
+    assert ship.cell_mask == 0b111
+
+    assert ship.receive_damage((2, 5)) == True
+    assert ship.receive_damage((3, 5)) == False
+    assert ship.damage_mask == 0b010
+    assert ship.damaged_cells == {(2, 5)}
+    # Built from the damage mask, so it cannot be changed in place
+    assert isinstance(ship.damaged_cells, frozenset)
+    assert ship.has_sunk() == False
+
+    ship.receive_damage((2, 4))
+    ship.receive_damage((2, 6))
+    assert ship.count_damaged_cells() == 3
+    assert ship.has_sunk() == True
+    assert ship.board_mask(10) == (1 << 31) | (1 << 41) | (1 << 51)
+
+
+def test_shared_geometry():
+    ship = Ship(start=(5, 3), end=(3, 3))
+    other = Ship(start=(3, 3), end=(5, 3))
+    assert ship.geometry is other.geometry
+
+    ship.receive_damage((4, 3))
+    assert other.damaged_cells == set()
+
+    with pytest.raises(AttributeError):
+        ship.geometry.x_start = 1
+    with pytest.raises(AttributeError):
+        ship.colour = "grey"
+
+
+def test_is_near_ships():
+    ship = Ship(start=(3, 3), end=(5, 3))
+    others = [
+        Ship(start=(2, 4), end=(2, 6)),  # touches the corner: near
+        Ship(start=(6, 1), end=(6, 2)),  # touches the other corner: near
+        Ship(start=(7, 1), end=(7, 5)),  # one cell gap: not near
+        Ship(start=(3, 5), end=(6, 5)),  # one row gap: not near
+        Ship(start=(4, 1), end=(4, 8)),  # crosses the ship: near
+    ]
+    expected = [True, True, False, False, True]
+
+    assert [ship.is_near_ship(other) for other in others] == expected
+    assert [any(ship.is_near_cell(cell) for cell in other.cells)
+            for other in others] == expected
+    assert ship.is_near_ships(bounding_boxes(others)).tolist() == expected
+
+def test_copy_and_pickle():
+    ship = Ship(start=(2, 3), end=(2, 5))
+    ship.receive_damage((2, 4))
+    for other in (copy.deepcopy(ship), pickle.loads(pickle.dumps(ship))):
+        assert other is not ship
+        assert other.geometry is ship.geometry
+        assert other.damaged_cells == {(2, 4)}
+        other.receive_damage((2, 3))
+        assert ship.damaged_cells == {(2, 4)}
+
 if __name__ == "__main__":
     test_horizontal()
-    test_ships()
\ No newline at end of file
+    test_ships()
+    test_damage_mask()
+    test_shared_geometry()
+    test_is_near_ships()
+    test_copy_and_pickle()
\ No newline at end of file
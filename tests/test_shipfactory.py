@@ -1,3 +1,13 @@
+import random
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from battleship.generation import (GAVE_UP, NO_LAYOUT, OUT_OF_BUDGET, PLACED,
+                                   GenerationBudget, LayoutGenerationError)
+from battleship import placement
+from battleship.placement import MAX_COUNTING_BYTES, LayoutCounter
 from battleship.ship import ShipFactory
 from battleship.board import Board
 
@@ -9,5 +19,152 @@ def test_generate_ships():
     board = Board(ships=ships)
     board.validate_ships() # No ValueError is good news!
 
+def test_generate_ships_crowded():
+    # Leaves very little room: rejection sampling used to give up here
+    ships_per_length = {1: 2, 2: 2, 3: 2}
+    ship_factory = ShipFactory(board_size=(5, 6), 
+                               ships_per_length=ships_per_length)
+    random.seed(0)
+    for _ in range(200):
+        ships = ship_factory.generate_ships()
+        Board(ships=ships, size=(5, 6), ships_per_length=ships_per_length)
+
+def test_generate_ships_impossible():
+    ship_factory = ShipFactory(board_size=(3, 3), ships_per_length={3: 3})
+    with pytest.raises(RuntimeError):
+        ship_factory.generate_ships()
+
+def test_generate_ships_never_gives_up():
+    # Crowded fleets that fit are always laid out: searches that run out of 
+    # draws start over. {1: 25} even fits in a single way.
+    random.seed(0)
+    for ships_per_length, boards in [({1: 4, 2: 3, 3: 2, 4: 1, 5: 2}, 300),
+                                     ({1: 23}, 50), ({2: 14}, 50), 
+                                     ({1: 25}, 1)]:
+        for _ in range(boards):
+            board = Board(ships_per_length=ships_per_length)
+            assert board.generation_report.outcome == PLACED
+    # Fleets that obviously do not fit fail without drawing anything
+    for ships_per_length in ({1: 26}, {1: 31}):
+        ship_factory = ShipFactory(ships_per_length=ships_per_length)
+        with pytest.raises(LayoutGenerationError) as error:
+            ship_factory.generate_ships()
+        assert error.value.report.outcome == NO_LAYOUT
+        assert error.value.report.draws == 0
+
+def test_count_layouts(tmp_path, monkeypatch):
+    monkeypatch.setenv("BATTLESHIP_CACHE_DIR", str(tmp_path))
+    ship_factory = ShipFactory(board_size=(5, 5), 
+                               ships_per_length={2: 1, 3: 1})
+    assert ship_factory.count_layouts() == 524
+
+    marginals = ship_factory.cell_marginals()
+    assert marginals.shape == (5, 5)
+    assert abs(marginals.sum() - 5) < 1e-9
+    # Symmetric board: the corners are all equally likely
+    assert abs(marginals[0, 0] - marginals[4, 4]) < 1e-9
+
+    # Second factory reads the file written by the first one
+    assert len(list(tmp_path.iterdir())) == 1
+    assert ShipFactory(board_size=(5, 5), 
+                       ships_per_length={3: 1, 2: 1}).count_layouts() == 524
+
+def test_count_layouts_too_large():
+    # Refused before the arrays of partial layouts are built
+    tracemalloc.start()
+    with pytest.raises(ValueError):
+        LayoutCounter((10, 10), {1: 2, 2: 1, 3: 1, 4: 1, 5: 1})
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < MAX_COUNTING_BYTES / 4
+    # The limit is in bytes
+    assert LayoutCounter((5, 5), {2: 1, 3: 1}).count == 524
+    with pytest.raises(ValueError):
+        LayoutCounter((5, 5), {2: 1, 3: 1}, max_bytes=1000)
+
+def test_generate_uniform_ships():
+    ships_per_length = {1: 2, 2: 1, 3: 1}
+    ship_factory = ShipFactory(board_size=(6, 6), 
+                               ships_per_length=ships_per_length, 
+                               uniform=True)
+    for _ in range(50):
+        ships = ship_factory.generate_ships()
+        Board(ships=ships, size=(6, 6), ships_per_length=ships_per_length)
+
+def test_generate_fleets():
+    ships_per_length = {1: 2, 2: 2, 3: 2}
+    ship_factory = ShipFactory(board_size=(5, 6), 
+                               ships_per_length=ships_per_length)
+    grids, coordinates = ship_factory.generate_fleets(
+        500, rng=np.random.default_rng(0))
+    assert grids.shape == (500, 6, 5)
+    assert coordinates.shape == (500, 6, 4)
+    # Longest ships first, and each ship id covers as many cells as its length
+    lengths = (coordinates[:, :, 2] - coordinates[:, :, 0] 
+               + coordinates[:, :, 3] - coordinates[:, :, 1] + 1)
+    assert (lengths == [3, 3, 2, 2, 1, 1]).all()
+    for ship_id in range(1, 7):
+        assert ((grids == ship_id).sum(axis=(1, 2)) == lengths[:, ship_id - 1]).all()
+
+    for grid, fleet in zip(grids[:50], coordinates[:50]):
+        board = Board.from_coordinates(fleet, size=(5, 6), 
+                                       ships_per_length=ships_per_length)
+        board.validate_ships()
+        for k, ship in enumerate(board.ships):
+            for x, y in ship.cells:
+                assert grid[y - 1, x - 1] == k + 1
+
+def test_generate_fleets_impossible():
+    ship_factory = ShipFactory(board_size=(3, 3), ships_per_length={3: 3})
+    with pytest.raises(RuntimeError):
+        ship_factory.generate_fleets(10)
+
+def test_generate_fleets_gives_up(monkeypatch):
+    # The check that the fleet fits is bounded by DEFAULT_BUDGET. {2: 20} 
+    # is too crowded to be laid out in time.
+    monkeypatch.setattr(placement, 'DEFAULT_BUDGET', 
+                        GenerationBudget(time_limit=0.05))
+    ship_factory = ShipFactory(ships_per_length={2: 20})
+    with pytest.raises(LayoutGenerationError) as error:
+        ship_factory.generate_fleets(10)
+    assert error.value.report.outcome == OUT_OF_BUDGET
+
+    # About half the layouts of this fleet fail and are drawn again, once
+    monkeypatch.setattr(placement, 'MAX_REDRAW_ROUNDS', 1)
+    ship_factory = ShipFactory(ships_per_length={1: 22})
+    with pytest.raises(LayoutGenerationError) as error:
+        ship_factory.generate_fleets(1000, np.random.default_rng(0))
+    assert error.value.report.outcome == GAVE_UP
+    assert error.value.report.attempts == 1
+
+def test_generate_ships_large_board():
+    # Large boards use the sparse sampler rather than placement tables
+    ships_per_length = {1: 40, 2: 30, 3: 20, 4: 10, 5: 5}
+    ship_factory = ShipFactory(board_size=(300, 200), 
+                               ships_per_length=ships_per_length)
+    ships = ship_factory.generate_ships()
+    assert len(ships) == 105
+    board = Board(ships=ships, size=(300, 200), 
+                  ships_per_length=ships_per_length)
+    assert max(ship.x_end for ship in board.ships) > 100
+    assert max(ship.y_end for ship in board.ships) > 100
+
+    grids, coordinates = ship_factory.generate_fleets(
+        3, rng=np.random.default_rng(0))
+    assert grids.shape == (3, 200, 300)
+    for grid, fleet in zip(grids, coordinates):
+        Board.from_coordinates(fleet, size=(300, 200), 
+                               ships_per_length=ships_per_length, 
+                               should_validate=True)
+        assert (grid > 0).sum() == 40 + 60 + 60 + 40 + 25
+
 if __name__ == "__main__":
-    test_generate_ships()
\ No newline at end of file
+    test_generate_ships()
+    test_generate_ships_crowded()
+    test_generate_ships_impossible()
+    test_generate_ships_never_gives_up()
+    test_count_layouts_too_large()
+    test_generate_uniform_ships()
+    test_generate_fleets()
+    test_generate_fleets_impossible()
+    test_generate_ships_large_board()
\ No newline at end of file
@@ -0,0 +1,70 @@
+import numpy as np
+
+from battleship.board import Board
+from battleship.ship import ShipFactory
+from battleship.validation import (OUT_OF_BOUNDS, SHIPS_TOO_CLOSE, VALID,
+                                   WRONG_SHIP_LENGTHS, validate_layouts)
+
+def board_error(coordinates, size, ships_per_length):
+    """ Error code of the ValueError raised by Board.validate_ships()."""
+    board = Board.from_coordinates(coordinates, size, ships_per_length)
+    try:
+        board.validate_ships()
+    except ValueError as error:
+        if "beyond the bounds" in str(error):
+            return OUT_OF_BOUNDS
+        if "too close" in str(error):
+            return SHIPS_TOO_CLOSE
+        return WRONG_SHIP_LENGTHS
+    return VALID
+
+def damaged_layouts(size, ships_per_length, number_of_layouts, rng):
+    """ Valid layouts, most with one ship moved, stretched or turned."""
+    _, coordinates = ShipFactory(board_size=size,
+                                 ships_per_length=ships_per_length
+                                 ).generate_fleets(number_of_layouts, rng)
+    coordinates = coordinates.astype(np.int64)
+    ships = rng.integers(coordinates.shape[1], size=number_of_layouts)
+    moves = rng.integers(-2, 3, size=(number_of_layouts, 4))
+    kinds = rng.integers(4, size=number_of_layouts)
+    for layout, (ship, move, kind) in enumerate(zip(ships, moves, kinds)):
+        if kind == 1:
+            # Moved
+            coordinates[layout, ship] += np.tile(move[:2], 2)
+        elif kind == 2:
+            # Stretched, shrunk or turned diagonal
+            coordinates[layout, ship, 2:] += move[2:]
+        elif kind == 3:
+            # Ends swapped
+            coordinates[layout, ship] = coordinates[layout, ship, [2, 3, 0, 1]]
+    return coordinates
+
+def test_validate_layouts_matches_board():
+    rng = np.random.default_rng(0)
+    for size, ships_per_length in (((10, 10), None),
+                                   ((6, 5), {1: 2, 2: 2, 3: 1}),
+                                   ((12, 12), {1: 4, 2: 3, 3: 2, 4: 2, 5: 3})):
+        coordinates = damaged_layouts(size, ships_per_length or
+                                      {1: 1, 2: 1, 3: 1, 4: 1, 5: 1},
+                                      300, rng)
+        valid, errors = validate_layouts(coordinates, size, ships_per_length)
+        expected = [board_error(layout, size, ships_per_length)
+                    for layout in coordinates]
+        assert errors.tolist() == expected
+        assert valid.tolist() == [error == VALID for error in expected]
+        # Every rule is exercised
+        assert set(expected) == {VALID, OUT_OF_BOUNDS, WRONG_SHIP_LENGTHS,
+                                 SHIPS_TOO_CLOSE}
+
+def test_validate_layouts_wrong_fleet_size():
+    coordinates = np.array([[(1, 1, 1, 1), (3, 1, 4, 1)]])
+    valid, errors = validate_layouts(coordinates, (5, 5), {1: 1, 2: 1})
+    assert valid.tolist() == [True]
+    valid, errors = validate_layouts(coordinates, (5, 5), {1: 1, 2: 2})
+    assert errors.tolist() == [WRONG_SHIP_LENGTHS]
+    valid, errors = validate_layouts(coordinates, (3, 5), {1: 2})
+    assert errors.tolist() == [OUT_OF_BOUNDS]
+
+if __name__ == "__main__":
+    test_validate_layouts_matches_board()
+    test_validate_layouts_wrong_fleet_size()